@@ -12,14 +12,141 @@ WS_URL = f"wss://{DOMAIN}/ws"
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
+# Point at a local stand-in instead of api.twilio.com (e.g. tools/mock_twilio.py for load tests)
+TWILIO_API_BASE_URL = os.getenv("TWILIO_API_BASE_URL", "https://api.twilio.com")
+TWILIO_MAX_CONNECTIONS = int(os.getenv("TWILIO_MAX_CONNECTIONS", "20"))
+TWILIO_CONNECT_TIMEOUT_SECONDS = float(os.getenv("TWILIO_CONNECT_TIMEOUT_SECONDS", "5"))
+TWILIO_REQUEST_TIMEOUT_SECONDS = float(os.getenv("TWILIO_REQUEST_TIMEOUT_SECONDS", "15"))
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Point at an OpenAI-compatible server instead of api.openai.com (e.g. tools/mock_llm.py for load tests)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "60"))
+LLM_WARMUP_CONNECTIONS = int(os.getenv("LLM_WARMUP_CONNECTIONS", "4"))
+# Rate limits of the OpenAI key shared by all LLM requests (0 = unlimited); in-call scoring goes
+# first and background work (question generation, reference answers, re-scoring) may not use
+# the last LLM_CALL_RESERVE of either budget
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+LLM_CALL_RESERVE = float(os.getenv("LLM_CALL_RESERVE", "0.2"))
+LLM_CALL_MAX_WAIT_SECONDS = float(os.getenv("LLM_CALL_MAX_WAIT_SECONDS", "1"))
+LLM_BACKGROUND_MAX_WAIT_SECONDS = float(os.getenv("LLM_BACKGROUND_MAX_WAIT_SECONDS", "120"))
+SCORING_TIMEOUT_SECONDS = float(os.getenv("SCORING_TIMEOUT_SECONDS", "10"))
+# Latency budget for scoring one answer; a duplicate request is sent once the first is slower than
+# the recent p95 (SCORING_HEDGE_DELAY_SECONDS until enough samples exist)
+SCORING_DEADLINE_SECONDS = float(os.getenv("SCORING_DEADLINE_SECONDS", "4"))
+SCORING_HEDGE_DELAY_SECONDS = float(os.getenv("SCORING_HEDGE_DELAY_SECONDS", "1.5"))
+SCORING_HEDGE_PERCENTILE = float(os.getenv("SCORING_HEDGE_PERCENTILE", "95"))
+SCORING_HEDGE_MIN_SAMPLES = int(os.getenv("SCORING_HEDGE_MIN_SAMPLES", "20"))
+# Consecutive scoring failures before falling back to local scoring, and how long to stay there
+SCORING_BREAKER_FAILURES = int(os.getenv("SCORING_BREAKER_FAILURES", "5"))
+SCORING_BREAKER_COOLDOWN_SECONDS = float(os.getenv("SCORING_BREAKER_COOLDOWN_SECONDS", "30"))
+# Answers given a fallback score are re-scored after the call, and the outcome decided then
+RESCORING_ENABLED = os.getenv("RESCORING_ENABLED", "true").lower() == "true"
+RESCORING_POLL_SECONDS = float(os.getenv("RESCORING_POLL_SECONDS", "30"))
+RESCORING_MAX_PER_MINUTE = int(os.getenv("RESCORING_MAX_PER_MINUTE", "30"))
+RESCORING_MAX_ATTEMPTS = int(os.getenv("RESCORING_MAX_ATTEMPTS", "10"))
+RESCORING_BACKOFF_SECONDS = float(os.getenv("RESCORING_BACKOFF_SECONDS", "60"))
+RESCORING_MAX_BACKOFF_SECONDS = float(os.getenv("RESCORING_MAX_BACKOFF_SECONDS", "3600"))
+# How long a worker holds a job it is re-scoring; must outlast re-scoring one interview
+RESCORING_LEASE_SECONDS = float(os.getenv("RESCORING_LEASE_SECONDS", "600"))
+SCORING_MODE = os.getenv("SCORING_MODE", "sequential")  # "sequential", "pipelined" or "batch"
+# End interviews as soon as pass/fail can no longer change (per interview with earlyStop)
+EARLY_STOP_ENABLED = os.getenv("EARLY_STOP_ENABLED", "false").lower() == "true"
+# Start scoring on stable partial transcripts (per interview with speculativeScoring)
+SPECULATIVE_SCORING_ENABLED = os.getenv("SPECULATIVE_SCORING_ENABLED", "false").lower() == "true"
+SPECULATIVE_STABLE_SECONDS = float(os.getenv("SPECULATIVE_STABLE_SECONDS", "0.6"))
+SPECULATIVE_MATCH_RATIO = float(os.getenv("SPECULATIVE_MATCH_RATIO", "0.9"))
+# How long the last turn of a call that hung up may take to finish (e.g. completing the interview)
+CALL_CLOSE_DRAIN_SECONDS = float(os.getenv("CALL_CLOSE_DRAIN_SECONDS", "30"))
+
+# Admission Control Configuration (per worker): live interviews at once, connecting calls that may
+# wait for a slot and for how long; dials are shed while live, queued and ringing calls fill both
+ADMISSION_MAX_LIVE_CALLS = int(os.getenv("ADMISSION_MAX_LIVE_CALLS", "50"))
+ADMISSION_MAX_QUEUED_CALLS = int(os.getenv("ADMISSION_MAX_QUEUED_CALLS", "10"))
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "10"))
+# How long a dialed call holds its slot while ringing, and the Retry-After of shed requests
+ADMISSION_RESERVATION_SECONDS = float(os.getenv("ADMISSION_RESERVATION_SECONDS", "90"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "30"))
+
+# Live Interview Event Stream Configuration (/interview-events)
+EVENT_STREAM_KEEPALIVE_SECONDS = float(os.getenv("EVENT_STREAM_KEEPALIVE_SECONDS", "15"))
+EVENT_STREAM_QUEUE_SIZE = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "100"))
+EVENT_STREAM_MAX_CALLS = int(os.getenv("EVENT_STREAM_MAX_CALLS", "200"))
+EVENT_STREAM_TRACKED_CALLS = int(os.getenv("EVENT_STREAM_TRACKED_CALLS", "5000"))
+
+# Campaign Dialer Configuration (calls per second is the Twilio account's limit; it and the live call limit are shared by all campaigns)
+CAMPAIGN_CALLS_PER_SECOND = float(os.getenv("CAMPAIGN_CALLS_PER_SECOND", "1"))
+CAMPAIGN_MAX_CONCURRENT_CALLS = int(os.getenv("CAMPAIGN_MAX_CONCURRENT_CALLS", "10"))
+CAMPAIGN_MAX_CANDIDATES = int(os.getenv("CAMPAIGN_MAX_CANDIDATES", "1000"))
+# A dialed call whose final status never arrives stops counting as live after this long
+CAMPAIGN_CALL_TIMEOUT_SECONDS = float(os.getenv("CAMPAIGN_CALL_TIMEOUT_SECONDS", "1800"))
+CAMPAIGN_POLL_SECONDS = float(os.getenv("CAMPAIGN_POLL_SECONDS", "2"))
+CAMPAIGN_TTL_SECONDS = int(os.getenv("CAMPAIGN_TTL_SECONDS", "604800"))
+
+# Session Store Configuration ("memory" for a single worker, "sqlite" for one host, "redis" for many)
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")
+SESSION_STORE_SQLITE_PATH = os.getenv("SESSION_STORE_SQLITE_PATH", "data/sessions.db")
+SESSION_STORE_REDIS_URL = os.getenv("SESSION_STORE_REDIS_URL", "redis://localhost:6379/0")
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "7200"))
+SESSION_STORE_MAX_ENTRIES = int(os.getenv("SESSION_STORE_MAX_ENTRIES", "20000"))
+SESSION_STORE_MAX_BYTES = int(os.getenv("SESSION_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+CONFIG_TTL_SECONDS = float(os.getenv("CONFIG_TTL_SECONDS", "86400"))
+CONFIG_STORE_MAX_ENTRIES = int(os.getenv("CONFIG_STORE_MAX_ENTRIES", "20000"))
+CONFIG_STORE_MAX_BYTES = int(os.getenv("CONFIG_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+POOL_STORE_MAX_ENTRIES = int(os.getenv("POOL_STORE_MAX_ENTRIES", "5000"))
+STORE_SWEEP_INTERVAL_SECONDS = float(os.getenv("STORE_SWEEP_INTERVAL_SECONDS", "60"))
+
+# Question Generation Cache Configuration
+QUESTION_CACHE_BACKEND = os.getenv("QUESTION_CACHE_BACKEND", "sqlite")
+QUESTION_CACHE_DB_PATH = os.getenv("QUESTION_CACHE_DB_PATH", "data/question_cache.db")
+QUESTION_CACHE_TTL_SECONDS = float(os.getenv("QUESTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+QUESTION_CACHE_MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "1000"))
+BACKGROUND_QUESTION_GENERATION = os.getenv("BACKGROUND_QUESTION_GENERATION", "false").lower() == "true"
+QUESTION_GENERATION_WAIT_SECONDS = float(os.getenv("QUESTION_GENERATION_WAIT_SECONDS", "8"))
+QUESTION_GENERATION_MAX_ROUNDS = int(os.getenv("QUESTION_GENERATION_MAX_ROUNDS", "2"))
+QUESTION_STREAM_MIN_READY = int(os.getenv("QUESTION_STREAM_MIN_READY", "3"))
+QUESTION_STREAM_PUBLISH_EVERY = int(os.getenv("QUESTION_STREAM_PUBLISH_EVERY", "10"))
+
+# Scoring Cache Configuration (repeated question/answer pairs are scored once)
+SCORING_CACHE_ENABLED = os.getenv("SCORING_CACHE_ENABLED", "true").lower() == "true"
+SCORING_CACHE_BACKEND = os.getenv("SCORING_CACHE_BACKEND", "memory")
+SCORING_CACHE_DB_PATH = os.getenv("SCORING_CACHE_DB_PATH", "data/scoring_cache.db")
+SCORING_CACHE_TTL_SECONDS = float(os.getenv("SCORING_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+SCORING_CACHE_MAX_ENTRIES = int(os.getenv("SCORING_CACHE_MAX_ENTRIES", "50000"))
+
+# Tiered Scoring Configuration (local pre-scorer settles clear cases, the LLM scores the rest)
+TIERED_SCORING_ENABLED = os.getenv("TIERED_SCORING_ENABLED", "true").lower() == "true"
+# Similarity to the reference answer at or above which an answer is accepted without the LLM
+SCORING_ESCALATION_THRESHOLD = float(os.getenv("SCORING_ESCALATION_THRESHOLD", "0.5"))
+SCORING_STRONG_MIN_WORDS = int(os.getenv("SCORING_STRONG_MIN_WORDS", "12"))
 
 # Gmail Configuration
 GMAIL_USER = os.getenv("GMAIL_USER")
 GMAIL_PASSWORD = os.getenv("GMAIL_PASSWORD")
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_LOGIN = os.getenv("SMTP_LOGIN", "true").lower() == "true"
+
+# Email Outbox Configuration
+EMAIL_OUTBOX_DB_PATH = os.getenv("EMAIL_OUTBOX_DB_PATH", "data/email_outbox.db")
+EMAIL_OUTBOX_WORKERS = int(os.getenv("EMAIL_OUTBOX_WORKERS", "2"))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+EMAIL_OUTBOX_BACKOFF_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "5"))
+EMAIL_OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", "900"))
+EMAIL_SMTP_IDLE_SECONDS = float(os.getenv("EMAIL_SMTP_IDLE_SECONDS", "30"))
+EMAIL_OUTBOX_DRAIN_SECONDS = float(os.getenv("EMAIL_OUTBOX_DRAIN_SECONDS", "10"))
+EMAIL_OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))  # Must outlast delivering one batch
 
 # Interview Configuration
+INTERVIEW_SEED = os.getenv("INTERVIEW_SEED")  # Fixes question order for every call (testing only)
 WELCOME_GREETING = "Welcome to your JavaScript technical interview! Here's how it works: I will ask you 10 random JavaScript questions. Please answer each question to the best of your ability. Take your time to think before answering. Let's begin!"
 SYSTEM_PROMPT = ""
\ No newline at end of file
@@ -2,22 +2,63 @@
 Modular FastAPI application for JavaScript interview system
 """
 
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.config import PORT
+from app.config import PORT, STORE_SWEEP_INTERVAL_SECONDS
 from app.routes.call_routes import router as call_router
 from app.routes.interview_routes import router as interview_router
 from app.routes.setup_routes import router as setup_router
+from app.routes.stats_routes import router as stats_router
+from app.services.email_outbox import start_email_outbox, stop_email_outbox
+from app.services.rescoring_queue import start_rescoring_worker, stop_rescoring_worker
+from app.services.twilio_client import close_twilio_client
+from app.services.campaign_dialer import start_campaign_dialer, stop_campaign_dialer
+from app.services.interview_service import interview_sessions, custom_configs, question_pools
+from app.services.llm_client import warm_up_llm_client, close_llm_client
+from app.services.question_service import question_cache
+from app.services.scoring_service import scoring_cache
+from app.services.reference_answers import reference_answers
+from app.services.session_store import sweep_stores_forever
 from app.websocket.conversation_handler import handle_websocket_connection
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared clients on startup and release them on shutdown"""
+    await warm_up_llm_client()
+    await start_email_outbox()
+    start_rescoring_worker()
+    start_campaign_dialer()
+    sweeper = asyncio.create_task(
+        sweep_stores_forever(
+            [interview_sessions, custom_configs, question_pools, question_cache, scoring_cache, reference_answers],
+            STORE_SWEEP_INTERVAL_SECONDS
+        )
+    )
+    yield
+    sweeper.cancel()
+    await stop_campaign_dialer()
+    await stop_rescoring_worker()
+    await stop_email_outbox()
+    await interview_sessions.close()
+    await custom_configs.close()
+    await question_pools.close()
+    await question_cache.close()
+    await scoring_cache.close()
+    await reference_answers.close()
+    await close_llm_client()
+    await close_twilio_client()
+
 # Create FastAPI app
 app = FastAPI(
     title="JavaScript Interview System",
     description="AI-powered JavaScript technical interviews via voice calls",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -41,6 +82,7 @@ app.add_middleware(
 app.include_router(call_router)
 app.include_router(interview_router)
 app.include_router(setup_router)
+app.include_router(stats_router)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -0,0 +1,64 @@
+"""Immutable, content-addressed question pools shared by every interview that uses them"""
+
+import hashlib
+import weakref
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+from app.models.questions import JS_QUESTIONS
+
+
+class QuestionPool:
+    """An immutable tuple of questions identified by the hash of its contents"""
+
+    __slots__ = ("digest", "questions", "__weakref__")
+
+    def __init__(self, digest: str, questions: Tuple[str, ...]):
+        self.digest = digest
+        self.questions = questions
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __getitem__(self, index: int) -> str:
+        return self.questions[index]
+
+
+def pool_digest(questions: Iterable[str]) -> str:
+    """Content hash identifying a list of questions"""
+    return hashlib.sha256("\n".join(questions).encode("utf-8")).hexdigest()[:32]
+
+
+# Every live pool in this process, so identical question lists are stored once
+_pools: "weakref.WeakValueDictionary[str, QuestionPool]" = weakref.WeakValueDictionary()
+
+# Strong references to recently used pools so they survive between turns
+# when sessions live in an external store
+_recent_pools: "OrderedDict[str, QuestionPool]" = OrderedDict()
+RECENT_POOLS_LIMIT = 256
+
+def _remember(pool: QuestionPool):
+    _recent_pools[pool.digest] = pool
+    _recent_pools.move_to_end(pool.digest)
+    while len(_recent_pools) > RECENT_POOLS_LIMIT:
+        _recent_pools.popitem(last=False)
+
+def intern_pool(questions: Iterable[str]) -> QuestionPool:
+    """Return the shared pool for these questions, creating it on first use"""
+    questions = tuple(questions)
+    digest = pool_digest(questions)
+    pool = _pools.get(digest)
+    if pool is None:
+        pool = QuestionPool(digest, questions)
+        _pools[digest] = pool
+    _remember(pool)
+    return pool
+
+def get_pool(digest: str) -> Optional[QuestionPool]:
+    """Look up a pool already interned in this process"""
+    pool = _pools.get(digest)
+    if pool is not None:
+        _remember(pool)
+    return pool
+
+
+DEFAULT_POOL = intern_pool(JS_QUESTIONS)
@@ -0,0 +1,154 @@
+"""Compact in-memory representation of a live interview session"""
+
+import hashlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from app.models.question_pool import QuestionPool, get_pool
+
+
+def _plan_offset(seed: int, step: int, remaining: int) -> int:
+    """Deterministic pseudo-random offset in [0, remaining) for one shuffle step"""
+    digest = hashlib.blake2b(f"{seed}:{step}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % remaining
+
+
+@dataclass(slots=True)
+class InterviewSession:
+    """
+    State for one interview call.
+
+    Questions are stored as indices into a shared, interned QuestionPool and
+    scores as a byte array, so a session costs a few hundred bytes regardless
+    of how long the questions are. Answer transcripts are only kept in batch
+    scoring mode, until they are scored at the end of the interview, and for
+    answers with a provisional score (`provisional`, by position in `scores`),
+    so they can be re-scored after the call.
+
+    Question order is a random permutation of the pool fixed by `plan_seed`.
+    It is materialised lazily as a Fisher-Yates shuffle: `plan_swaps` holds
+    only the positions touched so far, so each draw is O(1) in time and memory
+    whatever the pool size, and the pool may grow between draws. `pool_pending`
+    marks a session started on a partially generated pool that will be replaced
+    by larger ones with the same prefix.
+    """
+    pool_digest: str
+    pool: Optional[QuestionPool] = None
+    interview_id: Optional[str] = None
+    language: str = "JavaScript"
+    email: Optional[str] = None
+    pass_percentage: int = 50
+    meeting_link: Optional[str] = None
+    scoring_mode: Optional[str] = None
+    escalation_threshold: Optional[float] = None
+    early_stop: Optional[bool] = None
+    asked: array = field(default_factory=lambda: array('I'))
+    scores: array = field(default_factory=lambda: array('B'))
+    answers: List[str] = field(default_factory=list)
+    provisional: Dict[int, str] = field(default_factory=dict)
+    waiting_for_answer: bool = True
+    plan_seed: int = 0
+    plan_swaps: Dict[int, int] = field(default_factory=dict)
+    pool_pending: bool = False
+
+    @classmethod
+    def create(cls, pool: QuestionPool, config: Dict[str, Any], interview_id: Optional[str] = None, seed: int = 0) -> "InterviewSession":
+        """Start a session over `pool` with the settings from an interview config"""
+        return cls(
+            plan_seed=seed,
+            pool_digest=pool.digest,
+            pool=pool,
+            interview_id=interview_id,
+            language=config.get('language', 'JavaScript'),
+            email=config.get('email'),
+            pass_percentage=config.get('passPercentage', 50),
+            meeting_link=config.get('meetingLink'),
+            scoring_mode=config.get('scoringMode'),
+            escalation_threshold=config.get('escalationThreshold'),
+            early_stop=config.get('earlyStop'),
+        )
+
+    @property
+    def questions_asked(self) -> int:
+        return len(self.asked)
+
+    @property
+    def questions_answered(self) -> int:
+        """Answers scored so far plus answers recorded for batch scoring"""
+        return len(self.scores) + len(self.answers)
+
+    @property
+    def total_score(self) -> int:
+        return sum(self.scores)
+
+    @property
+    def current_question(self) -> Optional[str]:
+        if not self.asked or self.pool is None:
+            return None
+        return self.pool[self.asked[-1]]
+
+    def next_question_index(self) -> Optional[int]:
+        """Draw the next question from the shuffled plan, or None if the pool is used up"""
+        step = len(self.asked)
+        remaining = len(self.pool) - step
+        if remaining <= 0:
+            return None
+        target = step + _plan_offset(self.plan_seed, step, remaining)
+        index = self.plan_swaps.pop(target, target)
+        if target != step:
+            self.plan_swaps[target] = self.plan_swaps.pop(step, step)
+        else:
+            self.plan_swaps.pop(step, None)
+        return index
+
+    def ask(self, index: int) -> str:
+        """Record question `index` as asked and return its text"""
+        self.asked.append(index)
+        self.waiting_for_answer = True
+        return self.pool[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for shared session stores"""
+        return {
+            "pool": self.pool_digest,
+            "interview_id": self.interview_id,
+            "language": self.language,
+            "email": self.email,
+            "pass_percentage": self.pass_percentage,
+            "meeting_link": self.meeting_link,
+            "scoring_mode": self.scoring_mode,
+            "escalation_threshold": self.escalation_threshold,
+            "early_stop": self.early_stop,
+            "asked": self.asked.tolist(),
+            "scores": self.scores.tolist(),
+            "answers": self.answers,
+            "provisional": list(self.provisional.items()),
+            "waiting_for_answer": self.waiting_for_answer,
+            "plan_seed": self.plan_seed,
+            "plan_swaps": list(self.plan_swaps.items()),
+            "pool_pending": self.pool_pending,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InterviewSession":
+        """Deserialize from a shared session store; `pool` is None if not interned locally yet"""
+        return cls(
+            pool_digest=data["pool"],
+            pool=get_pool(data["pool"]),
+            interview_id=data.get("interview_id"),
+            language=data.get("language", "JavaScript"),
+            email=data.get("email"),
+            pass_percentage=data.get("pass_percentage", 50),
+            meeting_link=data.get("meeting_link"),
+            scoring_mode=data.get("scoring_mode"),
+            escalation_threshold=data.get("escalation_threshold"),
+            early_stop=data.get("early_stop"),
+            asked=array('I', data.get("asked", [])),
+            scores=array('B', data.get("scores", [])),
+            answers=list(data.get("answers", [])),
+            provisional=dict(data.get("provisional", [])),
+            waiting_for_answer=data.get("waiting_for_answer", True),
+            plan_seed=data.get("plan_seed", 0),
+            plan_swaps=dict(data.get("plan_swaps", [])),
+            pool_pending=data.get("pool_pending", False),
+        )
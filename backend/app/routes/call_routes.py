@@ -2,38 +2,50 @@
 
 from fastapi import APIRouter, Form
 from fastapi.responses import Response
-from twilio.rest import Client
-from app.config import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER, DOMAIN, WS_URL, WELCOME_GREETING
+from app.config import DOMAIN, WS_URL, WELCOME_GREETING, SPECULATIVE_SCORING_ENABLED
+from app.services.interview_service import get_interview_config, call_admission
+from app.services.twilio_client import create_call
+from app.services.campaign_dialer import record_call_outcome
+from app.routes.setup_routes import over_capacity_response
 
 router = APIRouter()
-twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
 
 @router.post("/make-call")
 async def make_outbound_call(phone_number: str = Form(...)):
     """Make an outbound call to the specified number"""
+    if not call_admission.has_capacity():
+        return over_capacity_response()
     try:
-        call = twilio_client.calls.create(
-            to=phone_number,
-            from_=TWILIO_PHONE_NUMBER,
-            url=f"https://{DOMAIN}/outbound-twiml",
-            method="POST"
-        )
+        call_sid = await create_call(phone_number, f"https://{DOMAIN}/outbound-twiml")
         
         return {
             "success": True,
-            "call_sid": call.sid,
+            "call_sid": call_sid,
             "message": f"Calling {phone_number}..."
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@router.post("/campaign-call-status")
+async def campaign_call_status(CallSid: str = Form(...), CallStatus: str = Form(...)):
+    """Status callback for campaign calls; a final status frees the call's live slot"""
+    await record_call_outcome(CallSid, CallStatus)
+    return Response(status_code=204)
+
 @router.post("/outbound-twiml")
 async def outbound_twiml_endpoint(interview_id: str = None):
     """TwiML for outbound calls - uses ConversationRelay with proper control"""
     # Add interview_id as query parameter if available
     ws_url = WS_URL
+    speculative = SPECULATIVE_SCORING_ENABLED
     if interview_id:
         ws_url = f"{WS_URL}?interview_id={interview_id}"
+        config = await get_interview_config(interview_id) or {}
+        if config.get('speculativeScoring') is not None:
+            speculative = config['speculativeScoring']
+    
+    # Partial transcripts let answers be scored while the candidate is still speaking
+    partial_prompts = "true" if speculative else "false"
     
     xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
     <Response>
@@ -45,6 +57,7 @@ async def outbound_twiml_endpoint(interview_id: str = None):
             interruptible="speech"
             reportInputDuringAgentSpeech="none"
             preemptible="false"
+            partialPrompts="{partial_prompts}"
             dtmfDetection="true" />
       </Connect>
     </Response>"""
@@ -54,25 +67,21 @@ async def outbound_twiml_endpoint(interview_id: str = None):
 @router.post("/ask-question/{question_num}")
 async def ask_question(question_num: int, CallSid: str = Form(...)):
     """Ask a specific question number"""
-    from app.models.questions import JS_QUESTIONS
+    from app.models.question_pool import DEFAULT_POOL
+    from app.models.session import InterviewSession
     import random
     
     # Get or create interview session
-    from app.services.interview_service import interview_sessions
+    from app.services.interview_service import interview_sessions, load_session
     
-    if CallSid not in interview_sessions:
+    session = await load_session(CallSid)
+    if session is None:
         # Initialize new session
-        question = random.choice(JS_QUESTIONS)
-        interview_sessions[CallSid] = {
-            'questions_asked': 1,
-            'total_score': 0,
-            'current_question': question,
-            'used_questions': [question],
-            'scores': [],
-            'waiting_for_answer': True
-        }
+        session = InterviewSession.create(DEFAULT_POOL, {}, seed=random.getrandbits(63))
+        question = session.ask(session.next_question_index())
+        await interview_sessions.set(CallSid, session)
     else:
-        question = interview_sessions[CallSid]['current_question']
+        question = session.current_question
     
     xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
     <Response>
@@ -100,7 +109,7 @@ async def process_answer_endpoint(question_num: int, CallSid: str = Form(...), T
     result = await process_answer(CallSid, TranscriptionText)
     
     # Check if interview is complete
-    if CallSid not in interview_sessions:
+    if await interview_sessions.get(CallSid) is None:
         # Interview ended
         xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
         <Response>
@@ -1,8 +1,13 @@
 """Routes for handling interview-related endpoints"""
 
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from app.config import EVENT_STREAM_KEEPALIVE_SECONDS, EVENT_STREAM_MAX_CALLS
 from app.services.interview_service import get_interview_status, end_interview
+from app.services.interview_events import subscribe, unsubscribe
 from app.services.email_service import send_interview_selection_email, send_interview_rejection_email, send_interview_incomplete_email
 
 router = APIRouter()
@@ -16,12 +21,47 @@ class TestEmailRequest(BaseModel):
 @router.get("/interview-status/{call_sid}")
 async def get_interview_status_endpoint(call_sid: str):
     """Get the current interview status for a call"""
-    return get_interview_status(call_sid)
+    return await get_interview_status(call_sid)
+
+@router.get("/interview-events")
+async def interview_events_endpoint(call_sids: str):
+    """
+    Server-sent events for live interviews, instead of polling /interview-status
+
+    `call_sids` is a comma-separated list of calls to watch over this one connection.
+    Each call first gets its latest event, then started, question, score, completed,
+    ended and disconnected events as they happen.
+    """
+    watched = [call_sid for call_sid in dict.fromkeys(call_sids.split(",")) if call_sid]
+    if not watched:
+        raise HTTPException(status_code=400, detail="At least one call_sid is required")
+    if len(watched) > EVENT_STREAM_MAX_CALLS:
+        raise HTTPException(status_code=400, detail=f"At most {EVENT_STREAM_MAX_CALLS} calls per stream")
+    
+    async def stream():
+        subscription = subscribe(watched)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=EVENT_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            unsubscribe(subscription)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/end-interview/{call_sid}")
 async def end_interview_endpoint(call_sid: str):
     """End interview session and get final results"""
-    return end_interview(call_sid)
+    return await end_interview(call_sid)
 
 @router.post("/test-email")
 async def test_email_endpoint(request: TestEmailRequest):
@@ -1,24 +1,35 @@
 """Routes for interview setup and configuration"""
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from openai import OpenAI
-from twilio.rest import Client
 
-from app.config import OPENAI_API_KEY, TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER, DOMAIN
+from app.config import DOMAIN, CAMPAIGN_MAX_CANDIDATES, ADMISSION_RETRY_AFTER_SECONDS, BACKGROUND_QUESTION_GENERATION
 from app.models.questions import JS_QUESTIONS
+from app.services.interview_service import (
+    set_interview_config,
+    get_interview_config as load_interview_config,
+    start_question_generation,
+    call_admission,
+    QUESTIONS_PER_INTERVIEW,
+)
+from app.services.question_service import generate_questions as generate_question_set
+from app.services.twilio_client import create_call
+from app.services.campaign_dialer import (
+    create_campaign,
+    get_campaign,
+    cancel_campaign,
+    campaign_progress,
+    parse_candidates_csv,
+)
 
 router = APIRouter()
-openai = OpenAI(api_key=OPENAI_API_KEY)
-twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
-# Store interview configurations (in production, use a database)
-interview_configs = {}
 
 class QuestionGenerationRequest(BaseModel):
     language: str
     prompt: str
+    yoe: Optional[str] = None
 
 class InterviewSetupRequest(BaseModel):
     phoneNumber: str
@@ -29,61 +40,105 @@ class InterviewSetupRequest(BaseModel):
     passPercentage: Optional[int] = 50
     questions: Optional[List[str]] = None
     meetingLink: Optional[str] = None
+    scoringMode: Optional[str] = None  # "sequential", "pipelined" or "batch"
+    seed: Optional[int] = None  # Fixes the question order for reproducible interviews
+    backgroundGeneration: Optional[bool] = None  # Dial first and generate questions during the call setup
+    escalationThreshold: Optional[float] = None  # Reference similarity (0-1) above which answers skip the LLM
+    earlyStop: Optional[bool] = None  # End the call once the pass/fail outcome can no longer change
+    speculativeScoring: Optional[bool] = None  # Start scoring on partial transcripts while the candidate speaks
+
+class CampaignCandidate(BaseModel):
+    phoneNumber: str
+    email: Optional[str] = None
+
+class CampaignSetupRequest(BaseModel):
+    candidates: Optional[List[CampaignCandidate]] = None
+    csv: Optional[str] = None  # Candidates as CSV with phone and email columns, instead of or besides `candidates`
+    maxConcurrentCalls: Optional[int] = None  # Live interviews allowed at once, at most CAMPAIGN_MAX_CONCURRENT_CALLS
+    # Interview settings shared by every candidate, as in InterviewSetupRequest
+    language: Optional[str] = None
+    customPrompt: Optional[str] = None
+    yoe: Optional[str] = None
+    passPercentage: Optional[int] = 50
+    questions: Optional[List[str]] = None
+    meetingLink: Optional[str] = None
+    scoringMode: Optional[str] = None
+    escalationThreshold: Optional[float] = None
+    earlyStop: Optional[bool] = None
+    speculativeScoring: Optional[bool] = None
+
+def over_capacity_response() -> JSONResponse:
+    """503 telling the client to retry once live interviews have freed up capacity"""
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+        content={
+            "success": False,
+            "error": "Too many interviews in progress, please retry shortly",
+            "retryAfter": ADMISSION_RETRY_AFTER_SECONDS
+        }
+    )
+
+def _normalize_phone(phone: str) -> str:
+    """Phone number in E.164 form, or "" if none was given"""
+    phone = phone.strip()
+    if phone and not phone.startswith('+'):
+        phone = '+' + phone
+    return phone
+
+async def _resolve_questions(language: str, custom_prompt: str, yoe: str, questions: List[str]) -> List[str]:
+    """The given questions, or a generated set, falling back to the default JS questions"""
+    if not questions:
+        try:
+            # Generate questions automatically (cached per language and prompt)
+            generated_questions = await generate_question_set(language, custom_prompt, yoe)
+            
+            # Use generated questions if we got enough for an interview
+            if len(generated_questions) >= QUESTIONS_PER_INTERVIEW:
+                questions = generated_questions
+                print(f"Auto-generated {len(questions)} questions for {language}")
+            else:
+                print(f"Failed to generate enough questions, falling back to default JS questions")
+                questions = JS_QUESTIONS
+                
+        except Exception as e:
+            print(f"Error auto-generating questions: {str(e)}, falling back to default JS questions")
+            questions = JS_QUESTIONS
+    
+    # Ensure we always have questions
+    if not questions or len(questions) == 0:
+        print("WARNING: No questions available, using default JS questions as final fallback")
+        questions = JS_QUESTIONS
+    return questions
+
+def _interview_config(request, language: str, custom_prompt: str, yoe: str, questions: List[str]) -> dict:
+    """Interview configuration with defaults, from the settings of a setup or campaign request"""
+    return {
+        "language": language, 
+        "customPrompt": custom_prompt,
+        "yoe": yoe,
+        "passPercentage": request.passPercentage or 50,
+        "questions": questions,
+        "meetingLink": request.meetingLink or "https://cal.com/gautam-tayal/sync",
+        "scoringMode": request.scoringMode,
+        "escalationThreshold": request.escalationThreshold,
+        "earlyStop": request.earlyStop,
+        "speculativeScoring": request.speculativeScoring,
+    }
 
 @router.post("/api/generate-questions")
 async def generate_questions(request: QuestionGenerationRequest):
     """Generate 50 technical questions based on user prompt and language"""
     try:
-        generation_prompt = f"""
-        Generate exactly 50 technical interview questions for {request.language} programming language.
-        
-        Focus on: {request.prompt}
-        
-        Requirements:
-        - Mix of theory, practical coding, and problem-solving questions
-        - Appropriate difficulty for technical interviews
-        - Clear, concise questions that can be answered verbally
-        - Cover fundamentals, advanced concepts, and real-world scenarios
-        - No code blocks in questions, just descriptive questions
-        
-        Return as a numbered list of exactly 50 questions.
-        """
-        
-        completion = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": generation_prompt}]
-        )
-        
-        response_text = completion.choices[0].message.content
-        
-        # Parse the questions from the response
-        questions = []
-        lines = response_text.strip().split('\n')
+        questions = await generate_question_set(request.language, request.prompt, request.yoe)
         
-        for line in lines:
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('*')):
-                # Clean up the question text
-                question = line
-                # Remove numbering patterns
-                import re
-                question = re.sub(r'^\d+\.?\s*', '', question)
-                question = re.sub(r'^[-*]\s*', '', question)
-                question = question.strip()
-                
-                if question and len(question) > 10:  # Valid question
-                    questions.append(question)
-        
-        # Ensure we have at least some questions
-        if len(questions) < 20:
+        # Short responses are topped up during generation, so only an empty set is a failure
+        if not questions:
             return {
                 "success": False, 
-                "error": f"Only generated {len(questions)} questions. Please try with a more specific prompt."
+                "error": "No questions were generated. Please try with a more specific prompt."
             }
         
-        # Take up to 50 questions
-        questions = questions[:50]
-        
         return {
             "success": True,
             "questions": questions,
@@ -101,127 +156,128 @@ async def setup_interview(request: InterviewSetupRequest):
     """Setup interview configuration and make the call"""
     try:
         # Validate phone number format - phone number is required
-        phone = request.phoneNumber.strip()
+        phone = _normalize_phone(request.phoneNumber)
         if not phone:
             return {"success": False, "error": "Phone number is required"}
-        if not phone.startswith('+'):
-            phone = '+' + phone
+        
+        # Generate a unique interview ID, and hold a live interview slot for it until the call connects
+        import uuid
+        interview_id = str(uuid.uuid4())
+        if not call_admission.reserve(interview_id):
+            return over_capacity_response()
             
         # Set default values
         language = request.language or "JavaScript"
         custom_prompt = request.customPrompt or f"General technical interview questions for {language}"
+        yoe = request.yoe or "2-3"
         
         # Auto-generate questions if none provided
         questions = request.questions or []
-        if not questions:
-            try:
-                # Generate questions automatically
-                generation_prompt = f"""
-                Generate exactly 50 technical interview questions for {language} programming language.
-                
-                Focus on: {custom_prompt}
-                
-                Requirements:
-                - Mix of theory, practical coding, and problem-solving questions
-                - Appropriate difficulty for technical interviews
-                - Clear, concise questions that can be answered verbally
-                - Cover fundamentals, advanced concepts, and real-world scenarios
-                - No code blocks in questions, just descriptive questions
-                
-                Return as a numbered list of exactly 50 questions.
-                """
-                
-                completion = openai.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": generation_prompt}]
-                )
-                
-                response_text = completion.choices[0].message.content
-                
-                # Parse the questions from the response
-                generated_questions = []
-                lines = response_text.strip().split('\n')
-                
-                for line in lines:
-                    line = line.strip()
-                    if line and (line[0].isdigit() or line.startswith('-') or line.startswith('*')):
-                        # Clean up the question text
-                        question = line
-                        # Remove numbering patterns
-                        import re
-                        question = re.sub(r'^\d+\.?\s*', '', question)
-                        question = re.sub(r'^[-*]\s*', '', question)
-                        question = question.strip()
-                        
-                        if question and len(question) > 10:  # Valid question
-                            generated_questions.append(question)
-                
-                # Use generated questions if we got at least some
-                if len(generated_questions) >= 20:
-                    questions = generated_questions[:50]  # Take up to 50 questions
-                    print(f"Auto-generated {len(questions)} questions for {language}")
-                else:
-                    print(f"Failed to generate enough questions, falling back to default JS questions")
-                    questions = JS_QUESTIONS
-                    
-            except Exception as e:
-                print(f"Error auto-generating questions: {str(e)}, falling back to default JS questions")
-                questions = JS_QUESTIONS
-        
-        # Ensure we always have questions
-        if not questions or len(questions) == 0:
-            print("WARNING: No questions available, using default JS questions as final fallback")
-            questions = JS_QUESTIONS
+        background_generation = not questions and (
+            request.backgroundGeneration if request.backgroundGeneration is not None else BACKGROUND_QUESTION_GENERATION
+        )
+        if background_generation:
+            print(f"Dialing first, questions for {language} will be generated in the background")
+        else:
+            questions = await _resolve_questions(language, custom_prompt, yoe, questions)
             
         print(f"Final questions count: {len(questions)}")
         
         # Create interview configuration with defaults
-        config = {
-            "email": request.email or "candidate@example.com",
-            "language": language, 
-            "customPrompt": custom_prompt,
-            "yoe": request.yoe or "2-3",
-            "passPercentage": request.passPercentage or 50,
-            "questions": questions,
-            "meetingLink": request.meetingLink or "https://cal.com/gautam-tayal/sync"
-        }
+        config = _interview_config(request, language, custom_prompt, yoe, questions)
+        config["email"] = request.email or "candidate@example.com"
+        config["seed"] = request.seed
+        config["questionsStatus"] = "pending" if background_generation else None
         
-        # Generate a unique interview ID
-        import uuid
-        interview_id = str(uuid.uuid4())
-        
-        # Store configuration in both places for now
-        interview_configs[interview_id] = config
-        
-        # Also store in interview service
-        from app.services.interview_service import set_interview_config
-        set_interview_config(interview_id, config)
+        # Store configuration in the shared session store so any worker can serve the call
+        await set_interview_config(interview_id, config)
+        if background_generation:
+            start_question_generation(interview_id, language, custom_prompt, yoe)
         
         # Make the call with interview_id as parameter
-        call = twilio_client.calls.create(
-            to=phone,
-            from_=TWILIO_PHONE_NUMBER,
-            url=f"https://{DOMAIN}/outbound-twiml?interview_id={interview_id}",
-            method="POST"
-        )
+        call_sid = await create_call(phone, f"https://{DOMAIN}/outbound-twiml?interview_id={interview_id}")
         
         return {
             "success": True,
-            "call_sid": call.sid,
+            "call_sid": call_sid,
             "interview_id": interview_id,
             "message": f"Interview call initiated to {phone}"
         }
         
     except Exception as e:
+        call_admission.cancel_reservation(interview_id)
         return {
             "success": False,
             "error": f"Failed to setup interview: {str(e)}"
         }
 
+@router.post("/api/campaigns")
+async def setup_campaign(request: CampaignSetupRequest):
+    """Set up interviews for a list of candidates and dial them in the background"""
+    try:
+        candidates = [{"phoneNumber": c.phoneNumber, "email": c.email} for c in request.candidates or []]
+        if request.csv:
+            candidates += parse_candidates_csv(request.csv)
+        
+        # Drop blank and duplicate numbers, keeping the first email given for each
+        seen = set()
+        entries = []
+        for candidate in candidates:
+            phone = _normalize_phone(candidate["phoneNumber"])
+            if phone and phone not in seen:
+                seen.add(phone)
+                entries.append({"phone": phone, "email": candidate.get("email")})
+        if not entries:
+            return {"success": False, "error": "At least one candidate phone number is required"}
+        if len(entries) > CAMPAIGN_MAX_CANDIDATES:
+            return {"success": False, "error": f"A campaign can have at most {CAMPAIGN_MAX_CANDIDATES} candidates"}
+        
+        language = request.language or "JavaScript"
+        custom_prompt = request.customPrompt or f"General technical interview questions for {language}"
+        yoe = request.yoe or "2-3"
+        
+        # Questions are generated once for the whole campaign
+        questions = await _resolve_questions(language, custom_prompt, yoe, request.questions or [])
+        config = _interview_config(request, language, custom_prompt, yoe, questions)
+        config["email"] = "candidate@example.com"
+        
+        campaign = await create_campaign(entries, config, request.maxConcurrentCalls)
+        return {
+            "success": True,
+            "campaign_id": campaign["id"],
+            "candidates": len(entries),
+            "skipped": len(candidates) - len(entries),
+            "message": f"Campaign created, dialing {len(entries)} candidates"
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Failed to setup campaign: {str(e)}"
+        }
+
+@router.get("/api/campaigns/{campaign_id}")
+async def get_campaign_status(campaign_id: str):
+    """Get a campaign's progress and the status of each candidate's call"""
+    campaign = await get_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    return {"success": True, "campaign": {**campaign, "progress": campaign_progress(campaign)}}
+
+@router.post("/api/campaigns/{campaign_id}/cancel")
+async def cancel_campaign_endpoint(campaign_id: str):
+    """Stop dialing a campaign's remaining candidates"""
+    campaign = await cancel_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    return {"success": True, "status": campaign["status"], "progress": campaign_progress(campaign)}
+
 @router.get("/api/interview-config/{interview_id}")
 async def get_interview_config(interview_id: str):
     """Get interview configuration by ID"""
-    config = interview_configs.get(interview_id)
+    config = await load_interview_config(interview_id, include_questions=True)
     if not config:
         raise HTTPException(status_code=404, detail="Interview configuration not found")
     
@@ -0,0 +1,78 @@
+"""Routes for runtime statistics"""
+
+from fastapi import APIRouter
+from app.services.interview_service import interview_sessions, custom_configs, question_pools, interview_counters, speculation_counters, call_admission
+from app.services.question_service import get_question_cache_stats
+from app.websocket.call_actor import call_actors, actor_counters
+from app.services.scoring_service import get_scoring_cache_stats, get_tiered_scoring_stats, get_scoring_latency_stats
+from app.services.rescoring_queue import get_rescoring_stats
+from app.services.llm_client import llm_scheduler
+from app.services.campaign_dialer import get_campaign_stats
+from app.services.interview_events import get_event_stats
+
+router = APIRouter()
+
+@router.get("/api/stats/store")
+async def get_store_stats():
+    """Get entry counts, approximate sizes and evictions for the session, config and question pool stores"""
+    return {
+        "success": True,
+        "sessions": await interview_sessions.stats(),
+        "configs": await custom_configs.stats(),
+        "pools": await question_pools.stats()
+    }
+
+@router.get("/api/stats/question-cache")
+async def get_question_cache_stats_endpoint():
+    """Get hit/miss counters for the generated question cache"""
+    return {"success": True, "question_cache": await get_question_cache_stats()}
+
+@router.get("/api/stats/scoring-cache")
+async def get_scoring_cache_stats_endpoint():
+    """Get hit rate and saved latency for the answer scoring cache"""
+    return {"success": True, "scoring_cache": await get_scoring_cache_stats()}
+
+@router.get("/api/stats/scoring-tiers")
+async def get_scoring_tier_stats_endpoint():
+    """Get how many answers were scored locally and how many escalated to the LLM"""
+    return {"success": True, "scoring_tiers": get_tiered_scoring_stats()}
+
+@router.get("/api/stats/interviews")
+async def get_interview_stats():
+    """Get completed interviews and how many ended early once their outcome was decided"""
+    return {"success": True, "interviews": interview_counters}
+
+@router.get("/api/stats/calls")
+async def get_call_stats():
+    """Get live calls on this worker, turns cancelled by caller interrupts and speculative score reuse"""
+    return {"success": True, "active_calls": len(call_actors), **actor_counters, "speculative_scores": speculation_counters}
+
+@router.get("/api/stats/scoring-latency")
+async def get_scoring_latency_stats_endpoint():
+    """Get scoring latency percentiles, hedged requests and circuit breaker state"""
+    return {"success": True, "scoring_latency": get_scoring_latency_stats()}
+
+@router.get("/api/stats/rescoring")
+async def get_rescoring_stats_endpoint():
+    """Get counters and pending jobs of the deferred re-scoring queue"""
+    return {"success": True, "rescoring": await get_rescoring_stats()}
+
+@router.get("/api/stats/llm-scheduler")
+async def get_llm_scheduler_stats():
+    """Get LLM rate-limit budgets, queue depth and wait times by priority (0 = in-call scoring)"""
+    return {"success": True, "llm_scheduler": llm_scheduler.stats()}
+
+@router.get("/api/stats/campaigns")
+async def get_campaign_stats_endpoint():
+    """Get campaign dialer counters across campaigns"""
+    return {"success": True, "campaigns": get_campaign_stats()}
+
+@router.get("/api/stats/admission")
+async def get_admission_stats():
+    """Get live, queued and reserved interviews on this worker, with admission and load-shedding counts"""
+    return {"success": True, "admission": call_admission.stats()}
+
+@router.get("/api/stats/events")
+async def get_event_stats_endpoint():
+    """Get live interview event counts and stream subscribers on this worker"""
+    return {"success": True, "events": get_event_stats()}
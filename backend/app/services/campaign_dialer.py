@@ -0,0 +1,265 @@
+"""Bulk screening campaigns, dialed within the Twilio account's call rate and a live call limit
+
+The dialer works through a campaign's candidates, writing each interview config
+just before its call so that configs outlive the call rather than the campaign's
+start. Calls start no faster than CAMPAIGN_CALLS_PER_SECOND, and at most
+CAMPAIGN_MAX_CONCURRENT_CALLS are live at a time; both limits are shared by all of
+the worker's campaigns, and `max_concurrent` can lower the live limit for a single
+campaign. A call stops counting as live when Twilio reports its final status to
+the campaign status callback, or after CAMPAIGN_CALL_TIMEOUT_SECONDS. While the
+worker's admission control has no capacity, dialing pauses.
+
+Campaigns are dialed by the worker that created them. Their progress is written
+to a session store so any worker can report it or cancel them; final call
+statuses arrive through a second store, since Twilio may post them to any worker.
+"""
+
+import asyncio
+import csv
+import io
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from app.config import (
+    DOMAIN,
+    CAMPAIGN_CALLS_PER_SECOND,
+    CAMPAIGN_MAX_CONCURRENT_CALLS,
+    CAMPAIGN_CALL_TIMEOUT_SECONDS,
+    CAMPAIGN_POLL_SECONDS,
+    CAMPAIGN_TTL_SECONDS,
+)
+from app.services.interview_service import set_interview_config, call_admission
+from app.services.session_store import create_session_store
+from app.services.twilio_client import create_call
+from app.utils.rate_limit import TokenBucket
+
+# Campaign progress by campaign id
+campaigns = create_session_store("campaigns", ttl=CAMPAIGN_TTL_SECONDS)
+
+# Final statuses of campaign calls by call sid, as posted by Twilio
+call_outcomes = create_session_store("call_outcomes", ttl=CAMPAIGN_TTL_SECONDS)
+
+campaign_counters = {"campaigns": 0, "dialed": 0, "dial_errors": 0, "finished": 0, "timed_out": 0, "paused_for_capacity": 0}
+
+FINAL_CALL_STATUSES = {"completed", "busy", "no-answer", "failed", "canceled"}
+
+# Campaigns this worker is dialing, by campaign id
+_active: Dict[str, Dict[str, Any]] = {}
+# Interview config shared by each active campaign's candidates, by campaign id
+_configs: Dict[str, Dict[str, Any]] = {}
+# Dials are spaced evenly, so no one-second window ever exceeds the account limit
+_dial_budget = TokenBucket(CAMPAIGN_CALLS_PER_SECOND * 60, capacity=1.0)
+_dials: set = set()
+_wakeup = asyncio.Event()
+_worker: Optional[asyncio.Task] = None
+
+def parse_candidates_csv(text: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Read candidates from CSV text
+
+    With a header row, the phone number is taken from a column named like "phone"
+    and the email from one named like "email"; without one, from the first two columns.
+    """
+    rows = [row for row in csv.reader(io.StringIO(text.strip())) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    phone_column = next((i for i, name in enumerate(header) if "phone" in name), None)
+    if phone_column is None:
+        phone_column, email_column = 0, 1
+    else:
+        email_column = next((i for i, name in enumerate(header) if "email" in name), None)
+        rows = rows[1:]
+
+    def cell(row: List[str], column: Optional[int]) -> Optional[str]:
+        if column is None or column >= len(row):
+            return None
+        return row[column].strip() or None
+
+    return [{"phoneNumber": cell(row, phone_column) or "", "email": cell(row, email_column)} for row in rows]
+
+async def create_campaign(candidates: List[Dict[str, Any]], config: Dict[str, Any], max_concurrent: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Queue a campaign for dialing; each candidate's interview config is written when they are dialed
+
+    Args:
+        candidates (List[Dict[str, Any]]): Normalized phone number and optional email per candidate
+        config (Dict[str, Any]): Interview config shared by all candidates, questions included
+        max_concurrent (int): Live calls allowed at once, at most CAMPAIGN_MAX_CONCURRENT_CALLS
+    """
+    campaign_id = str(uuid.uuid4())
+    entries = [
+        {"phone": candidate["phone"], "email": candidate.get("email"), "interview_id": str(uuid.uuid4()),
+         "status": "queued", "call_sid": None, "dialed_at": None, "error": None}
+        for candidate in candidates
+    ]
+    campaign = {
+        "id": campaign_id,
+        "status": "running",
+        "created_at": time.time(),
+        "max_concurrent": min(max_concurrent or CAMPAIGN_MAX_CONCURRENT_CALLS, CAMPAIGN_MAX_CONCURRENT_CALLS),
+        "candidates": entries,
+    }
+    await campaigns.set(campaign_id, campaign)
+    _active[campaign_id] = campaign
+    _configs[campaign_id] = config
+    campaign_counters["campaigns"] += 1
+    print(f"Campaign {campaign_id} created with {len(entries)} candidates")
+    _wakeup.set()
+    return campaign
+
+def campaign_progress(campaign: Dict[str, Any]) -> Dict[str, int]:
+    """Number of the campaign's candidates in each status"""
+    progress: Dict[str, int] = {}
+    for entry in campaign["candidates"]:
+        progress[entry["status"]] = progress.get(entry["status"], 0) + 1
+    return progress
+
+async def get_campaign(campaign_id: str) -> Optional[Dict[str, Any]]:
+    """A campaign with its candidates, from this worker if it is dialing it"""
+    return _active.get(campaign_id) or await campaigns.get(campaign_id)
+
+async def cancel_campaign(campaign_id: str) -> Optional[Dict[str, Any]]:
+    """Stop dialing a campaign's queued candidates; calls already placed carry on"""
+    campaign = _active.get(campaign_id)
+    if campaign is None:
+        campaign = await campaigns.get(campaign_id)
+        if campaign is None:
+            return None
+        if campaign["status"] == "running":
+            # Dialed by another worker, which picks this up on its next pass
+            await campaigns.set(f"{campaign_id}:cancel", True)
+            campaign["status"] = "cancelling"
+        return campaign
+    if campaign["status"] == "running":
+        campaign["status"] = "cancelled"
+        for entry in campaign["candidates"]:
+            if entry["status"] == "queued":
+                entry["status"] = "cancelled"
+        await campaigns.set(campaign_id, campaign)
+        _wakeup.set()
+    return campaign
+
+async def record_call_outcome(call_sid: str, status: str):
+    """Record a campaign call's final status, freeing its live call slot"""
+    if status in FINAL_CALL_STATUSES:
+        await call_outcomes.set(call_sid, status)
+        _wakeup.set()
+
+def _live_calls() -> int:
+    """Calls being dialed or live across all of this worker's campaigns"""
+    return sum(
+        1 for campaign in _active.values() for entry in campaign["candidates"]
+        if entry["status"] in ("live", "dialing")
+    )
+
+async def _dial(campaign: Dict[str, Any], entry: Dict[str, Any]):
+    try:
+        # The shared question pool is stored once; each config only references it
+        config = _configs[campaign["id"]]
+        await set_interview_config(entry["interview_id"], {**config, "email": entry["email"] or config["email"]})
+        entry["call_sid"] = await create_call(
+            entry["phone"],
+            f"https://{DOMAIN}/outbound-twiml?interview_id={entry['interview_id']}",
+            status_callback=f"https://{DOMAIN}/campaign-call-status",
+        )
+        entry["status"] = "live"
+        entry["dialed_at"] = time.time()
+        campaign_counters["dialed"] += 1
+    except Exception as e:
+        call_admission.cancel_reservation(entry["interview_id"])
+        entry["status"] = "dial_failed"
+        entry["error"] = str(e)
+        campaign_counters["dial_errors"] += 1
+        print(f"Error dialing {entry['phone']} for campaign {campaign['id']}: {str(e)}")
+    await campaigns.set(campaign["id"], campaign)
+    _wakeup.set()
+
+async def _advance(campaign: Dict[str, Any]):
+    """Settle finished calls, then start as many queued calls as the limits allow"""
+    if campaign["status"] == "running" and await campaigns.get(f"{campaign['id']}:cancel"):
+        await cancel_campaign(campaign["id"])
+
+    changed = False
+    live = 0
+    for entry in campaign["candidates"]:
+        if entry["status"] == "live":
+            outcome = await call_outcomes.get(entry["call_sid"])
+            if outcome is not None:
+                entry["status"] = outcome
+                campaign_counters["finished"] += 1
+                changed = True
+            elif time.time() - entry["dialed_at"] > CAMPAIGN_CALL_TIMEOUT_SECONDS:
+                entry["status"] = "timed_out"
+                campaign_counters["timed_out"] += 1
+                changed = True
+            else:
+                live += 1
+        elif entry["status"] == "dialing":
+            live += 1
+
+    # The live call limit is shared by all campaigns, not multiplied by them
+    total_live = _live_calls()
+    queued = (entry for entry in campaign["candidates"] if entry["status"] == "queued")
+    while (campaign["status"] == "running" and live < campaign["max_concurrent"]
+           and total_live < CAMPAIGN_MAX_CONCURRENT_CALLS):
+        entry = next(queued, None)
+        if entry is None:
+            break
+        wait = _dial_budget.seconds_until(1)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if not call_admission.has_capacity():
+            # Backpressure: the candidate stays queued until live interviews end
+            campaign_counters["paused_for_capacity"] += 1
+            break
+        _dial_budget.take(1)
+        call_admission.reserve(entry["interview_id"])
+        entry["status"] = "dialing"
+        live += 1
+        total_live += 1
+        # Dial concurrently so slow API responses don't lower the call rate
+        task = asyncio.create_task(_dial(campaign, entry))
+        _dials.add(task)
+        task.add_done_callback(_dials.discard)
+
+    if live == 0 and not any(entry["status"] == "queued" for entry in campaign["candidates"]):
+        if campaign["status"] == "running":
+            campaign["status"] = "done"
+            print(f"Campaign {campaign['id']} done: {campaign_progress(campaign)}")
+        del _active[campaign["id"]]
+        _configs.pop(campaign["id"], None)
+        await campaigns.delete(f"{campaign['id']}:cancel")
+        changed = True
+    if changed:
+        await campaigns.set(campaign["id"], campaign)
+
+async def _run():
+    """Advance active campaigns, then sleep until a call ends or the poll interval passes"""
+    while True:
+        for campaign in list(_active.values()):
+            try:
+                await _advance(campaign)
+            except Exception as e:
+                print(f"Error advancing campaign {campaign['id']}: {str(e)}")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=CAMPAIGN_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+def start_campaign_dialer():
+    """Start the background campaign dialer"""
+    global _worker
+    _worker = asyncio.create_task(_run())
+
+async def stop_campaign_dialer():
+    """Stop dialing; calls already placed carry on and queued candidates stay queued"""
+    if _worker is not None:
+        _worker.cancel()
+        await asyncio.gather(_worker, *_dials, return_exceptions=True)
+    await campaigns.close()
+    await call_outcomes.close()
+
+def get_campaign_stats() -> Dict[str, Any]:
+    return {**campaign_counters, "active_campaigns": len(_active)}
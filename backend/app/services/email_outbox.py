@@ -0,0 +1,315 @@
+"""Durable background email outbox delivering candidate notifications over pooled SMTP connections"""
+
+import asyncio
+import json
+import os
+import random
+import smtplib
+import socket
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import (
+    GMAIL_USER,
+    EMAIL_OUTBOX_DB_PATH,
+    EMAIL_OUTBOX_WORKERS,
+    EMAIL_OUTBOX_BATCH_SIZE,
+    EMAIL_OUTBOX_POLL_SECONDS,
+    EMAIL_OUTBOX_MAX_ATTEMPTS,
+    EMAIL_OUTBOX_BACKOFF_SECONDS,
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS,
+    EMAIL_SMTP_IDLE_SECONDS,
+    EMAIL_OUTBOX_DRAIN_SECONDS,
+    EMAIL_OUTBOX_LEASE_SECONDS,
+)
+from app.services.email_service import EMAIL_BUILDERS, smtp_configured, open_smtp_connection
+
+# Emails accepted by enqueue_email but not yet committed to the outbox table
+_intake: "asyncio.Queue[Tuple]" = asyncio.Queue()
+_wakeup = asyncio.Event()
+
+# All SQLite access happens on one thread with one connection
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-outbox-db")
+_db: Optional[sqlite3.Connection] = None
+
+_writer: Optional[asyncio.Task] = None
+_workers: List[asyncio.Task] = []
+_connections: Dict[int, Optional[smtplib.SMTP]] = {}
+
+# Identifies this process's claims; other processes may share the outbox database
+_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    interview_id TEXT NOT NULL,
+    email_type TEXT NOT NULL,
+    candidate_email TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    claimed_by TEXT,
+    lease_until REAL,
+    UNIQUE (interview_id, email_type)
+);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at);
+"""
+
+# Columns added after the first release, created on databases that predate them
+MIGRATIONS = {
+    "claimed_by": "ALTER TABLE email_outbox ADD COLUMN claimed_by TEXT",
+    "lease_until": "ALTER TABLE email_outbox ADD COLUMN lease_until REAL",
+}
+
+async def _run_db(fn, *args):
+    """Run a database function on the outbox thread"""
+    return await asyncio.get_running_loop().run_in_executor(_db_executor, fn, *args)
+
+def _open_db():
+    """Open the outbox database in WAL mode, adding any columns it is missing"""
+    global _db
+    directory = os.path.dirname(EMAIL_OUTBOX_DB_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _db = sqlite3.connect(EMAIL_OUTBOX_DB_PATH)
+    _db.execute("PRAGMA journal_mode=WAL")
+    _db.execute("PRAGMA synchronous=NORMAL")
+    _db.executescript(SCHEMA)
+    columns = {row[1] for row in _db.execute("PRAGMA table_info(email_outbox)")}
+    for column, statement in MIGRATIONS.items():
+        if column not in columns:
+            _db.execute(statement)
+    _db.commit()
+    # Emails claimed by a process that stopped are picked up again once their lease expires
+    pending, claimed = _db.execute(
+        "SELECT SUM(status = 'pending'), SUM(status = 'sending') FROM email_outbox"
+    ).fetchone()
+    print(f"Email outbox opened at {EMAIL_OUTBOX_DB_PATH}: {pending or 0} pending, {claimed or 0} claimed")
+
+def _close_db():
+    global _db
+    if _db is not None:
+        _db.close()
+        _db = None
+
+def _insert_batch(rows: List[Tuple]) -> int:
+    """Persist a batch of new emails in one commit, ignoring duplicate idempotency keys"""
+    before = _db.total_changes
+    _db.executemany(
+        """INSERT OR IGNORE INTO email_outbox
+           (interview_id, email_type, candidate_email, payload, next_attempt_at, created_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        rows
+    )
+    _db.commit()
+    return _db.total_changes - before
+
+def _claim_due(limit: int) -> List[Dict[str, Any]]:
+    """
+    Lease up to `limit` due emails to this process and return them
+
+    Claiming is one UPDATE, so two processes sharing the database never claim the
+    same email. Emails whose lease expired, because the process sending them
+    stopped, are due again.
+    """
+    now = time.time()
+    rows = _db.execute(
+        """UPDATE email_outbox SET status = 'sending', claimed_by = ?, lease_until = ?
+           WHERE id IN (
+               SELECT id FROM email_outbox
+               WHERE (status = 'pending' AND next_attempt_at <= ?)
+                  OR (status = 'sending' AND COALESCE(lease_until, 0) <= ?)
+               ORDER BY next_attempt_at LIMIT ?
+           )
+           RETURNING id, email_type, candidate_email, payload, attempts""",
+        (_owner, now + EMAIL_OUTBOX_LEASE_SECONDS, now, now, limit)
+    ).fetchall()
+    _db.commit()
+    return [
+        {"id": row[0], "email_type": row[1], "candidate_email": row[2], "kwargs": json.loads(row[3]), "attempts": row[4]}
+        for row in rows
+    ]
+
+def _backoff_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(EMAIL_OUTBOX_MAX_BACKOFF_SECONDS, EMAIL_OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+def _record_results(batch: List[Dict[str, Any]], errors: Dict[int, Tuple[str, bool]]):
+    """Mark a delivered batch sent, and reschedule or fail the emails that errored, in one commit"""
+    now = time.time()
+    lost = 0
+    for job in batch:
+        if job["id"] not in errors:
+            cursor = _db.execute(
+                """UPDATE email_outbox SET status = 'sent', sent_at = ?, last_error = NULL, claimed_by = NULL, lease_until = NULL
+                   WHERE id = ? AND claimed_by = ?""",
+                (now, job["id"], _owner)
+            )
+            lost += cursor.rowcount == 0
+            continue
+
+        error, permanent = errors[job["id"]]
+        attempts = job["attempts"] + 1
+        if permanent or attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+            print(f"Giving up on {job['email_type']} email to {job['candidate_email']} after {attempts} attempts: {error}")
+            cursor = _db.execute(
+                """UPDATE email_outbox SET status = 'failed', attempts = ?, last_error = ?, claimed_by = NULL, lease_until = NULL
+                   WHERE id = ? AND claimed_by = ?""",
+                (attempts, error, job["id"], _owner)
+            )
+        else:
+            cursor = _db.execute(
+                """UPDATE email_outbox SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ?, claimed_by = NULL, lease_until = NULL
+                   WHERE id = ? AND claimed_by = ?""",
+                (attempts, error, now + _backoff_delay(attempts), job["id"], _owner)
+            )
+        lost += cursor.rowcount == 0
+    _db.commit()
+    if lost:
+        print(f"Email outbox lease expired on {lost} emails before delivery finished; raise EMAIL_OUTBOX_LEASE_SECONDS")
+
+def enqueue_email(email_type: str, candidate_email: str, interview_id: str, **kwargs) -> bool:
+    """
+    Queue a candidate email for durable background delivery without blocking the caller
+
+    Args:
+        email_type (str): One of the EMAIL_BUILDERS keys
+        candidate_email (str): Candidate's email address
+        interview_id (str): Interview (or call) the email belongs to; at most one email
+            of each type is ever sent per interview
+        **kwargs: Extra arguments for the message builder
+
+    Returns:
+        bool: True if the email was accepted for delivery, False otherwise
+    """
+    if email_type not in EMAIL_BUILDERS:
+        raise ValueError(f"Unknown email type: {email_type}")
+    if not smtp_configured():
+        print("Gmail credentials not configured, skipping email")
+        return False
+
+    now = time.time()
+    _intake.put_nowait((interview_id, email_type, candidate_email, json.dumps(kwargs), now, now))
+    print(f"Queued {email_type} email to {candidate_email} for interview {interview_id}")
+    return True
+
+def enqueue_outcome_email(passed: bool, candidate_email: Optional[str], interview_id: str, meeting_link: Optional[str] = None) -> bool:
+    """Queue the selection or rejection email for a finished interview, if the candidate gave an email"""
+    if not candidate_email or candidate_email == "candidate@example.com":
+        return False
+    if passed:
+        return enqueue_email("selection", candidate_email, interview_id, candidate_name="Candidate", scheduling_link=meeting_link)
+    return enqueue_email("rejection", candidate_email, interview_id)
+
+async def _write_intake():
+    """Commit queued emails to the outbox table in batches"""
+    while True:
+        rows = [await _intake.get()]
+        while not _intake.empty():
+            rows.append(_intake.get_nowait())
+        try:
+            inserted = await _run_db(_insert_batch, rows)
+            if inserted < len(rows):
+                print(f"Email outbox skipped {len(rows) - inserted} duplicate emails")
+            _wakeup.set()
+        except Exception as e:
+            print(f"Email outbox failed to persist {len(rows)} emails: {str(e)}")
+        finally:
+            for _ in rows:
+                _intake.task_done()
+
+def _close_connection(server: Optional[smtplib.SMTP]):
+    """Close an SMTP session, ignoring servers that already hung up"""
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+def _deliver_batch(server: Optional[smtplib.SMTP], batch: List[Dict[str, Any]]) -> Tuple[Optional[smtplib.SMTP], Dict[int, Tuple[str, bool]]]:
+    """Send a batch of emails over one SMTP session, reconnecting once if it dropped"""
+    errors = {}
+    for job in batch:
+        for attempt in range(2):
+            try:
+                msg = EMAIL_BUILDERS[job["email_type"]](job["candidate_email"], **job["kwargs"])
+                if server is None:
+                    server = open_smtp_connection()
+                server.sendmail(GMAIL_USER, job["candidate_email"], msg.as_string())
+                print(f"Interview {job['email_type']} email sent successfully to {job['candidate_email']}")
+                break
+            except smtplib.SMTPServerDisconnected as e:
+                # Pooled session timed out on the server side; retry on a fresh one
+                server = None
+                if attempt == 1:
+                    errors[job["id"]] = (str(e) or "server disconnected", False)
+            except smtplib.SMTPRecipientsRefused as e:
+                errors[job["id"]] = (str(e), True)
+                break
+            except Exception as e:
+                print(f"Failed to send {job['email_type']} email to {job['candidate_email']}: {str(e)}")
+                errors[job["id"]] = (str(e), False)
+                # The session may be in an unknown state after an error
+                _close_connection(server)
+                server = None
+                break
+    return server, errors
+
+async def _worker(worker_id: int):
+    """Claim due emails in batches, keeping the SMTP session open between batches"""
+    _connections[worker_id] = None
+    last_used = time.monotonic()
+    while True:
+        batch = await _run_db(_claim_due, EMAIL_OUTBOX_BATCH_SIZE)
+        if not batch:
+            if _connections[worker_id] is not None and time.monotonic() - last_used > EMAIL_SMTP_IDLE_SECONDS:
+                server, _connections[worker_id] = _connections[worker_id], None
+                await asyncio.to_thread(_close_connection, server)
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=EMAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _wakeup.clear()
+            continue
+
+        try:
+            _connections[worker_id], errors = await asyncio.to_thread(_deliver_batch, _connections[worker_id], batch)
+        except Exception as e:
+            errors = {job["id"]: (str(e), False) for job in batch}
+        await _run_db(_record_results, batch, errors)
+        last_used = time.monotonic()
+
+async def start_email_outbox():
+    """Open the outbox store and start the intake writer and delivery workers"""
+    global _writer
+    await _run_db(_open_db)
+    _writer = asyncio.create_task(_write_intake())
+    for worker_id in range(EMAIL_OUTBOX_WORKERS):
+        _workers.append(asyncio.create_task(_worker(worker_id)))
+    print(f"Email outbox started with {EMAIL_OUTBOX_WORKERS} workers")
+
+async def stop_email_outbox():
+    """Persist queued mail, stop workers and close SMTP sessions; unsent mail resumes on next start"""
+    try:
+        await asyncio.wait_for(_intake.join(), timeout=EMAIL_OUTBOX_DRAIN_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"Email outbox stopped with {_intake.qsize()} emails not yet persisted")
+
+    tasks = _workers + ([_writer] if _writer else [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+
+    for worker_id, server in list(_connections.items()):
+        await asyncio.to_thread(_close_connection, server)
+    _connections.clear()
+    await _run_db(_close_db)
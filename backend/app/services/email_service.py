@@ -3,12 +3,36 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from app.config import GMAIL_USER, GMAIL_PASSWORD
+from app.config import GMAIL_USER, GMAIL_PASSWORD, SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, SMTP_LOGIN
 
 
-def send_interview_selection_email(candidate_email: str, candidate_name: str = "Candidate", scheduling_link: str = None) -> bool:
+def smtp_configured() -> bool:
+    """Check whether there is enough SMTP configuration to send mail"""
+    return bool(GMAIL_USER and (GMAIL_PASSWORD or not SMTP_LOGIN))
+
+
+def open_smtp_connection() -> smtplib.SMTP:
+    """Open an SMTP session, upgrading to TLS and logging in when configured"""
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+    if SMTP_STARTTLS:
+        server.starttls()  # Enable encryption
+    if SMTP_LOGIN:
+        server.login(GMAIL_USER, GMAIL_PASSWORD)
+    return server
+
+
+def send_message(msg: MIMEMultipart) -> None:
+    """Send a single message over a fresh SMTP session"""
+    server = open_smtp_connection()
+    try:
+        server.sendmail(GMAIL_USER, msg['To'], msg.as_string())
+    finally:
+        server.quit()
+
+
+def build_interview_selection_email(candidate_email: str, candidate_name: str = "Candidate", scheduling_link: str = None) -> MIMEMultipart:
     """
-    Send interview selection email to successful candidate
+    Build interview selection email for successful candidate
     
     Args:
         candidate_email (str): Candidate's email address
@@ -16,18 +40,17 @@ def send_interview_selection_email(candidate_email: str, candidate_name: str = "
         scheduling_link (str): Link to schedule the final interview
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        MIMEMultipart: Message ready to be sent
     """
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = GMAIL_USER
-        msg['To'] = candidate_email
-        msg['Subject'] = "Congratulations! You've been selected for the next interview round"
-        
-        # Create scheduling section based on whether link is provided
-        if scheduling_link:
-            scheduling_section = f"""
+    # Create message
+    msg = MIMEMultipart()
+    msg['From'] = GMAIL_USER
+    msg['To'] = candidate_email
+    msg['Subject'] = "Congratulations! You've been selected for the next interview round"
+    
+    # Create scheduling section based on whether link is provided
+    if scheduling_link:
+        scheduling_section = f"""
 Next Steps:
 • Click here to schedule your final interview: {scheduling_link}
 • The final interview will be conducted by our technical team
@@ -36,16 +59,16 @@ Next Steps:
 
 Schedule your interview now: {scheduling_link}
 """
-        else:
-            scheduling_section = """
+    else:
+        scheduling_section = """
 Next Steps:
 • You will receive a calendar invitation within 24 hours to schedule your final interview
 • The final interview will be conducted by our technical team
 • Please prepare for discussions about your experience and technical projects
 """
 
-        # Email body
-        body = f"""
+    # Email body
+    body = f"""
 Dear {candidate_name},
 
 Congratulations! We are pleased to inform you that you have successfully passed the technical screening interview.
@@ -60,22 +83,32 @@ The Recruitment Team
 ---
 This is an automated message. Please do not reply to this email.
 """
-        
-        msg.attach(MIMEText(body, 'plain'))
+    
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def send_interview_selection_email(candidate_email: str, candidate_name: str = "Candidate", scheduling_link: str = None) -> bool:
+    """
+    Send interview selection email to successful candidate
+    
+    Args:
+        candidate_email (str): Candidate's email address
+        candidate_name (str): Candidate's name (optional)
+        scheduling_link (str): Link to schedule the final interview
+    
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    try:
+        msg = build_interview_selection_email(candidate_email, candidate_name, scheduling_link)
         
         # Gmail SMTP server setup
-        if not GMAIL_USER or not GMAIL_PASSWORD:
+        if not smtp_configured():
             print("Gmail credentials not configured, skipping email")
             return False
             
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()  # Enable encryption
-        server.login(GMAIL_USER, GMAIL_PASSWORD)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(GMAIL_USER, candidate_email, text)
-        server.quit()
+        send_message(msg)
         
         print(f"Interview selection email sent successfully to {candidate_email}")
         return True
@@ -85,26 +118,25 @@ This is an automated message. Please do not reply to this email.
         return False
 
 
-def send_interview_rejection_email(candidate_email: str, candidate_name: str = "Candidate") -> bool:
+def build_interview_rejection_email(candidate_email: str, candidate_name: str = "Candidate") -> MIMEMultipart:
     """
-    Send interview rejection email to unsuccessful candidate
+    Build interview rejection email for unsuccessful candidate
     
     Args:
         candidate_email (str): Candidate's email address
         candidate_name (str): Candidate's name (optional)
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        MIMEMultipart: Message ready to be sent
     """
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = GMAIL_USER
-        msg['To'] = candidate_email
-        msg['Subject'] = "Thank you for your interest - Interview Update"
-        
-        # Email body
-        body = f"""
+    # Create message
+    msg = MIMEMultipart()
+    msg['From'] = GMAIL_USER
+    msg['To'] = candidate_email
+    msg['Subject'] = "Thank you for your interest - Interview Update"
+    
+    # Email body
+    body = f"""
 Dear {candidate_name},
 
 Thank you for taking the time to participate in our technical screening interview.
@@ -121,22 +153,31 @@ The Recruitment Team
 ---
 This is an automated message. Please do not reply to this email.
 """
-        
-        msg.attach(MIMEText(body, 'plain'))
+    
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def send_interview_rejection_email(candidate_email: str, candidate_name: str = "Candidate") -> bool:
+    """
+    Send interview rejection email to unsuccessful candidate
+    
+    Args:
+        candidate_email (str): Candidate's email address
+        candidate_name (str): Candidate's name (optional)
+    
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    try:
+        msg = build_interview_rejection_email(candidate_email, candidate_name)
         
         # Gmail SMTP server setup
-        if not GMAIL_USER or not GMAIL_PASSWORD:
+        if not smtp_configured():
             print("Gmail credentials not configured, skipping email")
             return False
             
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()  # Enable encryption
-        server.login(GMAIL_USER, GMAIL_PASSWORD)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(GMAIL_USER, candidate_email, text)
-        server.quit()
+        send_message(msg)
         
         print(f"Interview rejection email sent successfully to {candidate_email}")
         return True
@@ -146,9 +187,9 @@ This is an automated message. Please do not reply to this email.
         return False
 
 
-def send_interview_incomplete_email(candidate_email: str, candidate_name: str = "Candidate", questions_answered: int = 0) -> bool:
+def build_interview_incomplete_email(candidate_email: str, candidate_name: str = "Candidate", questions_answered: int = 0) -> MIMEMultipart:
     """
-    Send email to candidate whose interview was disconnected/incomplete
+    Build email for candidate whose interview was disconnected/incomplete
     
     Args:
         candidate_email (str): Candidate's email address
@@ -156,17 +197,16 @@ def send_interview_incomplete_email(candidate_email: str, candidate_name: str =
         questions_answered (int): Number of questions answered before disconnection
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        MIMEMultipart: Message ready to be sent
     """
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = GMAIL_USER
-        msg['To'] = candidate_email
-        msg['Subject'] = "Technical Interview - Connection Issue"
-        
-        # Email body
-        body = f"""
+    # Create message
+    msg = MIMEMultipart()
+    msg['From'] = GMAIL_USER
+    msg['To'] = candidate_email
+    msg['Subject'] = "Technical Interview - Connection Issue"
+    
+    # Email body
+    body = f"""
 Dear {candidate_name},
 
 We noticed that your technical interview session was disconnected unexpectedly. This can happen due to network issues, call drops, or other technical problems.
@@ -188,26 +228,44 @@ The Recruitment Team
 ---
 This is an automated message. You can reply to this email to reschedule your interview.
 """
-        
-        msg.attach(MIMEText(body, 'plain'))
+    
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def send_interview_incomplete_email(candidate_email: str, candidate_name: str = "Candidate", questions_answered: int = 0) -> bool:
+    """
+    Send email to candidate whose interview was disconnected/incomplete
+    
+    Args:
+        candidate_email (str): Candidate's email address
+        candidate_name (str): Candidate's name (optional)
+        questions_answered (int): Number of questions answered before disconnection
+    
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    try:
+        msg = build_interview_incomplete_email(candidate_email, candidate_name, questions_answered)
         
         # Gmail SMTP server setup
-        if not GMAIL_USER or not GMAIL_PASSWORD:
+        if not smtp_configured():
             print("Gmail credentials not configured, skipping email")
             return False
             
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()  # Enable encryption
-        server.login(GMAIL_USER, GMAIL_PASSWORD)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(GMAIL_USER, candidate_email, text)
-        server.quit()
+        send_message(msg)
         
         print(f"Interview incomplete email sent successfully to {candidate_email}")
         return True
         
     except Exception as e:
         print(f"Failed to send incomplete email to {candidate_email}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+# Message builders by email type, used by the background outbox
+EMAIL_BUILDERS = {
+    "selection": build_interview_selection_email,
+    "rejection": build_interview_rejection_email,
+    "incomplete": build_interview_incomplete_email,
+}
@@ -0,0 +1,81 @@
+"""Live interview events, pushed to dashboard subscribers as they happen
+
+Interview code calls `publish` when a call starts, a question is asked, an answer
+is scored and the interview completes or ends. Each subscriber watches any number
+of calls through one bounded queue; a slow subscriber loses its oldest events
+rather than holding memory. The latest event of every recent call is kept, so a
+subscriber immediately learns where a call it starts watching stands.
+
+Events are published on the worker that runs the call, and only reach subscribers
+connected to that worker.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Set
+from app.config import EVENT_STREAM_QUEUE_SIZE, EVENT_STREAM_TRACKED_CALLS
+
+event_counters = {"published": 0, "delivered": 0, "dropped": 0}
+
+_sequence = itertools.count(1)
+
+
+class Subscription:
+    """One subscriber's queue of events for the calls it watches"""
+
+    def __init__(self, call_sids: Iterable[str]):
+        self.call_sids: Set[str] = set(call_sids)
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=EVENT_STREAM_QUEUE_SIZE)
+
+    def deliver(self, event: Dict[str, Any]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            event_counters["dropped"] += 1
+        self.queue.put_nowait(event)
+        event_counters["delivered"] += 1
+
+
+# Subscriptions by watched call_sid
+_subscribers: Dict[str, Set[Subscription]] = {}
+
+# Latest event by call_sid, least recently updated first
+_latest: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+def publish(call_sid: str, event_type: str, **data: Any):
+    """Record an event for a call and push it to the call's subscribers"""
+    event = {"id": next(_sequence), "type": event_type, "call_sid": call_sid, "time": time.time(), **data}
+    event_counters["published"] += 1
+    _latest[call_sid] = event
+    _latest.move_to_end(call_sid)
+    while len(_latest) > EVENT_STREAM_TRACKED_CALLS:
+        _latest.popitem(last=False)
+    for subscription in _subscribers.get(call_sid, ()):
+        subscription.deliver(event)
+
+def subscribe(call_sids: Iterable[str]) -> Subscription:
+    """Watch calls, starting with the latest event of each that has one"""
+    subscription = Subscription(call_sids)
+    for call_sid in subscription.call_sids:
+        _subscribers.setdefault(call_sid, set()).add(subscription)
+        if call_sid in _latest:
+            subscription.deliver(_latest[call_sid])
+    return subscription
+
+def unsubscribe(subscription: Subscription):
+    for call_sid in subscription.call_sids:
+        watchers = _subscribers.get(call_sid)
+        if watchers is not None:
+            watchers.discard(subscription)
+            if not watchers:
+                del _subscribers[call_sid]
+
+def get_event_stats() -> Dict[str, Any]:
+    subscriptions = set().union(*_subscribers.values()) if _subscribers else set()
+    return {
+        **event_counters,
+        "subscribers": len(subscriptions),
+        "watched_calls": len(_subscribers),
+        "tracked_calls": len(_latest),
+    }
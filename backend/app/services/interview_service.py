@@ -1,29 +1,379 @@
 """Service for managing interview sessions and logic"""
 
+import asyncio
+import difflib
 import random
-from typing import Dict, Any
-from app.models.questions import JS_QUESTIONS
-from app.services.scoring_service import score_answer
-from app.services.email_service import send_interview_selection_email, send_interview_rejection_email
+import time
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import (
+    SCORING_MODE,
+    SESSION_TTL_SECONDS,
+    SESSION_STORE_MAX_ENTRIES,
+    SESSION_STORE_MAX_BYTES,
+    CONFIG_TTL_SECONDS,
+    CONFIG_STORE_MAX_ENTRIES,
+    CONFIG_STORE_MAX_BYTES,
+    POOL_STORE_MAX_ENTRIES,
+    INTERVIEW_SEED,
+    QUESTION_GENERATION_WAIT_SECONDS,
+    QUESTION_STREAM_MIN_READY,
+    QUESTION_STREAM_PUBLISH_EVERY,
+    TIERED_SCORING_ENABLED,
+    EARLY_STOP_ENABLED,
+    SPECULATIVE_MATCH_RATIO,
+    RESCORING_ENABLED,
+    ADMISSION_MAX_LIVE_CALLS,
+    ADMISSION_MAX_QUEUED_CALLS,
+    ADMISSION_MAX_WAIT_SECONDS,
+    ADMISSION_RESERVATION_SECONDS,
+)
+from app.models.question_pool import QuestionPool, DEFAULT_POOL, intern_pool, get_pool
+from app.models.session import InterviewSession
+from app.services.scoring_service import score_answer, score_answers_batch, normalize_answer, ProvisionalScore
+from app.services.reference_answers import prepare_reference_index
+from app.services.email_outbox import enqueue_outcome_email
+from app.services.rescoring_queue import queue_rescoring
+from app.services.interview_events import publish
+from app.services.question_service import stream_questions, get_cached_questions
+from app.services.session_store import create_session_store
+from app.utils.admission import AdmissionController
 
 # Store interview sessions
-interview_sessions: Dict[str, Dict[str, Any]] = {}
+interview_sessions = create_session_store(
+    "sessions",
+    ttl=SESSION_TTL_SECONDS,
+    max_entries=SESSION_STORE_MAX_ENTRIES,
+    max_bytes=SESSION_STORE_MAX_BYTES,
+    encode=InterviewSession.to_dict,
+    decode=InterviewSession.from_dict
+)
 
-# Store custom interview configurations
-custom_configs: Dict[str, Dict[str, Any]] = {}
+# Store custom interview configurations. Questions are kept in the pool store
+# and referenced from the config by digest ('questionPool').
+custom_configs = create_session_store(
+    "configs", ttl=CONFIG_TTL_SECONDS, max_entries=CONFIG_STORE_MAX_ENTRIES, max_bytes=CONFIG_STORE_MAX_BYTES
+)
 
-def set_interview_config(interview_id: str, config: Dict[str, Any]):
+# Store question pools by content digest, so identical pools are kept once
+question_pools = create_session_store(
+    "pools",
+    max_entries=POOL_STORE_MAX_ENTRIES,
+    encode=lambda pool: {"questions": list(pool.questions)},
+    decode=lambda data: intern_pool(data["questions"])
+)
+
+# In-flight background scoring tasks per call (pipelined scoring mode).
+# These stay local to the worker that owns the call's WebSocket.
+pending_scores: Dict[str, List[Tuple[asyncio.Task, str]]] = {}
+
+# Scores started on partial transcripts, by call: (question, transcript, task).
+# Local to the worker that owns the call's WebSocket, like pending_scores.
+speculative_scores: Dict[str, Tuple[str, str, asyncio.Task]] = {}
+speculation_counters = {"started": 0, "reused": 0, "discarded": 0}
+
+# Live interviews on this worker; dials reserve a slot by interview id until the call connects
+call_admission = AdmissionController(
+    "calls",
+    max_active=ADMISSION_MAX_LIVE_CALLS,
+    max_queued=ADMISSION_MAX_QUEUED_CALLS,
+    max_wait=ADMISSION_MAX_WAIT_SECONDS,
+    reservation_seconds=ADMISSION_RESERVATION_SECONDS,
+)
+
+# Questions asked in every interview
+QUESTIONS_PER_INTERVIEW = 10
+
+# Lowest and highest score a single answer can get
+MIN_ANSWER_SCORE = 1
+MAX_ANSWER_SCORE = 10
+
+# Completed interviews, and those ended early because the outcome was already decided
+interview_counters = {"completed": 0, "early_stopped": 0, "questions_saved": 0}
+
+# Background question generation by interview_id, local to the worker that ran setup
+question_generation_tasks: Dict[str, asyncio.Task] = {}
+
+async def store_question_pool(questions: List[str]) -> QuestionPool:
+    """Intern a list of questions and make sure the shared pool store has it"""
+    pool = intern_pool(questions)
+    if pool is not DEFAULT_POOL and await question_pools.get(pool.digest) is None:
+        await question_pools.set(pool.digest, pool)
+    return pool
+
+async def load_question_pool(digest: Optional[str]) -> Optional[QuestionPool]:
+    """Find a question pool by digest, locally first and then in the pool store"""
+    if not digest:
+        return None
+    return get_pool(digest) or await question_pools.get(digest)
+
+async def set_interview_config(interview_id: str, config: Dict[str, Any]):
     """Set custom interview configuration"""
-    custom_configs[interview_id] = config
+    config = dict(config)
+    questions = config.pop('questions', None)
+    if questions:
+        config['questionPool'] = (await store_question_pool(questions)).digest
+    await custom_configs.set(interview_id, config)
+
+async def get_interview_config(interview_id: str, include_questions: bool = False) -> Optional[Dict[str, Any]]:
+    """Get custom interview configuration"""
+    config = await custom_configs.get(interview_id)
+    if config is not None and include_questions:
+        pool = await load_question_pool(config.get('questionPool'))
+        config = {**config, 'questions': list(pool.questions) if pool else []}
+    return config
+
+async def load_session(call_sid: str) -> Optional[InterviewSession]:
+    """Load a session, resolving its question pool if this worker has not seen it yet"""
+    session = await interview_sessions.get(call_sid)
+    if session is not None and session.pool is None:
+        session.pool = await load_question_pool(session.pool_digest)
+        if session.pool is None:
+            print(f"ERROR: question pool {session.pool_digest} for {call_sid} is gone, using default JS questions")
+            session.pool = DEFAULT_POOL
+            session.pool_digest = DEFAULT_POOL.digest
+            session.asked = array('I', [i for i in session.asked if i < len(DEFAULT_POOL)])
+            session.plan_swaps = {}
+    return session
+
+async def _publish_questions(interview_id: str, questions: List[str], status: str) -> bool:
+    """Point an interview's config at the questions generated so far; False if the config is gone"""
+    config = await custom_configs.get(interview_id)
+    if config is None:
+        return False
+    if questions:
+        config['questionPool'] = (await store_question_pool(questions)).digest
+    config['questionsStatus'] = status
+    await custom_configs.set(interview_id, config)
+    return True
+
+async def _generate_interview_questions(interview_id: str, language: str, prompt: str, yoe: Optional[str]):
+    """
+    Generate questions for an already dialed interview and attach them to its config as they stream in
+
+    The config is updated once the first few questions are parsed and then every few more,
+    so the interview can start while the rest are still generating. Each published pool
+    extends the previous one, so sessions can move to a larger pool without renumbering.
+    """
+    questions: List[str] = []
+    published = 0
+    try:
+        async for questions in stream_questions(language, prompt, yoe):
+            threshold = published + QUESTION_STREAM_PUBLISH_EVERY if published else QUESTION_STREAM_MIN_READY
+            if len(questions) >= threshold:
+                if not await _publish_questions(interview_id, questions, "pending"):
+                    print(f"Interview config {interview_id} expired before its questions were generated")
+                    return
+                published = len(questions)
+    except Exception as e:
+        print(f"Error generating questions in background for {interview_id}: {str(e)}")
+    
+    if not questions:
+        await _publish_questions(interview_id, [], "failed")
+        print(f"Background generation for {interview_id} produced no questions, interview will use a fallback")
+        return
+    if len(questions) < QUESTIONS_PER_INTERVIEW:
+        # Pad a short set with default questions, keeping the generated ones first
+        questions = questions + [q for q in DEFAULT_POOL.questions if q not in questions]
+    await _publish_questions(interview_id, questions, "ready")
+    print(f"Background-generated {len(questions)} questions for interview {interview_id}")
+
+def start_question_generation(interview_id: str, language: str, prompt: str, yoe: Optional[str] = None):
+    """Generate an interview's questions in the background while its call is being placed"""
+    task = asyncio.create_task(_generate_interview_questions(interview_id, language, prompt, yoe))
+    question_generation_tasks[interview_id] = task
+    task.add_done_callback(lambda _: question_generation_tasks.pop(interview_id, None))
+
+async def _wait_for_questions(interview_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Wait up to QUESTION_GENERATION_WAIT_SECONDS for the first generated questions to be published"""
+    deadline = time.monotonic() + QUESTION_GENERATION_WAIT_SECONDS
+    # Generation may run on another worker, so watch the shared config
+    while not config.get('questionPool') and config.get('questionsStatus') == "pending" and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+        config = await custom_configs.get(interview_id) or config
+    return config
+
+async def _refresh_session_pool(session: InterviewSession):
+    """Move a session started on a partial pool onto the latest published pool for its interview"""
+    config = await custom_configs.get(session.interview_id) if session.interview_id else None
+    if config is None:
+        session.pool_pending = False
+        return
+    pool = await load_question_pool(config.get('questionPool'))
+    if pool is not None and len(pool) > len(session.pool):
+        session.pool = pool
+        session.pool_digest = pool.digest
+        if TIERED_SCORING_ENABLED:
+            prepare_reference_index(pool)
+    if config.get('questionsStatus') != "pending":
+        session.pool_pending = False
+
+async def _extend_session_pool(session: InterviewSession):
+    """
+    Give a session that has asked every question of its partial pool more to ask
+
+    Waits up to QUESTION_GENERATION_WAIT_SECONDS for the next publish of its generated
+    questions. If none comes (generation stalled, failed or ran on a worker that went
+    away), the pool is padded with a cached set for the role, else the default
+    questions, keeping the questions asked so far in place.
+    """
+    size = len(session.pool)
+    deadline = time.monotonic() + QUESTION_GENERATION_WAIT_SECONDS
+    while session.pool_pending and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+        await _refresh_session_pool(session)
+        if len(session.pool) > size:
+            return
+
+    config = (await custom_configs.get(session.interview_id) if session.interview_id else None) or {}
+    cached = await get_cached_questions(
+        config.get('language', session.language), config.get('customPrompt', ''), config.get('yoe')
+    )
+    known = set(session.pool.questions)
+    padding = [q for q in cached or () if q not in known] or [q for q in DEFAULT_POOL.questions if q not in known]
+    print(f"Question generation for {session.interview_id} stopped at {size} questions, padding with {len(padding)} more")
+    pool = await store_question_pool(list(session.pool.questions) + padding)
+    session.pool = pool
+    session.pool_digest = pool.digest
+    session.pool_pending = False
+    if TIERED_SCORING_ENABLED:
+        prepare_reference_index(pool)
+
+async def _fallback_question_pool(config: Dict[str, Any]) -> QuestionPool:
+    """Pool for an interview whose questions are not ready: a cached set for the role, else JS questions"""
+    cached = await get_cached_questions(
+        config.get('language', 'JavaScript'), config.get('customPrompt', ''), config.get('yoe')
+    )
+    if cached:
+        print(f"Questions not ready, using a cached set of {len(cached)} questions")
+        # Stored like any other pool so workers handling later turns can resolve the session's digest
+        return await store_question_pool(cached)
+    print("Questions not ready, using default JS questions")
+    return DEFAULT_POOL
+
+def _plan_seed(config: Dict[str, Any]) -> int:
+    """Seed for a session's question order: per interview, then global, else random"""
+    seed = config.get('seed')
+    if seed is None:
+        seed = INTERVIEW_SEED
+    return int(seed) if seed is not None else random.getrandbits(63)
+
+def _is_pipelined(session: InterviewSession) -> bool:
+    """Check whether answers for this session are scored in the background"""
+    return (session.scoring_mode or SCORING_MODE) == "pipelined"
+
+def _is_batch(session: InterviewSession) -> bool:
+    """Check whether answers for this session are recorded and scored together at the end"""
+    return (session.scoring_mode or SCORING_MODE) == "batch"
+
+def _publish_score(call_sid: str, question_number: int, score: int):
+    publish(call_sid, "score", question_number=question_number, score=int(score), provisional=isinstance(score, ProvisionalScore))
+
+def _record_score(session: InterviewSession, score: int, answer: str):
+    """Append an answer's score, keeping the transcript if the score is only provisional"""
+    if isinstance(score, ProvisionalScore):
+        session.provisional[len(session.scores)] = answer
+    session.scores.append(score)
+
+async def _settle_pending_scores(call_sid: str, session: InterviewSession):
+    """Wait for outstanding background scores, or score recorded answers, and record them in answer order"""
+    entries = pending_scores.pop(call_sid, [])
+    if entries:
+        scores = await asyncio.gather(*(task for task, _ in entries))
+        for (_, answer), score in zip(entries, scores):
+            _record_score(session, score, answer)
+    
+    if session.answers:
+        answered = session.asked[len(session.scores):len(session.scores) + len(session.answers)]
+        pairs = [(session.pool[index], answer) for index, answer in zip(answered, session.answers)]
+        scores = await score_answers_batch(pairs, session.pool, session.escalation_threshold)
+        for answer, score in zip(session.answers, scores):
+            _record_score(session, score, answer)
+            _publish_score(call_sid, len(session.scores), score)
+        session.answers.clear()
+
+def _decided_percentage(call_sid: str, session: InterviewSession) -> Optional[float]:
+    """
+    Final percentage to report if pass/fail is already certain, else None
+
+    Remaining questions, answers still being scored in the background and answers
+    with a provisional score could each score anywhere from MIN_ANSWER_SCORE to
+    MAX_ANSWER_SCORE.
+    """
+    if not (session.early_stop if session.early_stop is not None else EARLY_STOP_ENABLED):
+        return None
+    known = sum(score for position, score in enumerate(session.scores) if position not in session.provisional)
+    unknown = QUESTIONS_PER_INTERVIEW - len(session.scores) + len(session.provisional)
+    for task, _ in pending_scores.get(call_sid, []):
+        if task.done() and not task.cancelled() and task.exception() is None and not isinstance(task.result(), ProvisionalScore):
+            known += task.result()
+            unknown -= 1
+    max_total = QUESTIONS_PER_INTERVIEW * MAX_ANSWER_SCORE
+    worst = (known + unknown * MIN_ANSWER_SCORE) / max_total * 100
+    best = (known + unknown * MAX_ANSWER_SCORE) / max_total * 100
+    if worst >= session.pass_percentage:
+        return worst
+    if best < session.pass_percentage:
+        return best
+    return None
+
+def discard_pending_scores(call_sid: str) -> int:
+    """Cancel outstanding background scores for a call, returning how many there were"""
+    entries = pending_scores.pop(call_sid, [])
+    for task, _ in entries:
+        task.cancel()
+    return len(entries)
+
+def _transcripts_match(speculated: str, final: str) -> bool:
+    """Check whether a final transcript is close enough to a partial one to reuse its score"""
+    speculated, final = normalize_answer(speculated), normalize_answer(final)
+    return speculated == final or difflib.SequenceMatcher(None, speculated, final).ratio() >= SPECULATIVE_MATCH_RATIO
+
+async def speculate_score(call_sid: str, partial_transcript: str):
+    """Start scoring a stable partial transcript of the current answer before the caller finishes"""
+    session = await load_session(call_sid)
+    if session is None or not session.waiting_for_answer or not session.current_question:
+        return
+    if _is_pipelined(session) or _is_batch(session):
+        # Scoring is already off the turn's critical path
+        return
+    
+    question = session.current_question
+    current = speculative_scores.get(call_sid)
+    if current is not None:
+        if current[0] == question and normalize_answer(current[1]) == normalize_answer(partial_transcript):
+            return
+        discard_speculation(call_sid)
+    task = asyncio.create_task(score_answer(question, partial_transcript, session.pool, session.escalation_threshold))
+    speculative_scores[call_sid] = (question, partial_transcript, task)
+    speculation_counters["started"] += 1
+
+def discard_speculation(call_sid: str):
+    """Cancel a call's speculative score, if any"""
+    entry = speculative_scores.pop(call_sid, None)
+    if entry is not None:
+        entry[2].cancel()
+        speculation_counters["discarded"] += 1
 
-def initialize_interview(call_sid: str, interview_id: str = None) -> str:
+def _take_speculative_score(call_sid: str, question: str, answer: str) -> Optional[asyncio.Task]:
+    """The speculative score for this answer if its transcript matches the final one"""
+    entry = speculative_scores.get(call_sid)
+    if entry is None:
+        return None
+    if entry[0] == question and _transcripts_match(entry[1], answer) and not entry[2].cancelled():
+        del speculative_scores[call_sid]
+        speculation_counters["reused"] += 1
+        return entry[2]
+    discard_speculation(call_sid)
+    return None
+
+async def initialize_interview(call_sid: str, interview_id: str = None) -> str:
     """Initialize a new interview session"""
     try:
         print(f"DEBUG: Initializing interview for call_sid={call_sid}, interview_id={interview_id}")
-        print(f"DEBUG: Available custom_configs keys: {list(custom_configs.keys())}")
         
         # Get custom configuration if available
-        config = custom_configs.get(interview_id, {}) if interview_id else {}
+        config = (await custom_configs.get(interview_id) or {}) if interview_id else {}
         print(f"DEBUG: Retrieved config: {config}")
         
         # If interview_id provided but no config found, this might be the issue
@@ -33,32 +383,36 @@ def initialize_interview(call_sid: str, interview_id: str = None) -> str:
             # Fall back to default config
             config = {
                 'language': 'JavaScript',
-                'questions': JS_QUESTIONS,
                 'email': 'unknown@example.com'
             }
         
+        # Questions may still be generating if the call was dialed first; start on the first few
+        if config.get('questionsStatus') == "pending":
+            config = await _wait_for_questions(interview_id, config)
+        
         # Use custom questions if available, otherwise default to JS questions
-        questions_pool = config.get('questions', JS_QUESTIONS)
+        questions_pool = await load_question_pool(config.get('questionPool'))
+        if questions_pool is None:
+            questions_pool = await _fallback_question_pool(config) if config.get('questionsStatus') else DEFAULT_POOL
         language = config.get('language', 'JavaScript')
         
         # Ensure we have questions to choose from
-        if not questions_pool or len(questions_pool) == 0:
-            questions_pool = JS_QUESTIONS
+        if len(questions_pool) == 0:
+            questions_pool = DEFAULT_POOL
             print(f"Warning: Empty questions pool for interview_id {interview_id}, using default JS questions")
         
         print(f"DEBUG: Using {len(questions_pool)} questions for {language} interview")
         
-        question = random.choice(questions_pool)
-        interview_sessions[call_sid] = {
-            'questions_asked': 1,
-            'total_score': 0,
-            'current_question': question,
-            'used_questions': [question],
-            'scores': [],
-            'waiting_for_answer': True,
-            'config': config,
-            'interview_id': interview_id
-        }
+        session = InterviewSession.create(questions_pool, config, interview_id, _plan_seed(config))
+        if config.get('questionPool') == questions_pool.digest and config.get('questionsStatus') == "pending":
+            session.pool_pending = True
+        if TIERED_SCORING_ENABLED:
+            # Reference answers for the local scoring tier are ready well before the first answer
+            prepare_reference_index(questions_pool)
+        question = session.ask(session.next_question_index())
+        await interview_sessions.set(call_sid, session)
+        publish(call_sid, "started", interview_id=interview_id, language=language, questions_total=QUESTIONS_PER_INTERVIEW)
+        publish(call_sid, "question", question_number=1, question=question)
         
         welcome_message = f"Welcome to your {language} technical interview! Here's how it works: I will ask you 10 random {language} questions. Please answer each question to the best of your ability. Take your time to think before answering. If you pass the required score, you will receive an email to schedule a call with HR. Let's begin! Question 1: {{question}}"
         result = welcome_message.format(question=question)
@@ -73,7 +427,7 @@ def initialize_interview(call_sid: str, interview_id: str = None) -> str:
         
         # Emergency fallback
         try:
-            question = random.choice(JS_QUESTIONS)
+            question = random.choice(DEFAULT_POOL.questions)
             emergency_message = f"Welcome to your technical interview! Question 1: {question}"
             print(f"EMERGENCY FALLBACK: Returning basic message")
             return emergency_message
@@ -81,142 +435,190 @@ def initialize_interview(call_sid: str, interview_id: str = None) -> str:
             print(f"EMERGENCY FALLBACK ALSO FAILED: {str(emergency_error)}")
             return "Welcome to your technical interview. Please wait while we prepare your first question."
 
-async def process_answer(call_sid: str, user_message: str) -> str:
-    """Process user's answer and return next question or results"""
-    if call_sid not in interview_sessions:
-        return initialize_interview(call_sid)
+async def _complete_interview(call_sid: str, session: InterviewSession, total_percentage: float, max_total: Optional[int] = None) -> str:
+    """
+    Decide pass/fail, queue the candidate email and close the session
+
+    If some scores are provisional and `max_total` (the total that counts as 100%) is
+    given, the decision and email are deferred until those answers are re-scored.
+    Callers that already know the outcome regardless of provisional scores omit it.
+    """
+    interview_counters["completed"] += 1
+    interview_key = session.interview_id or call_sid
+    if session.provisional and max_total is not None and RESCORING_ENABLED:
+        await queue_rescoring(
+            interview_key,
+            session.scores.tolist(),
+            [[position, session.pool[session.asked[position]], answer] for position, answer in session.provisional.items()],
+            max_total,
+            session.pass_percentage,
+            session.email,
+            session.meeting_link,
+        )
+        final_message = f"Thank you! That completes your interview. You will receive your result by email within 24 hours. Goodbye!"
+        result = "pending"
+    elif total_percentage >= session.pass_percentage:
+        result = "passed"
+        final_message = f"Thank you! That completes your interview. Congratulations! You've performed well. You will receive a link to book a final interview within 24 hours. Goodbye!"
+        
+        # Send email if candidate passes and email is available
+        enqueue_outcome_email(True, session.email, interview_key, session.meeting_link)
+    else:
+        result = "failed"
+        final_message = f"Unfortunately, you didn't clear the interview. Thank you for your time. Goodbye!"
+        
+        # Send rejection email if candidate fails and email is available
+        enqueue_outcome_email(False, session.email, interview_key)
     
-    session = interview_sessions[call_sid]
+    publish(
+        call_sid, "completed",
+        result=result,
+        percentage=None if result == "pending" else round(total_percentage, 1),
+        questions_asked=session.questions_asked,
+        total_score=session.total_score,
+    )
+    # Clean up session
+    await interview_sessions.delete(call_sid)
+    return final_message
+
+class TurnInterrupted(Exception):
+    """The caller interrupted while their answer was being scored; the answer was discarded"""
+
+
+async def _until_interrupted(work, interrupt: Optional[asyncio.Event]):
+    """Await `work`, cancelling it and raising TurnInterrupted if `interrupt` is set first"""
+    if interrupt is None:
+        return await work
+    work = asyncio.ensure_future(work)
+    waiter = asyncio.ensure_future(interrupt.wait())
+    try:
+        await asyncio.wait({work, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+    if work.done():
+        return work.result()
+    work.cancel()
+    raise TurnInterrupted()
+
+async def process_answer(call_sid: str, user_message: str, interrupt: Optional[asyncio.Event] = None) -> str:
+    """
+    Process user's answer and return next question or results
+
+    If `interrupt` is set while the answer is still being scored, scoring is cancelled,
+    the session is left unchanged and TurnInterrupted is raised. Once the answer is
+    scored the turn always runs to completion.
+    """
+    session = await load_session(call_sid)
+    if session is None:
+        return await initialize_interview(call_sid)
     
     # If we're waiting for an answer to current question
-    if session['waiting_for_answer'] and session['current_question']:
-        # Score the answer
-        score = await score_answer(session['current_question'], user_message)
-        session['scores'].append(score)
-        session['total_score'] += score
-        session['waiting_for_answer'] = False
-        
-        print(f"Question: {session['current_question']}")
+    if session.waiting_for_answer and session.current_question:
+        print(f"Question: {session.current_question}")
         print(f"Answer: {user_message}")
-        print(f"Score: {score}/10")
         
-        # Check if interview is complete
-        if session['questions_asked'] >= 10:
-            avg_score = session['total_score'] / 10
-            total_percentage = (session['total_score'] / 100) * 100
-            
-            # Get custom pass percentage or default to 50%
-            config = session.get('config', {})
-            pass_percentage = config.get('passPercentage', 50)
-            
-            if total_percentage >= pass_percentage:
-                final_message = f"Thank you! That completes your interview. Congratulations! You've performed well. You will receive a link to book a final interview within 24 hours. Goodbye!"
-                
-                # Send email if candidate passes and email is available
-                candidate_email = config.get('email')
-                if candidate_email and candidate_email != "candidate@example.com":
-                    scheduling_link = config.get('meetingLink')
-                    success = send_interview_selection_email(candidate_email, "Candidate", scheduling_link)
-                    if success:
-                        print(f"Interview selection email sent to: {candidate_email}")
-                    else:
-                        print(f"Failed to send email to: {candidate_email}")
-            else:
-                final_message = f"Unfortunately, you didn't clear the interview. Thank you for your time. Goodbye!"
-                
-                # Send rejection email if candidate fails and email is available
-                candidate_email = config.get('email')
-                if candidate_email and candidate_email != "candidate@example.com":
-                    success = send_interview_rejection_email(candidate_email)
-                    if success:
-                        print(f"Interview rejection email sent to: {candidate_email}")
-                    else:
-                        print(f"Failed to send rejection email to: {candidate_email}")
+        if _is_pipelined(session):
+            # Score in the background and ask the next question right away
+            task = asyncio.create_task(score_answer(session.current_question, user_message, session.pool, session.escalation_threshold))
+            pending_scores.setdefault(call_sid, []).append((task, user_message))
             
-            # Clean up session
-            del interview_sessions[call_sid]
-            return final_message
-        
-        # Ask next question
-        config = session.get('config', {})
-        questions_pool = config.get('questions', JS_QUESTIONS)
-        available_questions = [q for q in questions_pool if q not in session['used_questions']]
-        if available_questions:
-            next_question = random.choice(available_questions)
-            session['current_question'] = next_question
-            session['used_questions'].append(next_question)
-            session['waiting_for_answer'] = True
-            session['questions_asked'] += 1
+            # Report the score to live subscribers as soon as it is ready
+            def announce(done: asyncio.Task, question_number: int = session.questions_asked):
+                if not done.cancelled() and done.exception() is None:
+                    _publish_score(call_sid, question_number, done.result())
+            task.add_done_callback(announce)
+            print("Score: pending")
+        elif _is_batch(session):
+            # Keep the transcript and score every answer in one request at the end
+            session.answers.append(user_message)
+            print("Score: deferred")
+        else:
+            # Reuse a score started on the partial transcript if the caller said what we speculated on
+            work = _take_speculative_score(call_sid, session.current_question, user_message) or score_answer(
+                session.current_question, user_message, session.pool, session.escalation_threshold
+            )
+            score = await _until_interrupted(work, interrupt)
+            _record_score(session, score, user_message)
+            _publish_score(call_sid, session.questions_asked, score)
+            print(f"Score: {score}/10{' (provisional)' if isinstance(score, ProvisionalScore) else ''}")
+        session.waiting_for_answer = False
+        
+        # Stop early if the remaining questions cannot change the outcome
+        if session.questions_asked < QUESTIONS_PER_INTERVIEW and not session.answers:
+            decided = _decided_percentage(call_sid, session)
+            if decided is not None:
+                print(f"Outcome decided after {session.questions_asked} questions, ending interview early")
+                interview_counters["early_stopped"] += 1
+                interview_counters["questions_saved"] += QUESTIONS_PER_INTERVIEW - session.questions_asked
+                await _settle_pending_scores(call_sid, session)
+                return await _complete_interview(call_sid, session, decided)
+        
+        # Check if interview is complete
+        if session.questions_asked >= QUESTIONS_PER_INTERVIEW:
+            await _settle_pending_scores(call_sid, session)
+            max_total = QUESTIONS_PER_INTERVIEW * MAX_ANSWER_SCORE
+            total_percentage = (session.total_score / max_total) * 100
+            return await _complete_interview(call_sid, session, total_percentage, max_total)
+        
+        # Ask next question, from a larger pool if more questions were generated meanwhile
+        if session.pool_pending:
+            await _refresh_session_pool(session)
+        next_index = session.next_question_index()
+        if next_index is None and session.pool_pending:
+            # Every question published so far was asked; the rest are still generating
+            await _extend_session_pool(session)
+            next_index = session.next_question_index()
+        if next_index is not None:
+            next_question = session.ask(next_index)
+            await interview_sessions.set(call_sid, session)
+            publish(call_sid, "question", question_number=session.questions_asked, question=next_question)
             
-            return f"Thank you. Here's question {session['questions_asked']}: {next_question}"
+            return f"Thank you. Here's question {session.questions_asked}: {next_question}"
         else:
             # Fallback if we run out of questions
-            config = session.get('config', {})
-            pass_percentage = config.get('passPercentage', 50)
-            total_percentage = (session['total_score'] / (len(session['scores']) * 10)) * 100
-            
-            if total_percentage >= pass_percentage:
-                final_message = f"Thank you! That completes your interview. Congratulations! You've performed well. You will receive a link to book a final interview within 24 hours. Goodbye!"
-                
-                # Send email if candidate passes and email is available
-                candidate_email = config.get('email')
-                if candidate_email and candidate_email != "candidate@example.com":
-                    scheduling_link = config.get('meetingLink')
-                    success = send_interview_selection_email(candidate_email, "Candidate", scheduling_link)
-                    if success:
-                        print(f"Interview selection email sent to: {candidate_email}")
-                    else:
-                        print(f"Failed to send email to: {candidate_email}")
-            else:
-                final_message = f"Unfortunately, you didn't clear the interview. Thank you for your time. Goodbye!"
-                
-                # Send rejection email if candidate fails and email is available
-                candidate_email = config.get('email')
-                if candidate_email and candidate_email != "candidate@example.com":
-                    success = send_interview_rejection_email(candidate_email)
-                    if success:
-                        print(f"Interview rejection email sent to: {candidate_email}")
-                    else:
-                        print(f"Failed to send rejection email to: {candidate_email}")
-            
-            del interview_sessions[call_sid]
-            return final_message
+            await _settle_pending_scores(call_sid, session)
+            max_total = len(session.scores) * MAX_ANSWER_SCORE
+            total_percentage = (session.total_score / max_total) * 100
+            return await _complete_interview(call_sid, session, total_percentage, max_total)
     
     # If user says something unexpected
-    if session['current_question']:
-        return f"Please answer the current question: {session['current_question']}"
+    if session.current_question:
+        return f"Please answer the current question: {session.current_question}"
     else:
         return "Let me ask you a JavaScript question. Please wait a moment."
 
-def get_interview_status(call_sid: str) -> Dict[str, Any]:
+async def get_interview_status(call_sid: str) -> Dict[str, Any]:
     """Get current interview status"""
-    if call_sid in interview_sessions:
-        session = interview_sessions[call_sid]
+    session = await load_session(call_sid)
+    if session is not None:
         return {
             "success": True,
             "call_sid": call_sid,
-            "questions_asked": session['questions_asked'],
-            "total_score": session['total_score'],
-            "average_score": session['total_score'] / max(1, len(session['scores'])),
-            "current_question": session['current_question'],
-            "scores": session['scores'],
-            "waiting_for_answer": session['waiting_for_answer']
+            "questions_asked": session.questions_asked,
+            "total_score": session.total_score,
+            "average_score": session.total_score / max(1, len(session.scores)),
+            "current_question": session.current_question,
+            "scores": session.scores.tolist(),
+            "pending_scores": len(pending_scores.get(call_sid, [])) + len(session.answers),
+            "waiting_for_answer": session.waiting_for_answer
         }
     return {"success": False, "message": "Interview session not found"}
 
-def end_interview(call_sid: str) -> Dict[str, Any]:
+async def end_interview(call_sid: str) -> Dict[str, Any]:
     """End interview session and get final results"""
-    if call_sid in interview_sessions:
-        session = interview_sessions[call_sid]
+    session = await load_session(call_sid)
+    if session is not None:
+        await _settle_pending_scores(call_sid, session)
         final_results = {
             "call_sid": call_sid,
-            "questions_asked": session['questions_asked'],
-            "total_score": session['total_score'],
-            "average_score": session['total_score'] / max(1, len(session['scores'])),
-            "scores": session['scores']
+            "questions_asked": session.questions_asked,
+            "total_score": session.total_score,
+            "average_score": session.total_score / max(1, len(session.scores)),
+            "scores": session.scores.tolist()
         }
         # Clean up session
-        del interview_sessions[call_sid]
+        await interview_sessions.delete(call_sid)
+        publish(call_sid, "ended", results=final_results)
         print(f"Interview ended for {call_sid}: {final_results}")
         return {"success": True, "results": final_results}
     return {"success": False, "message": "Interview session not found"}
\ No newline at end of file
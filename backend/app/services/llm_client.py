@@ -0,0 +1,81 @@
+"""Shared async OpenAI client backed by a keep-alive HTTP connection pool"""
+
+import asyncio
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI
+from app.config import (
+    OPENAI_API_KEY,
+    LLM_BASE_URL,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY_SECONDS,
+    LLM_CONNECT_TIMEOUT_SECONDS,
+    LLM_REQUEST_TIMEOUT_SECONDS,
+    LLM_WARMUP_CONNECTIONS,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_CALL_RESERVE,
+    LLM_CALL_MAX_WAIT_SECONDS,
+    LLM_BACKGROUND_MAX_WAIT_SECONDS,
+)
+from app.utils.rate_limit import RequestScheduler
+
+# One pool for the whole process so concurrent calls reuse warm TLS connections
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+    ),
+    timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+)
+
+openai = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=LLM_BASE_URL or None, http_client=http_client, max_retries=0)
+
+# Priorities for create_completion: scoring during a call, and everything else
+PRIORITY_CALL = 0
+PRIORITY_BACKGROUND = 1
+
+# Every completion request of this worker draws from the key's budgets
+llm_scheduler = RequestScheduler("llm", LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, reserve=LLM_CALL_RESERVE)
+
+async def create_completion(priority: int, expected_output_tokens: int, max_wait: Optional[float] = None, **kwargs):
+    """
+    Create a chat completion once the rate-limit budget allows it
+
+    The token cost is estimated from the prompt length and `expected_output_tokens`,
+    then corrected with the reported usage. Waits are bounded by `max_wait`, by default
+    LLM_CALL_MAX_WAIT_SECONDS for PRIORITY_CALL and LLM_BACKGROUND_MAX_WAIT_SECONDS otherwise.
+
+    Raises:
+        BudgetExceeded: If no budget was granted in time
+    """
+    if max_wait is None:
+        max_wait = LLM_CALL_MAX_WAIT_SECONDS if priority == PRIORITY_CALL else LLM_BACKGROUND_MAX_WAIT_SECONDS
+    estimated = sum(len(message["content"]) for message in kwargs["messages"]) // 4 + expected_output_tokens
+    await llm_scheduler.acquire(priority, estimated, max_wait)
+    completion = await openai.chat.completions.create(**kwargs)
+    usage = getattr(completion, "usage", None)
+    if usage is not None:
+        llm_scheduler.settle(estimated, usage.total_tokens)
+    return completion
+
+async def warm_up_llm_client():
+    """Open keep-alive connections ahead of the first interview turn"""
+    if not OPENAI_API_KEY or LLM_WARMUP_CONNECTIONS <= 0:
+        return
+
+    results = await asyncio.gather(
+        *(openai.models.retrieve("gpt-4o-mini") for _ in range(LLM_WARMUP_CONNECTIONS)),
+        return_exceptions=True
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        print(f"LLM pool warm-up: {len(failures)}/{len(results)} requests failed: {failures[0]}")
+    else:
+        print(f"LLM pool warm-up: {len(results)} connections ready")
+
+async def close_llm_client():
+    """Close the shared connection pool"""
+    await http_client.aclose()
@@ -0,0 +1,234 @@
+"""Service for generating interview question sets, with a persistent cache"""
+
+import asyncio
+import hashlib
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.config import (
+    QUESTION_CACHE_BACKEND,
+    QUESTION_CACHE_DB_PATH,
+    QUESTION_CACHE_TTL_SECONDS,
+    QUESTION_CACHE_MAX_ENTRIES,
+    QUESTION_GENERATION_MAX_ROUNDS,
+)
+from app.models.question_pool import intern_pool
+from app.services.llm_client import create_completion, PRIORITY_BACKGROUND
+from app.services.session_store import create_session_store
+
+# Fewer questions than this are not worth caching
+MIN_GENERATED_QUESTIONS = 20
+MAX_GENERATED_QUESTIONS = 50
+
+# Generated question sets by normalized (language, prompt, yoe); kept on disk across restarts
+question_cache = create_session_store(
+    "question_cache",
+    backend=QUESTION_CACHE_BACKEND,
+    **({"path": QUESTION_CACHE_DB_PATH} if QUESTION_CACHE_BACKEND == "sqlite" else {}),
+    ttl=QUESTION_CACHE_TTL_SECONDS,
+    max_entries=QUESTION_CACHE_MAX_ENTRIES,
+    encode=lambda pool: {"questions": list(pool.questions)},
+    decode=lambda data: intern_pool(data["questions"])
+)
+
+cache_counters = {"hits": 0, "misses": 0, "coalesced": 0}
+
+
+class _Generation:
+    """A streaming generation in progress, shared by every request for the same key"""
+
+    def __init__(self):
+        self.questions: List[str] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        """Wake every subscriber waiting for new questions"""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def snapshots(self) -> AsyncIterator[List[str]]:
+        """Yield the growing question list each time it changes, until generation ends"""
+        seen = 0
+        while True:
+            changed = self._changed
+            if len(self.questions) > seen:
+                seen = len(self.questions)
+                yield list(self.questions)
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await changed.wait()
+
+
+# Generations in progress by cache key; concurrent identical requests share one
+_inflight: Dict[str, _Generation] = {}
+
+def _normalize(text: str) -> str:
+    """Normalize free text so trivially different prompts share a cache entry"""
+    return re.sub(r'\s+', ' ', (text or '').strip().lower()).rstrip('.!?')
+
+def question_cache_key(language: str, prompt: str, yoe: Optional[str] = None) -> str:
+    """Cache key for a (language, prompt, years of experience) triple"""
+    normalized = f"{_normalize(language)}\n{_normalize(prompt)}\n{_normalize(yoe)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+def build_generation_prompt(language: str, prompt: str, yoe: Optional[str] = None, count: int = MAX_GENERATED_QUESTIONS, exclude: List[str] = None) -> str:
+    """Prompt asking the LLM for questions as JSON lines, one question per line"""
+    experience = f"\n        Candidate experience: {yoe} years" if yoe else ""
+    avoid = ""
+    if exclude:
+        avoid = "\n        Do not repeat any of these questions:\n" + "\n".join(f"        - {q}" for q in exclude) + "\n"
+    return f"""
+        Generate exactly {count} technical interview questions for {language} programming language.
+
+        Focus on: {prompt}{experience}
+
+        Requirements:
+        - Mix of theory, practical coding, and problem-solving questions
+        - Appropriate difficulty for technical interviews
+        - Clear, concise questions that can be answered verbally
+        - Cover fundamentals, advanced concepts, and real-world scenarios
+        - No code blocks in questions, just descriptive questions
+        {avoid}
+        Output format: exactly {count} lines, each a single JSON object like {{"question": "..."}}.
+        No numbering, no surrounding array, no other text.
+        """
+
+def parse_question_line(line: str) -> Optional[str]:
+    """Parse one output line: a JSON object, or a numbered/bulleted list item as a fallback"""
+    line = line.strip().rstrip(',')
+    if not line:
+        return None
+
+    question = None
+    if line.startswith('{'):
+        try:
+            question = json.loads(line).get("question")
+        except (ValueError, AttributeError):
+            question = None
+    elif line[0].isdigit() or line.startswith('-') or line.startswith('*'):
+        # Remove numbering patterns
+        question = re.sub(r'^\d+\.?\s*', '', line)
+        question = re.sub(r'^[-*]\s*', '', question)
+
+    if isinstance(question, str):
+        question = question.strip()
+        if len(question) > 10:  # Valid question
+            return question
+    return None
+
+def parse_questions(response_text: str) -> List[str]:
+    """Parse questions out of a complete response"""
+    questions = [q for q in map(parse_question_line, response_text.split('\n')) if q]
+    return questions[:MAX_GENERATED_QUESTIONS]
+
+async def get_cached_questions(language: str, prompt: str, yoe: Optional[str] = None) -> Optional[List[str]]:
+    """Get a previously generated set without calling the LLM"""
+    pool = await question_cache.get(question_cache_key(language, prompt, yoe))
+    return list(pool.questions) if pool is not None else None
+
+async def _stream_round(generation: _Generation, language: str, prompt: str, yoe: Optional[str]):
+    """Stream one completion, publishing each question as soon as its line is complete"""
+    missing = MAX_GENERATED_QUESTIONS - len(generation.questions)
+    stream = await create_completion(
+        PRIORITY_BACKGROUND,
+        expected_output_tokens=25 * missing,
+        model="gpt-4o-mini",
+        messages=[{
+            "role": "user",
+            "content": build_generation_prompt(language, prompt, yoe, missing, generation.questions)
+        }],
+        stream=True
+    )
+
+    def add(line: str):
+        question = parse_question_line(line)
+        if question and question not in generation.questions and len(generation.questions) < MAX_GENERATED_QUESTIONS:
+            generation.questions.append(question)
+            generation.notify()
+
+    buffer = ""
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        buffer += chunk.choices[0].delta.content or ""
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            add(line)
+    add(buffer)
+
+async def _run_generation(key: str, generation: _Generation, language: str, prompt: str, yoe: Optional[str]):
+    """Use the cached set if there is one, else generate until the set is full, topping up short responses, and cache it"""
+    try:
+        pool = await question_cache.get(key)
+        if pool is not None:
+            cache_counters["hits"] += 1
+            print(f"Question cache hit for {language}: {len(pool)} questions")
+            generation.questions = list(pool.questions)
+            return
+
+        cache_counters["misses"] += 1
+        for _ in range(QUESTION_GENERATION_MAX_ROUNDS):
+            if len(generation.questions) >= MAX_GENERATED_QUESTIONS:
+                break
+            await _stream_round(generation, language, prompt, yoe)
+
+        # Only cache usable sets so a bad generation can be retried
+        if len(generation.questions) >= MIN_GENERATED_QUESTIONS:
+            await question_cache.set(key, intern_pool(generation.questions))
+    except Exception as e:
+        generation.error = e
+    finally:
+        # Leave _inflight only once the result is cached, so later callers hit the cache
+        if _inflight.get(key) is generation:
+            del _inflight[key]
+        generation.done = True
+        generation.notify()
+
+async def stream_questions(language: str, prompt: str, yoe: Optional[str] = None) -> AsyncIterator[List[str]]:
+    """
+    Yield the question set for a language, focus prompt and experience level as it grows
+
+    Each item is the full list generated so far. Cached sets are yielded once; concurrent
+    calls for the same normalized inputs share a single LLM generation.
+    """
+    key = question_cache_key(language, prompt, yoe)
+    # Joined or registered without awaiting, so no caller can miss both the cache and a
+    # generation that finishes meanwhile; the cache lookup is the generation's first step
+    generation = _inflight.get(key)
+    if generation is not None:
+        cache_counters["coalesced"] += 1
+        print(f"Joining in-flight question generation for {language}")
+    else:
+        generation = _Generation()
+        generation.task = asyncio.create_task(_run_generation(key, generation, language, prompt, yoe))
+        _inflight[key] = generation
+
+    async for questions in generation.snapshots():
+        yield questions
+
+async def generate_questions(language: str, prompt: str, yoe: Optional[str] = None) -> List[str]:
+    """
+    Get the complete question set for a language, focus prompt and experience level
+
+    Returns:
+        List[str]: Up to 50 questions
+    """
+    questions = []
+    async for questions in stream_questions(language, prompt, yoe):
+        pass
+    return questions
+
+async def get_question_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and storage stats for the question cache"""
+    lookups = cache_counters["hits"] + cache_counters["misses"] + cache_counters["coalesced"]
+    return {
+        **cache_counters,
+        "in_flight": len(_inflight),
+        "hit_rate": (cache_counters["hits"] + cache_counters["coalesced"]) / lookups if lookups else 0.0,
+        "store": await question_cache.stats()
+    }
@@ -0,0 +1,158 @@
+"""Model answers for interview questions, used by the local first scoring tier
+
+Reference answers are generated by the LLM once per question and kept in a shared
+store, so a pool that grows while it is generated, or a cached question set reused
+by many interviews, only pays for questions it has not seen. A question already
+being answered for another pool is waited for rather than requested again, so the
+successive pools of a growing question set never generate the same answer twice.
+Each pool gets a TF-IDF index over its reference answers, built in the background
+the first time the pool is used.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.config import SCORING_CACHE_BACKEND, SCORING_CACHE_DB_PATH, SCORING_CACHE_TTL_SECONDS, SCORING_CACHE_MAX_ENTRIES
+from app.models.question_pool import QuestionPool
+from app.services.llm_client import create_completion, PRIORITY_BACKGROUND
+from app.services.session_store import create_session_store
+from app.utils.text_similarity import TfidfIndex, Vector
+
+# Questions sent to the LLM per reference answer request
+REFERENCE_BATCH_SIZE = 25
+
+# Reference answers by question hash; shares the scoring cache's backend and file
+reference_answers = create_session_store(
+    "reference_answers",
+    backend=SCORING_CACHE_BACKEND,
+    **({"path": SCORING_CACHE_DB_PATH} if SCORING_CACHE_BACKEND == "sqlite" else {}),
+    ttl=SCORING_CACHE_TTL_SECONDS,
+    max_entries=SCORING_CACHE_MAX_ENTRIES
+)
+
+
+class ReferenceIndex:
+    """TF-IDF vectors of the reference answers for one question pool"""
+
+    __slots__ = ("tfidf", "vectors")
+
+    def __init__(self, answers: Dict[str, str]):
+        self.tfidf = TfidfIndex(answers.values())
+        self.vectors: Dict[str, Vector] = {question: self.tfidf.vector(answer) for question, answer in answers.items()}
+
+    def reference_vector(self, question: str) -> Optional[Vector]:
+        return self.vectors.get(question)
+
+
+# Indexes of recently used pools, and index builds in progress, by pool digest
+_indexes: "OrderedDict[str, ReferenceIndex]" = OrderedDict()
+_building: Dict[str, asyncio.Task] = {}
+INDEX_CACHE_LIMIT = 256
+
+# Reference answers being generated, by question hash; resolve to None if generation failed
+_generating: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+
+def _question_key(question: str) -> str:
+    return hashlib.sha256(question.strip().encode("utf-8")).hexdigest()[:32]
+
+async def _generate_batch(questions: List[str]) -> Dict[str, str]:
+    """Ask the LLM for concise model answers to a batch of questions"""
+    numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+    prompt = f"""
+        Write a concise model answer (2-4 sentences) that a strong candidate would give verbally
+        to each of these technical interview questions.
+
+        {numbered}
+
+        Output format: one line per question, each a single JSON object like {{"index": 1, "answer": "..."}}.
+        No surrounding array, no other text.
+        """
+    completion = await create_completion(
+        PRIORITY_BACKGROUND,
+        expected_output_tokens=80 * len(questions),
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": prompt}]
+    )
+    answers = {}
+    for line in completion.choices[0].message.content.split('\n'):
+        line = line.strip().rstrip(',')
+        if not line.startswith('{'):
+            continue
+        try:
+            item = json.loads(line)
+            index = int(item["index"]) - 1
+            answer = str(item["answer"]).strip()
+        except (ValueError, KeyError, TypeError):
+            continue
+        if 0 <= index < len(questions) and answer:
+            answers[questions[index]] = answer
+    return answers
+
+async def _build_index(pool: QuestionPool):
+    """Load stored reference answers for a pool, generate the missing ones and index them"""
+    # Questions this build generates, and ones another build is already generating
+    missing: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+    waiting: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+    try:
+        answers = {}
+        for question in dict.fromkeys(pool.questions):
+            key = _question_key(question)
+            stored = await reference_answers.get(key)
+            if stored is not None:
+                answers[question] = stored["answer"]
+            elif key in _generating:
+                waiting[question] = _generating[key]
+            else:
+                missing[question] = _generating[key] = asyncio.get_running_loop().create_future()
+
+        if missing:
+            generated = 0
+            questions = list(missing)
+            batches = [questions[i:i + REFERENCE_BATCH_SIZE] for i in range(0, len(questions), REFERENCE_BATCH_SIZE)]
+            for result in await asyncio.gather(*(_generate_batch(batch) for batch in batches), return_exceptions=True):
+                if isinstance(result, Exception):
+                    print(f"Error generating reference answers: {str(result)}")
+                    continue
+                for question, answer in result.items():
+                    await reference_answers.set(_question_key(question), {"answer": answer})
+                    missing[question].set_result(answer)
+                    answers[question] = answer
+                    generated += 1
+            print(f"Generated {generated}/{len(missing)} reference answers for pool {pool.digest[:8]}")
+        for question, future in waiting.items():
+            # Shielded so a cancelled build leaves the answer to the others waiting on it
+            answer = await asyncio.shield(future)
+            if answer is not None:
+                answers[question] = answer
+
+        # Questions without a reference answer are always escalated to the LLM
+        _indexes[pool.digest] = ReferenceIndex(answers)
+        _indexes.move_to_end(pool.digest)
+        while len(_indexes) > INDEX_CACHE_LIMIT:
+            _indexes.popitem(last=False)
+    except Exception as e:
+        print(f"Error building reference index for pool {pool.digest[:8]}: {str(e)}")
+    finally:
+        for question, future in missing.items():
+            if not future.done():
+                future.set_result(None)
+            _generating.pop(_question_key(question), None)
+
+def prepare_reference_index(pool: QuestionPool):
+    """Start building a pool's reference index in the background if it is not built or building"""
+    if pool.digest in _indexes or pool.digest in _building:
+        return
+    task = asyncio.create_task(_build_index(pool))
+    _building[pool.digest] = task
+    task.add_done_callback(lambda _: _building.pop(pool.digest, None))
+
+def get_reference_index(pool: QuestionPool) -> Optional[ReferenceIndex]:
+    """A pool's reference index if ready; otherwise starts building it and returns None"""
+    index = _indexes.get(pool.digest)
+    if index is None:
+        prepare_reference_index(pool)
+        return None
+    _indexes.move_to_end(pool.digest)
+    return index
@@ -0,0 +1,177 @@
+"""Deferred re-scoring of provisionally scored interviews, finalizing their outcome once real scores exist
+
+When the LLM cannot score an answer during a call (outage, deadline miss, open circuit
+breaker) the answer gets a ProvisionalScore so the call carries on. If an interview
+ends with provisional scores, its pass/fail decision and email wait for a job here.
+The job re-scores those answers in the background, paced at RESCORING_MAX_PER_MINUTE
+requests and retried with exponential backoff. After RESCORING_MAX_ATTEMPTS the
+provisional values are accepted as final.
+
+Jobs live in a session store so they survive the call and, with a shared backend,
+the worker that ran it. Every worker polls for due jobs; before processing one it
+takes the job's lease, which only one worker can hold at a time. A lease expires
+after RESCORING_LEASE_SECONDS, so jobs held by a worker that stopped are picked up
+again.
+"""
+
+import asyncio
+import os
+import random
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from app.config import (
+    SESSION_STORE_MAX_ENTRIES,
+    RESCORING_POLL_SECONDS,
+    RESCORING_MAX_PER_MINUTE,
+    RESCORING_MAX_ATTEMPTS,
+    RESCORING_BACKOFF_SECONDS,
+    RESCORING_MAX_BACKOFF_SECONDS,
+    RESCORING_LEASE_SECONDS,
+)
+from app.services.email_outbox import enqueue_outcome_email
+from app.services.scoring_service import rescore_answer
+from app.services.session_store import create_session_store
+
+# Pending jobs by interview id (or call sid)
+rescoring_jobs = create_session_store("rescoring", max_entries=SESSION_STORE_MAX_ENTRIES)
+
+# Leases on jobs being processed, by the same key; an entry exists while a worker holds the job
+rescoring_leases = create_session_store("rescoring_leases", ttl=RESCORING_LEASE_SECONDS, max_entries=SESSION_STORE_MAX_ENTRIES)
+
+# Identifies this worker's leases
+_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+rescoring_counters = {"queued": 0, "rescored": 0, "finalized": 0, "gave_up": 0, "lease_conflicts": 0}
+
+_wakeup = asyncio.Event()
+_worker: Optional[asyncio.Task] = None
+
+async def queue_rescoring(
+    interview_key: str,
+    scores: List[int],
+    provisional: List[List[Any]],
+    max_total: int,
+    pass_percentage: int,
+    candidate_email: Optional[str],
+    meeting_link: Optional[str],
+):
+    """
+    Defer an interview's outcome until its provisional scores are re-scored
+
+    Args:
+        interview_key (str): Interview id, or call sid; also the email idempotency key
+        scores (List[int]): All scores of the interview, provisional ones included
+        provisional (List[List[Any]]): [position in scores, question, answer] per provisional score
+        max_total (int): Total score that counts as 100%
+    """
+    await rescoring_jobs.set(interview_key, {
+        "scores": list(scores),
+        "provisional": provisional,
+        "max_total": max_total,
+        "pass_percentage": pass_percentage,
+        "email": candidate_email,
+        "meeting_link": meeting_link,
+        "attempts": 0,
+        "next_attempt_at": time.time(),
+    })
+    rescoring_counters["queued"] += 1
+    print(f"Outcome for {interview_key} deferred until {len(provisional)} provisional scores are re-scored")
+    _wakeup.set()
+
+def _backoff_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(RESCORING_MAX_BACKOFF_SECONDS, RESCORING_BACKOFF_SECONDS * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+async def _finalize(interview_key: str, job: Dict[str, Any]):
+    """Decide pass/fail on the job's scores, queue the email and drop the job"""
+    percentage = sum(job["scores"]) / job["max_total"] * 100 if job["max_total"] else 0.0
+    passed = percentage >= job["pass_percentage"]
+    print(f"Final outcome for {interview_key}: {percentage:.0f}% ({'passed' if passed else 'failed'})")
+    enqueue_outcome_email(passed, job["email"], interview_key, job["meeting_link"])
+    await rescoring_jobs.delete(interview_key)
+    rescoring_counters["finalized"] += 1
+
+async def _process(interview_key: str, job: Dict[str, Any]):
+    """Re-score a job's provisional answers, finalizing it once none are left"""
+    remaining = []
+    for position, question, answer in job["provisional"]:
+        score = await rescore_answer(question, answer)
+        if score is None:
+            remaining.append([position, question, answer])
+        else:
+            job["scores"][position] = score
+            rescoring_counters["rescored"] += 1
+        # Pace requests so re-scoring never competes with live calls for the upstream
+        await asyncio.sleep(60 / max(1, RESCORING_MAX_PER_MINUTE))
+
+    job["provisional"] = remaining
+    job["attempts"] += 1
+    if not remaining:
+        await _finalize(interview_key, job)
+    elif job["attempts"] >= RESCORING_MAX_ATTEMPTS:
+        print(f"Giving up re-scoring {interview_key} after {job['attempts']} attempts, using provisional scores")
+        rescoring_counters["gave_up"] += 1
+        await _finalize(interview_key, job)
+    else:
+        job["next_attempt_at"] = time.time() + _backoff_delay(job["attempts"])
+        await rescoring_jobs.set(interview_key, job)
+
+async def _claim(interview_key: str) -> Optional[Dict[str, Any]]:
+    """Lease a job to this worker and return it, or None if another worker holds it or it is not due"""
+    lease = {"claimed_by": _owner, "lease_until": time.time() + RESCORING_LEASE_SECONDS}
+    if not await rescoring_leases.add(interview_key, lease):
+        rescoring_counters["lease_conflicts"] += 1
+        return None
+    # Read again under the lease: another worker may have finished or rescheduled it meanwhile
+    job = await rescoring_jobs.get(interview_key)
+    if job is None or job["next_attempt_at"] > time.time():
+        await _release(interview_key)
+        return None
+    return job
+
+async def _release(interview_key: str):
+    """Drop this worker's lease on a job, unless it expired and another worker took it"""
+    lease = await rescoring_leases.get(interview_key)
+    if lease is not None and lease["claimed_by"] == _owner:
+        await rescoring_leases.delete(interview_key)
+
+async def _run():
+    """Process due jobs, then sleep until new work arrives or the poll interval passes"""
+    while True:
+        for interview_key in await rescoring_jobs.keys():
+            job = await rescoring_jobs.get(interview_key)
+            if job is None or job["next_attempt_at"] > time.time():
+                continue
+            job = await _claim(interview_key)
+            if job is None:
+                continue
+            try:
+                await _process(interview_key, job)
+            except Exception as e:
+                print(f"Error re-scoring {interview_key}: {str(e)}")
+            finally:
+                await _release(interview_key)
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=RESCORING_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+def start_rescoring_worker():
+    """Start the background re-scoring worker"""
+    global _worker
+    _worker = asyncio.create_task(_run())
+
+async def stop_rescoring_worker():
+    """Stop the worker; unfinished jobs stay in the store"""
+    if _worker is not None:
+        _worker.cancel()
+        await asyncio.gather(_worker, return_exceptions=True)
+    await rescoring_jobs.close()
+    await rescoring_leases.close()
+
+async def get_rescoring_stats() -> Dict[str, Any]:
+    return {**rescoring_counters, "pending": len(await rescoring_jobs.keys())}
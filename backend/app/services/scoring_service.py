@@ -1,35 +1,389 @@
 """Service for scoring interview answers using OpenAI API"""
 
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import (
+    SCORING_TIMEOUT_SECONDS,
+    SCORING_DEADLINE_SECONDS,
+    SCORING_HEDGE_DELAY_SECONDS,
+    SCORING_HEDGE_PERCENTILE,
+    SCORING_HEDGE_MIN_SAMPLES,
+    SCORING_BREAKER_FAILURES,
+    SCORING_BREAKER_COOLDOWN_SECONDS,
+    SCORING_CACHE_ENABLED,
+    SCORING_CACHE_BACKEND,
+    SCORING_CACHE_DB_PATH,
+    SCORING_CACHE_TTL_SECONDS,
+    SCORING_CACHE_MAX_ENTRIES,
+    TIERED_SCORING_ENABLED,
+    SCORING_ESCALATION_THRESHOLD,
+    SCORING_STRONG_MIN_WORDS,
+)
+from app.models.question_pool import QuestionPool
+from app.services.llm_client import create_completion, PRIORITY_CALL, PRIORITY_BACKGROUND
+from app.services.reference_answers import get_reference_index
+from app.services.session_store import create_session_store
+from app.utils.resilience import CircuitBreaker, LatencyTracker
+from app.utils.text_similarity import cosine, tokenize
 
-openai = OpenAI(api_key=OPENAI_API_KEY)
+# Scores by (question, normalized answer); memory by default, sqlite/redis to share and persist
+scoring_cache = create_session_store(
+    "scoring_cache",
+    backend=SCORING_CACHE_BACKEND,
+    **({"path": SCORING_CACHE_DB_PATH} if SCORING_CACHE_BACKEND == "sqlite" else {}),
+    ttl=SCORING_CACHE_TTL_SECONDS,
+    max_entries=SCORING_CACHE_MAX_ENTRIES
+)
 
-async def score_answer(question: str, answer: str) -> int:
-    """Score an answer using OpenAI API"""
-    scoring_prompt = f"""
-    Please rate this JavaScript interview answer on a scale of 1-10, where:
+scoring_counters = {"hits": 0, "misses": 0, "llm_seconds": 0.0, "lookup_seconds": 0.0}
+tier_counters = {"trivial": 0, "strong": 0, "escalated": 0}
+
+
+
+class ProvisionalScore(int):
+    """A fallback score given because the LLM could not score the answer; it is re-scored after the call"""
+
+
+# Latency of single LLM scoring requests, and of scoring an answer including hedges
+upstream_latency = LatencyTracker()
+scoring_latency = LatencyTracker()
+# A probe still unsettled after the scoring deadline was cancelled with its call; another may start
+scoring_breaker = CircuitBreaker(
+    "llm-scoring", SCORING_BREAKER_FAILURES, SCORING_BREAKER_COOLDOWN_SECONDS, probe_timeout=SCORING_DEADLINE_SECONDS
+)
+hedge_counters = {"requests": 0, "hedged": 0, "hedge_wins": 0, "errors": 0, "deadline_misses": 0, "short_circuited": 0, "degraded": 0}
+
+# Transcripts that are not an attempt at an answer
+NON_ANSWERS = frozenset([
+    "", "i don t know", "i dont know", "don t know", "dont know", "no idea", "i have no idea", "not sure",
+    "i m not sure", "im not sure", "pass", "skip", "next", "next question", "can you repeat that",
+    "can you repeat the question", "could you repeat that", "repeat", "sorry", "what",
+])
+
+def normalize_answer(answer: str) -> str:
+    """Normalize a transcript so answers differing only in case, punctuation or spacing match"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', (answer or '').lower())).strip()
+
+def scoring_cache_key(question: str, answer: str) -> str:
+    """Cache key for a question and a normalized answer"""
+    normalized = f"{question.strip()}\n{normalize_answer(answer)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+SCORING_RUBRIC = """
     1-3 = Poor (incorrect, incomplete, or demonstrates lack of understanding)
     4-6 = Average (partially correct, basic understanding)
     7-8 = Good (mostly correct, good understanding)
     9-10 = Excellent (comprehensive, demonstrates deep understanding)
+"""
 
+async def _request_llm_score(question: str, answer: str, priority: int) -> int:
+    """One scoring request to the LLM; raises if it fails or the reply has no score"""
+    scoring_prompt = f"""
+    Please rate this JavaScript interview answer on a scale of 1-10, where:{SCORING_RUBRIC}
     Question: {question}
-    
+
     Answer: {answer}
-    
+
     Please respond with only a number from 1-10, nothing else.
     """
-    
+
+    started = time.perf_counter()
+    completion = await create_completion(
+        priority,
+        expected_output_tokens=5,
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": scoring_prompt}],
+        timeout=SCORING_DEADLINE_SECONDS
+    )
+    upstream_latency.record(time.perf_counter() - started)
+    score_text = completion.choices[0].message.content.strip()
+    # Extract number from response
+    score = int(''.join(filter(str.isdigit, score_text)))
+    return max(1, min(10, score))  # Ensure score is between 1-10
+
+def _hedge_delay() -> float:
+    """How long to wait for a scoring request before sending a duplicate"""
+    if len(upstream_latency) < SCORING_HEDGE_MIN_SAMPLES:
+        return SCORING_HEDGE_DELAY_SECONDS
+    return upstream_latency.percentile(SCORING_HEDGE_PERCENTILE)
+
+async def _llm_score(question: str, answer: str, priority: int = PRIORITY_CALL) -> Optional[int]:
+    """
+    Score an answer with the LLM within SCORING_DEADLINE_SECONDS; None if that failed
+
+    If the request is slower than the recent p95, or fails early, a duplicate is sent and
+    whichever answers first wins; the other is cancelled. While the circuit breaker is
+    open no request is made at all.
+    """
+    if not scoring_breaker.allow():
+        hedge_counters["short_circuited"] += 1
+        return None
+
+    started = time.monotonic()
+    deadline = started + SCORING_DEADLINE_SECONDS
+    hedge_counters["requests"] += 1
+    primary = asyncio.create_task(_request_llm_score(question, answer, priority))
+    hedge: Optional[asyncio.Task] = None
+    pending = {primary}
+    timed_out = False
+    try:
+        while pending or hedge is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            if not pending:
+                # The first request failed fast; use the hedge as a retry
+                hedge = asyncio.create_task(_request_llm_score(question, answer, priority))
+                hedge_counters["hedged"] += 1
+                pending.add(hedge)
+            timeout = min(remaining, _hedge_delay()) if hedge is None else remaining
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        hedge_counters["hedge_wins"] += 1
+                    scoring_breaker.record_success()
+                    scoring_latency.record(time.monotonic() - started)
+                    return task.result()
+                hedge_counters["errors"] += 1
+                print(f"Error scoring answer: {task.exception()}")
+            if not done and hedge is None:
+                hedge = asyncio.create_task(_request_llm_score(question, answer, priority))
+                hedge_counters["hedged"] += 1
+                pending.add(hedge)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if timed_out:
+        hedge_counters["deadline_misses"] += 1
+        print(f"Scoring missed its {SCORING_DEADLINE_SECONDS}s deadline")
+    scoring_breaker.record_failure()
+    scoring_latency.record(time.monotonic() - started)
+    return None
+
+def _fallback_score(question: str, answer: str, pool: Optional[QuestionPool], escalation_threshold: Optional[float]) -> ProvisionalScore:
+    """
+    Provisional score to use when the LLM could not score an answer
+
+    While the circuit breaker is open (degraded mode) answers are estimated from their
+    similarity to the reference answer, mapped onto 2-7; otherwise, or without a
+    reference, the neutral default of 5 is used.
+    """
+    if scoring_breaker.state != "closed" and pool is not None:
+        index = get_reference_index(pool)
+        reference = index.reference_vector(question) if index is not None else None
+        if reference:
+            threshold = SCORING_ESCALATION_THRESHOLD if escalation_threshold is None else escalation_threshold
+            similarity = cosine(index.tfidf.vector(answer), reference)
+            hedge_counters["degraded"] += 1
+            return ProvisionalScore(2 + int(5 * min(1.0, similarity / max(threshold, 0.01)) + 0.5))
+    return ProvisionalScore(5)  # Default score if API fails
+
+async def _llm_score_batch(pairs: List[Tuple[str, str]]) -> Dict[int, int]:
+    """Score several answers in one LLM request; returns scores by position for the items it could parse"""
+    items = "\n".join(
+        json.dumps({"index": i, "question": question, "answer": answer}) for i, (question, answer) in enumerate(pairs, 1)
+    )
+    scoring_prompt = f"""
+    Please rate each of these JavaScript interview answers on a scale of 1-10, where:{SCORING_RUBRIC}
+    Each line below is one question and the candidate's answer:
+    {items}
+
+    Respond with one line per answer, each a single JSON object like {{"index": 1, "score": 7}}.
+    No other text.
+    """
+
+    if not scoring_breaker.allow():
+        hedge_counters["short_circuited"] += 1
+        return {}
     try:
-        completion = openai.chat.completions.create(
+        completion = await create_completion(
+            PRIORITY_CALL,
+            expected_output_tokens=12 * len(pairs),
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": scoring_prompt}]
+            messages=[{"role": "user", "content": scoring_prompt}],
+            timeout=SCORING_TIMEOUT_SECONDS * 2
         )
-        score_text = completion.choices[0].message.content.strip()
-        # Extract number from response
-        score = int(''.join(filter(str.isdigit, score_text)))
-        return max(1, min(10, score))  # Ensure score is between 1-10
+        content = completion.choices[0].message.content
     except Exception as e:
-        print(f"Error scoring answer: {e}")
-        return 5  # Default score if API fails
\ No newline at end of file
+        print(f"Error batch scoring {len(pairs)} answers: {e}")
+        scoring_breaker.record_failure()
+        return {}
+    scoring_breaker.record_success()
+
+    scores = {}
+    for line in content.split('\n'):
+        line = line.strip().rstrip(',')
+        if not line.startswith('{'):
+            continue
+        try:
+            item = json.loads(line)
+            index, score = int(item["index"]) - 1, int(item["score"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        if 0 <= index < len(pairs):
+            scores[index] = max(1, min(10, score))
+    return scores
+
+def prescore_answer(question: str, answer: str, pool: Optional[QuestionPool] = None, escalation_threshold: Optional[float] = None) -> Optional[int]:
+    """
+    Local first scoring tier: settle non-answers and clearly strong answers without the LLM
+
+    Non-answers ("I don't know", "skip", a transcript of only filler words) score 1. Answers long enough
+    and at least `escalation_threshold` TF-IDF similar to the pool's reference answer for
+    the question score 7-10. Anything else returns None and goes to the LLM, short answers
+    included: "Use const" or "It returns a Promise" may well be right.
+    """
+    normalized = normalize_answer(answer)
+    if normalized in NON_ANSWERS:
+        return 1
+    words = tokenize(normalized)
+    if not words:
+        return 1
+
+    threshold = SCORING_ESCALATION_THRESHOLD if escalation_threshold is None else escalation_threshold
+    if pool is None or threshold >= 1 or len(words) < SCORING_STRONG_MIN_WORDS:
+        return None
+    index = get_reference_index(pool)
+    reference = index.reference_vector(question) if index is not None else None
+    if not reference:
+        return None
+    similarity = cosine(index.tfidf.vector(answer), reference)
+    if similarity < threshold:
+        return None
+    # Scale similarity above the threshold onto 7-10
+    return min(10, 7 + int(3 * (similarity - threshold) / (1 - threshold) + 0.5))
+
+async def score_answer(question: str, answer: str, pool: Optional[QuestionPool] = None, escalation_threshold: Optional[float] = None) -> int:
+    """
+    Score an answer from 1 to 10
+
+    Clear cases are settled locally by `prescore_answer` when tiered scoring is on; the rest
+    reuse the score of an identical earlier answer to the same question, or ask the LLM.
+    If the LLM fails, a ProvisionalScore is returned.
+    """
+    if TIERED_SCORING_ENABLED:
+        score = prescore_answer(question, answer, pool, escalation_threshold)
+        if score is not None:
+            tier_counters["trivial" if score <= 2 else "strong"] += 1
+            return score
+        tier_counters["escalated"] += 1
+
+    if not SCORING_CACHE_ENABLED:
+        score = await _llm_score(question, answer)
+        return score if score is not None else _fallback_score(question, answer, pool, escalation_threshold)
+
+    key = scoring_cache_key(question, answer)
+    started = time.perf_counter()
+    cached = await scoring_cache.get(key)
+    if cached is not None:
+        scoring_counters["hits"] += 1
+        scoring_counters["lookup_seconds"] += time.perf_counter() - started
+        return cached["score"]
+
+    scoring_counters["misses"] += 1
+    score = await _llm_score(question, answer)
+    scoring_counters["llm_seconds"] += time.perf_counter() - started
+    if score is None:
+        # Not cached so the pair is retried
+        return _fallback_score(question, answer, pool, escalation_threshold)
+    await scoring_cache.set(key, {"score": score})
+    return score
+
+async def rescore_answer(question: str, answer: str) -> Optional[int]:
+    """Score a provisionally scored answer with the LLM again; None if it still cannot be scored"""
+    score = await _llm_score(question, answer, PRIORITY_BACKGROUND)
+    if score is not None and SCORING_CACHE_ENABLED:
+        await scoring_cache.set(scoring_cache_key(question, answer), {"score": score})
+    return score
+
+async def score_answers_batch(pairs: List[Tuple[str, str]], pool: Optional[QuestionPool] = None, escalation_threshold: Optional[float] = None) -> List[int]:
+    """
+    Score a whole interview's question/answer pairs at once
+
+    Pairs settled by the local tier or the scoring cache skip the LLM; the rest are scored
+    in a single request, and any item missing from its response is scored on its own.
+    """
+    scores: List[Optional[int]] = [None] * len(pairs)
+    keys = [scoring_cache_key(question, answer) for question, answer in pairs]
+    for i, (question, answer) in enumerate(pairs):
+        if TIERED_SCORING_ENABLED:
+            scores[i] = prescore_answer(question, answer, pool, escalation_threshold)
+            if scores[i] is not None:
+                tier_counters["trivial" if scores[i] <= 2 else "strong"] += 1
+                continue
+            tier_counters["escalated"] += 1
+        if SCORING_CACHE_ENABLED:
+            started = time.perf_counter()
+            cached = await scoring_cache.get(keys[i])
+            if cached is not None:
+                scoring_counters["hits"] += 1
+                scoring_counters["lookup_seconds"] += time.perf_counter() - started
+                scores[i] = cached["score"]
+            else:
+                scoring_counters["misses"] += 1
+
+    remaining = [i for i, score in enumerate(scores) if score is None]
+    if remaining:
+        started = time.perf_counter()
+        batch = await _llm_score_batch([pairs[i] for i in remaining])
+        missing = [i for position, i in enumerate(remaining) if position not in batch]
+        if missing:
+            print(f"Batch scoring response missed {len(missing)}/{len(remaining)} answers, scoring them one by one")
+        fallback = await asyncio.gather(*(_llm_score(*pairs[i]) for i in missing))
+        scoring_counters["llm_seconds"] += time.perf_counter() - started
+
+        results = {i: batch[position] for position, i in enumerate(remaining) if position in batch}
+        results.update(zip(missing, fallback))
+        for i, score in results.items():
+            if score is None:
+                scores[i] = _fallback_score(*pairs[i], pool, escalation_threshold)
+                continue
+            scores[i] = score
+            if SCORING_CACHE_ENABLED:
+                await scoring_cache.set(keys[i], {"score": score})
+    return scores
+
+async def get_scoring_cache_stats() -> Dict[str, Any]:
+    """Hit rate and estimated latency saved by the scoring cache"""
+    hits, misses = scoring_counters["hits"], scoring_counters["misses"]
+    average_llm_seconds = scoring_counters["llm_seconds"] / misses if misses else 0.0
+    average_hit_seconds = scoring_counters["lookup_seconds"] / hits if hits else 0.0
+    return {
+        "enabled": SCORING_CACHE_ENABLED,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "average_llm_seconds": average_llm_seconds,
+        "average_hit_seconds": average_hit_seconds,
+        # Each hit saves roughly one average LLM scoring call
+        "saved_seconds": max(0.0, hits * (average_llm_seconds - average_hit_seconds)),
+        "store": await scoring_cache.stats()
+    }
+
+def get_tiered_scoring_stats() -> Dict[str, Any]:
+    """How many answers the local tier settled and how many went to the LLM"""
+    total = sum(tier_counters.values())
+    return {
+        "enabled": TIERED_SCORING_ENABLED,
+        "escalation_threshold": SCORING_ESCALATION_THRESHOLD,
+        **tier_counters,
+        "local_rate": (tier_counters["trivial"] + tier_counters["strong"]) / total if total else 0.0
+    }
+
+def get_scoring_latency_stats() -> Dict[str, Any]:
+    """Latency percentiles, hedging counters and circuit breaker state for LLM scoring"""
+    return {
+        "deadline_seconds": SCORING_DEADLINE_SECONDS,
+        "hedge_delay_seconds": _hedge_delay(),
+        "upstream": upstream_latency.summary(),
+        "scoring": scoring_latency.summary(),
+        **hedge_counters,
+        "breaker": scoring_breaker.stats()
+    }
@@ -0,0 +1,398 @@
+"""Pluggable key/value stores for interview sessions and configurations
+
+Every uvicorn worker (and host) must see the same sessions and configs, because the
+Twilio WebSocket for a call can land on a different worker than the setup request.
+Values are JSON-serializable dicts, or objects converted to and from them by the
+store's `encode`/`decode` functions; callers always write a value back with `set`
+after changing it so that shared backends see the update. The in-memory backend
+keeps values as-is.
+
+Stores are bounded: each entry expires `ttl` seconds after it was first created
+(updates do not extend it), and the least recently used entries are evicted once
+`max_entries` or `max_bytes` is exceeded.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import SESSION_STORE_BACKEND, SESSION_STORE_SQLITE_PATH, SESSION_STORE_REDIS_URL
+
+
+class SessionStore:
+    """Interface for a namespaced, bounded key/value store"""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        encode: Optional[Callable[[Any], Dict[str, Any]]] = None,
+        decode: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ):
+        self.namespace = namespace
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any) -> bool:
+        """Set `key` only if it has no live entry, atomically across workers; True if it was set"""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def keys(self) -> List[str]:
+        raise NotImplementedError
+
+    async def sweep(self) -> None:
+        """Drop expired entries and enforce the size caps"""
+
+    async def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl if self.ttl else None
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store; only suitable for a single worker"""
+
+    def __init__(self, namespace: str, **limits):
+        super().__init__(namespace, **limits)
+        # key -> (value, expires_at, approximate size in bytes), least recently used first
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+
+    def _pop(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+        return entry
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.time():
+            self._pop(key)
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: Any) -> None:
+        existing = self._pop(key)
+        expires_at = existing[1] if existing is not None else self._expires_at()
+        size = len(json.dumps(self.encode(value)))
+        self._data[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while self._data and (
+            (self.max_entries and len(self._data) > self.max_entries) or
+            (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            evicted_key = next(iter(self._data))
+            self._pop(evicted_key)
+            self.evictions += 1
+            print(f"Evicted {self.namespace} entry {evicted_key} (store over capacity)")
+
+    async def add(self, key: str, value: Any) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._pop(key)
+
+    async def keys(self) -> List[str]:
+        return list(self._data.keys())
+
+    async def sweep(self) -> None:
+        now = time.time()
+        expired = [key for key, entry in self._data.items() if entry[1] is not None and entry[1] <= now]
+        for key in expired:
+            self._pop(key)
+        self.expirations += len(expired)
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "namespace": self.namespace,
+            "entries": len(self._data),
+            "approx_bytes": self._bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# Columns added after the first release, created on databases that predate them. Entries
+# written before then never expire and, never having been accessed, are evicted first.
+SQLITE_MIGRATIONS = {
+    "expires_at": "ALTER TABLE session_store ADD COLUMN expires_at REAL",
+    "accessed_at": "ALTER TABLE session_store ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0",
+}
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store shared by all workers on one host through a WAL-mode SQLite file
+
+    Expired entries are hidden on read and deleted by `sweep`, which also evicts
+    the least recently accessed entries when the store is over its caps.
+    """
+
+    def __init__(self, namespace: str, path: str = SESSION_STORE_SQLITE_PATH, **limits):
+        super().__init__(namespace, **limits)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"session-store-{namespace}")
+        self._path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self._path, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS session_store (
+                       namespace TEXT NOT NULL,
+                       key TEXT NOT NULL,
+                       value TEXT NOT NULL,
+                       expires_at REAL,
+                       accessed_at REAL NOT NULL,
+                       PRIMARY KEY (namespace, key)
+                   )"""
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(session_store)")}
+            for column, statement in SQLITE_MIGRATIONS.items():
+                if column not in columns:
+                    self._db.execute(statement)
+            self._db.commit()
+        return self._db
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _get(self, key: str) -> Optional[Any]:
+        db = self._connect()
+        now = time.time()
+        row = db.execute(
+            "SELECT value FROM session_store WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (self.namespace, key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE session_store SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, self.namespace, key))
+        db.commit()
+        return self.decode(json.loads(row[0]))
+
+    def _set(self, key: str, value: str):
+        db = self._connect()
+        now = time.time()
+        # Keep the original expiry when updating an existing entry
+        db.execute(
+            """INSERT INTO session_store (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, accessed_at = excluded.accessed_at""",
+            (self.namespace, key, value, self._expires_at(), now)
+        )
+        db.commit()
+
+    def _add(self, key: str, value: str) -> bool:
+        db = self._connect()
+        now = time.time()
+        # Replaces an expired entry that has not been swept yet, but never a live one
+        inserted = db.execute(
+            """INSERT INTO session_store (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (namespace, key) DO UPDATE SET
+                   value = excluded.value, expires_at = excluded.expires_at, accessed_at = excluded.accessed_at
+               WHERE session_store.expires_at <= ?""",
+            (self.namespace, key, value, self._expires_at(), now, now)
+        ).rowcount
+        db.commit()
+        return inserted > 0
+
+    def _delete(self, key: str):
+        db = self._connect()
+        db.execute("DELETE FROM session_store WHERE namespace = ? AND key = ?", (self.namespace, key))
+        db.commit()
+
+    def _keys(self) -> List[str]:
+        rows = self._connect().execute(
+            "SELECT key FROM session_store WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (self.namespace, time.time())
+        )
+        return [row[0] for row in rows]
+
+    def _sweep(self):
+        db = self._connect()
+        self.expirations += db.execute(
+            "DELETE FROM session_store WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time())
+        ).rowcount
+
+        entries, total_bytes = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM session_store WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        if (self.max_entries and entries > self.max_entries) or (self.max_bytes and total_bytes > self.max_bytes):
+            rows = db.execute(
+                "SELECT key, LENGTH(value) FROM session_store WHERE namespace = ? ORDER BY accessed_at",
+                (self.namespace,)
+            )
+            evict = []
+            for key, size in rows:
+                if not ((self.max_entries and entries > self.max_entries) or (self.max_bytes and total_bytes > self.max_bytes)):
+                    break
+                evict.append((self.namespace, key))
+                entries -= 1
+                total_bytes -= size
+            db.executemany("DELETE FROM session_store WHERE namespace = ? AND key = ?", evict)
+            self.evictions += len(evict)
+        db.commit()
+
+    def _stats(self) -> Dict[str, Any]:
+        entries, total_bytes = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM session_store WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "namespace": self.namespace,
+            "entries": entries,
+            "approx_bytes": total_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await self._run(self._get, key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._run(self._set, key, json.dumps(self.encode(value)))
+
+    async def add(self, key: str, value: Any) -> bool:
+        return await self._run(self._add, key, json.dumps(self.encode(value)))
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    async def keys(self) -> List[str]:
+        return await self._run(self._keys)
+
+    async def sweep(self) -> None:
+        await self._run(self._sweep)
+
+    async def stats(self) -> Dict[str, Any]:
+        return await self._run(self._stats)
+
+    async def close(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+
+class RedisSessionStore(SessionStore):
+    """Store shared across hosts through any server speaking the Redis protocol
+
+    Expiry uses native key TTLs. Size caps are left to the server's own
+    `maxmemory` / `maxmemory-policy allkeys-lru` settings.
+    """
+
+    def __init__(self, namespace: str, url: str = SESSION_STORE_REDIS_URL, **limits):
+        super().__init__(namespace, **limits)
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("SESSION_STORE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self._redis = redis.from_url(url, decode_responses=True)
+        self._prefix = f"interview:{namespace}:"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._redis.get(self._prefix + key)
+        return self.decode(json.loads(value)) if value is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        data = json.dumps(self.encode(value))
+        # Try to update in place keeping the TTL; create with a fresh TTL otherwise
+        if not await self._redis.set(self._prefix + key, data, xx=True, keepttl=True):
+            await self._redis.set(self._prefix + key, data, ex=int(self.ttl) if self.ttl else None)
+
+    async def add(self, key: str, value: Any) -> bool:
+        data = json.dumps(self.encode(value))
+        return bool(await self._redis.set(self._prefix + key, data, nx=True, ex=int(self.ttl) if self.ttl else None))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self._prefix + key)
+
+    async def keys(self) -> List[str]:
+        return [key[len(self._prefix):] async for key in self._redis.scan_iter(match=self._prefix + "*")]
+
+    async def stats(self) -> Dict[str, Any]:
+        entries = 0
+        total_bytes = 0
+        async for key in self._redis.scan_iter(match=self._prefix + "*"):
+            entries += 1
+            total_bytes += await self._redis.strlen(key)
+        try:
+            info = await self._redis.info("stats")
+        except Exception:
+            # Not every server speaking the protocol implements (or allows) INFO
+            info = {}
+        return {
+            "backend": "redis",
+            "namespace": self.namespace,
+            "entries": entries,
+            "approx_bytes": total_bytes,
+            # Server-wide counters, not just this namespace
+            "evictions": info.get("evicted_keys", 0),
+            "expirations": info.get("expired_keys", 0),
+        }
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+STORE_BACKENDS = {
+    "memory": InMemorySessionStore,
+    "sqlite": SQLiteSessionStore,
+    "redis": RedisSessionStore,
+}
+
+def create_session_store(namespace: str, backend: str = None, **limits) -> SessionStore:
+    """Create a store for `namespace` using the configured backend"""
+    backend = backend or SESSION_STORE_BACKEND
+    if backend not in STORE_BACKENDS:
+        raise ValueError(f"Unknown session store backend: {backend}. Use one of {list(STORE_BACKENDS)}")
+    return STORE_BACKENDS[backend](namespace, **limits)
+
+async def sweep_stores_forever(stores: List[SessionStore], interval: float):
+    """Periodically expire and evict entries from every store"""
+    while True:
+        await asyncio.sleep(interval)
+        for store in stores:
+            try:
+                await store.sweep()
+            except Exception as e:
+                print(f"Error sweeping {store.namespace} store: {str(e)}")
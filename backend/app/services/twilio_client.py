@@ -0,0 +1,61 @@
+"""Shared async Twilio REST client backed by a keep-alive HTTP connection pool"""
+
+from typing import Optional
+import httpx
+from app.config import (
+    TWILIO_ACCOUNT_SID,
+    TWILIO_AUTH_TOKEN,
+    TWILIO_PHONE_NUMBER,
+    TWILIO_API_BASE_URL,
+    TWILIO_MAX_CONNECTIONS,
+    TWILIO_CONNECT_TIMEOUT_SECONDS,
+    TWILIO_REQUEST_TIMEOUT_SECONDS,
+)
+
+
+class TwilioError(Exception):
+    """The Twilio REST API rejected a request"""
+
+    def __init__(self, status_code: int, message: str, code: Optional[int] = None):
+        super().__init__(f"Twilio error {code or status_code}: {message}")
+        self.status_code = status_code
+        self.code = code
+
+
+# One pool for the whole process so dialing never blocks the event loop or opens a new TLS session
+http_client = httpx.AsyncClient(
+    base_url=TWILIO_API_BASE_URL,
+    auth=(TWILIO_ACCOUNT_SID or "", TWILIO_AUTH_TOKEN or ""),
+    limits=httpx.Limits(max_connections=TWILIO_MAX_CONNECTIONS, max_keepalive_connections=TWILIO_MAX_CONNECTIONS),
+    timeout=httpx.Timeout(TWILIO_REQUEST_TIMEOUT_SECONDS, connect=TWILIO_CONNECT_TIMEOUT_SECONDS),
+)
+
+async def create_call(to: str, url: str, method: str = "POST", status_callback: Optional[str] = None) -> str:
+    """
+    Dial `to` from TWILIO_PHONE_NUMBER, fetching the call's TwiML from `url`
+
+    If `status_callback` is given, Twilio posts the call's final status
+    (completed, busy, no-answer, failed or canceled) there when it ends.
+
+    Returns:
+        str: The call SID
+
+    Raises:
+        TwilioError: If Twilio rejects the call
+        httpx.HTTPError: If Twilio could not be reached in time
+    """
+    data = {"To": to, "From": TWILIO_PHONE_NUMBER, "Url": url, "Method": method}
+    if status_callback:
+        data["StatusCallback"] = status_callback
+    response = await http_client.post(f"/2010-04-01/Accounts/{TWILIO_ACCOUNT_SID}/Calls.json", data=data)
+    if response.status_code >= 400:
+        try:
+            error = response.json()
+        except ValueError:
+            error = {}
+        raise TwilioError(response.status_code, error.get("message", response.text), error.get("code"))
+    return response.json()["sid"]
+
+async def close_twilio_client():
+    """Close the shared connection pool"""
+    await http_client.aclose()
@@ -0,0 +1,122 @@
+"""Admission control for a bounded number of concurrent sessions"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Optional
+from app.utils.resilience import LatencyTracker
+
+
+class AdmissionController:
+    """
+    Caps concurrent sessions, queueing a bounded number of new ones for a free slot
+
+    Sessions started elsewhere (e.g. an outbound dial whose call has yet to connect)
+    can `reserve` capacity first; reserving fails, so the caller can shed load, once
+    active, queued and reserved sessions fill every slot and queue place. A
+    reservation is used up by the `admit` with its key, or lapses after
+    `reservation_seconds`.
+    """
+
+    def __init__(self, name: str, max_active: int, max_queued: int, max_wait: float, reservation_seconds: float):
+        self.name = name
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.reservation_seconds = reservation_seconds
+        self.active = 0
+        self.peak_active = 0
+        self._queue: Deque[asyncio.Future] = deque()
+        self._reservations: Dict[Hashable, float] = {}
+        self.queue_wait = LatencyTracker()
+        self.counters = {"admitted": 0, "queued": 0, "rejected": 0, "shed": 0, "reservations_expired": 0}
+
+    def _expire_reservations(self):
+        now = time.monotonic()
+        for key in [key for key, expires_at in self._reservations.items() if expires_at <= now]:
+            del self._reservations[key]
+            self.counters["reservations_expired"] += 1
+
+    @property
+    def load(self) -> int:
+        """Active, queued and reserved sessions"""
+        self._expire_reservations()
+        return self.active + len(self._queue) + len(self._reservations)
+
+    def has_capacity(self) -> bool:
+        """Whether a new session could start now or wait in the queue"""
+        return self.load < self.max_active + self.max_queued
+
+    def reserve(self, key: Hashable) -> bool:
+        """Hold capacity for a session about to start; False if there is none"""
+        if not self.has_capacity():
+            self.counters["shed"] += 1
+            return False
+        self._reservations[key] = time.monotonic() + self.reservation_seconds
+        return True
+
+    def cancel_reservation(self, key: Hashable):
+        self._reservations.pop(key, None)
+
+    def _start(self):
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+    async def admit(self, key: Optional[Hashable] = None) -> bool:
+        """
+        Start a session, waiting up to `max_wait` seconds in the queue if all slots are taken
+
+        Returns:
+            bool: False if the queue was full or no slot freed up in time; the session
+            must then not start, and must not call `release`
+        """
+        self._reservations.pop(key, None)
+        if self.active < self.max_active and not self._queue:
+            self._start()
+            self.counters["admitted"] += 1
+            return True
+        if len(self._queue) >= self.max_queued:
+            self.counters["rejected"] += 1
+            return False
+
+        started = time.monotonic()
+        slot = asyncio.get_running_loop().create_future()
+        self._queue.append(slot)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait_for(slot, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.counters["rejected"] += 1
+            return False
+        except asyncio.CancelledError:
+            # Pass on a slot handed over just before the session gave up
+            if slot.done() and not slot.cancelled():
+                self.release()
+            raise
+        finally:
+            if slot in self._queue:
+                self._queue.remove(slot)
+        self.queue_wait.record(time.monotonic() - started)
+        self.counters["admitted"] += 1
+        return True
+
+    def release(self):
+        """End an admitted session, handing its slot straight to the longest-queued one"""
+        while self._queue:
+            slot = self._queue.popleft()
+            if not slot.done():
+                slot.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "active": self.active,
+            "peak_active": self.peak_active,
+            "queued_now": len(self._queue),
+            "reserved": len(self._reservations),
+            "max_active": self.max_active,
+            "max_queued": self.max_queued,
+            "queue_wait_seconds": self.queue_wait.summary(),
+        }
@@ -0,0 +1,165 @@
+"""Token buckets and a priority scheduler for sharing an upstream rate limit"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+from app.utils.resilience import LatencyTracker
+
+
+class TokenBucket:
+    """
+    Budget refilled continuously at `per_minute`, holding at most `capacity`
+    (by default a minute's worth)
+
+    `take` may drive the level below zero, so requests whose real cost turns out
+    higher than estimated are paid back out of the next refills.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.level
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def seconds_until(self, amount: float) -> float:
+        """How long until `amount` is available (capped at what a full bucket holds)"""
+        missing = min(amount, self.capacity) - self.available()
+        return max(0.0, missing * 60 / self.per_minute)
+
+
+class BudgetExceeded(Exception):
+    """A request could not get rate-limit budget within its maximum wait"""
+
+
+class RequestScheduler:
+    """
+    Grants requests budget from request and token buckets, strictly by priority
+
+    Lower priority values go first; equal priorities are served in arrival order.
+    Requests with a priority above 0 may only use the budget above `reserve`
+    (a fraction of each bucket), so bursts of background work leave headroom for
+    priority 0. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float, reserve: float = 0.0):
+        self.name = name
+        self.buckets = {
+            "requests": TokenBucket(requests_per_minute) if requests_per_minute > 0 else None,
+            "tokens": TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None,
+        }
+        self.reserve = reserve
+        self._waiters: List[Any] = []
+        self._order = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.wait_times: Dict[int, LatencyTracker] = {}
+        self.counters = {"granted": 0, "waited": 0, "rejected": 0}
+
+    def _fits(self, priority: int, tokens: int) -> bool:
+        for name, amount in (("requests", 1), ("tokens", tokens)):
+            bucket = self.buckets[name]
+            if bucket is None:
+                continue
+            floor = bucket.capacity * self.reserve if priority > 0 else 0.0
+            # A request larger than the whole bucket is let through once it is full
+            if bucket.available() - floor < min(amount, bucket.capacity - floor):
+                return False
+        return True
+
+    def _seconds_until_fits(self, priority: int, tokens: int) -> float:
+        wait = 0.0
+        for name, amount in (("requests", 1), ("tokens", tokens)):
+            bucket = self.buckets[name]
+            if bucket is not None:
+                floor = bucket.capacity * self.reserve if priority > 0 else 0.0
+                wait = max(wait, bucket.seconds_until(min(amount, bucket.capacity - floor) + floor))
+        return wait
+
+    def _grant(self, tokens: int):
+        if self.buckets["requests"] is not None:
+            self.buckets["requests"].take(1)
+        if self.buckets["tokens"] is not None:
+            self.buckets["tokens"].take(tokens)
+        self.counters["granted"] += 1
+
+    async def acquire(self, priority: int, tokens: int, max_wait: Optional[float] = None):
+        """
+        Wait until the request fits the budget, and take it
+
+        Raises:
+            BudgetExceeded: If the budget was not granted within `max_wait` seconds
+        """
+        if (not self._waiters or priority < self._waiters[0][0]) and self._fits(priority, tokens):
+            self._grant(tokens)
+            self.wait_times.setdefault(priority, LatencyTracker()).record(0.0)
+            return
+
+        started = time.monotonic()
+        granted = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), tokens, granted))
+        self.counters["waited"] += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(granted), timeout=max_wait)
+        except asyncio.TimeoutError:
+            if not granted.done():
+                granted.cancel()
+                self.counters["rejected"] += 1
+                raise BudgetExceeded(f"{self.name}: no budget within {max_wait}s")
+        except asyncio.CancelledError:
+            granted.cancel()
+            raise
+        self.wait_times.setdefault(priority, LatencyTracker()).record(time.monotonic() - started)
+
+    async def _dispatch(self):
+        """Grant queued requests in priority order as budget refills"""
+        while self._waiters:
+            priority, _, tokens, granted = self._waiters[0]
+            if granted.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._fits(priority, tokens):
+                heapq.heappop(self._waiters)
+                self._grant(tokens)
+                granted.set_result(None)
+                continue
+            # Sleep until the head fits, or a new (possibly higher priority) waiter arrives
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.01, self._seconds_until_fits(priority, tokens)))
+            except asyncio.TimeoutError:
+                pass
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once a request's real token usage is known"""
+        if self.buckets["tokens"] is not None:
+            self.buckets["tokens"].take(actual - estimated)
+
+    def stats(self) -> Dict[str, Any]:
+        depth: Dict[int, int] = {}
+        for priority, _, _, granted in self._waiters:
+            if not granted.done():
+                depth[priority] = depth.get(priority, 0) + 1
+        return {
+            **self.counters,
+            "queue_depth": depth,
+            "available": {name: bucket.available() for name, bucket in self.buckets.items() if bucket is not None},
+            "wait_seconds": {priority: tracker.summary() for priority, tracker in sorted(self.wait_times.items())},
+        }
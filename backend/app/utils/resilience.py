@@ -0,0 +1,100 @@
+"""Latency tracking and circuit breaking for calls to upstream services"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies with percentile lookups"""
+
+    def __init__(self, window: int = 500):
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """The p-th percentile (0-100) of the window, or None if it is empty"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing
+
+    After `failure_threshold` consecutive failures the breaker opens and `allow()`
+    returns False for `cooldown` seconds. Then it half-opens and lets one probe
+    through: a success closes it again, a failure re-opens it. A probe that reports
+    neither within `probe_timeout` seconds (e.g. because it was cancelled) is given
+    up on, and the next call probes instead.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30.0, probe_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_timeout = cooldown if probe_timeout is None else probe_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe_expires_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be made now"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probe_expires_at = time.monotonic() + self.probe_timeout
+            return True
+        return False
+
+    @property
+    def _probing(self) -> bool:
+        return self._probe_expires_at is not None and time.monotonic() < self._probe_expires_at
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print(f"Circuit {self.name} closed, upstream recovered")
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_expires_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == "half_open" or (self.opened_at is None and self.consecutive_failures >= self.failure_threshold):
+            if self.opened_at is None:
+                print(f"Circuit {self.name} opened after {self.consecutive_failures} consecutive failures")
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+        self._probe_expires_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+        }
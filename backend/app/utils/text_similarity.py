@@ -0,0 +1,56 @@
+"""Lightweight TF-IDF text similarity, pure Python with sparse vectors"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+STOPWORDS = frozenset("""
+a an and are as at be because been but by can could do does for from has have how i if in into is it its
+just like me my of on or so that the their then there these they this to too um uh was we well what when
+where which while who why will with would you your yeah okay ok basically actually really
+""".split())
+
+Vector = Dict[str, float]
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with plural and verb suffixes stripped"""
+    tokens = []
+    for word in re.findall(r"[a-z0-9_+#]+", (text or "").lower()):
+        if word in STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "es", "s"):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+def cosine(a: Vector, b: Vector) -> float:
+    """Cosine similarity of two L2-normalized sparse vectors"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+class TfidfIndex:
+    """Inverse document frequencies fitted on a corpus, turning texts into normalized TF-IDF vectors"""
+
+    __slots__ = ("idf", "default_idf")
+
+    def __init__(self, documents: Iterable[str]):
+        document_frequency: Counter = Counter()
+        count = 0
+        for document in documents:
+            document_frequency.update(set(tokenize(document)))
+            count += 1
+        # Smoothed idf; terms never seen in the corpus get the highest weight
+        self.idf = {term: math.log((1 + count) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        self.default_idf = math.log(1 + count) + 1
+
+    def vector(self, text: str) -> Vector:
+        """TF-IDF vector of a text with unit length; empty for texts without content words"""
+        counts = Counter(tokenize(text))
+        weights = {term: (1 + math.log(tf)) * self.idf.get(term, self.default_idf) for term, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {term: w / norm for term, w in weights.items()} if norm else {}
@@ -0,0 +1,141 @@
+"""Per-call actor processing a call's messages in order, one turn at a time"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional
+from fastapi import WebSocket
+from app.config import SPECULATIVE_STABLE_SECONDS, CALL_CLOSE_DRAIN_SECONDS
+from app.services.interview_service import (
+    initialize_interview,
+    process_answer,
+    speculate_score,
+    discard_speculation,
+    TurnInterrupted,
+)
+
+# Actors of calls connected to this worker, by call_sid
+call_actors: Dict[str, "CallActor"] = {}
+
+actor_counters = {"turns": 0, "interrupted_turns": 0}
+
+
+class CallActor:
+    """
+    Owns one call's WebSocket and interview turns
+
+    Messages are queued in an inbox and handled strictly in arrival order by a single
+    task, so turns for a call never run concurrently and the session needs no locks.
+    Interrupts bypass the inbox: they cancel the turn being scored, whose response
+    would be talked over anyway, and leave the question open for the next prompt.
+    Partial transcripts (prompts with `last: false`) also bypass it: once one has
+    been stable for SPECULATIVE_STABLE_SECONDS it is scored speculatively.
+    """
+
+    def __init__(self, websocket: WebSocket, interview_id: Optional[str] = None):
+        self.websocket = websocket
+        self.interview_id = interview_id
+        self.call_sid: Optional[str] = None
+        self.inbox: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._interrupt = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._partial_timer: Optional[asyncio.Task] = None
+        self._handling = False
+        self._closing = False
+
+    def start(self):
+        self._runner = asyncio.create_task(self._run())
+
+    def submit(self, message: Dict[str, Any]):
+        """Queue a message for the call, handling interrupts immediately"""
+        if message["type"] == "interrupt":
+            print("Handling interruption.")
+            self._interrupt.set()
+            return
+        if message["type"] == "prompt":
+            if self._partial_timer is not None:
+                self._partial_timer.cancel()
+                self._partial_timer = None
+            if message.get("last") is False:
+                if self.call_sid:
+                    self._partial_timer = asyncio.create_task(self._speculate_when_stable(message["voicePrompt"]))
+                return
+        self.inbox.put_nowait(message)
+
+    async def _speculate_when_stable(self, transcript: str):
+        """Score a partial transcript speculatively if no newer partial arrives in time"""
+        await asyncio.sleep(SPECULATIVE_STABLE_SECONDS)
+        try:
+            await speculate_score(self.call_sid, transcript)
+        except Exception as e:
+            print(f"Error starting speculative score for call {self.call_sid}: {str(e)}")
+
+    async def _send(self, token: str):
+        await self.websocket.send_text(json.dumps({"type": "text", "token": token, "last": True}))
+
+    async def _run(self):
+        while not self._closing:
+            message = await self.inbox.get()
+            self._handling = True
+            try:
+                await self._handle(message)
+            except Exception as e:
+                print(f"Error handling {message.get('type')} message for call {self.call_sid}: {str(e)}")
+            finally:
+                self._handling = False
+
+    async def _handle(self, message: Dict[str, Any]):
+        if message["type"] == "setup":
+            self.call_sid = message["callSid"]
+            print(f"Setup for call: {self.call_sid}")
+            call_actors[self.call_sid] = self
+
+            # Immediately send OUR welcome message and first question
+            welcome_response = await initialize_interview(self.call_sid, self.interview_id)
+            await self._send(welcome_response)
+            print(f"Sent immediate welcome: {welcome_response}")
+
+        elif message["type"] == "prompt":
+            print(f"Processing prompt: {message['voicePrompt']}")
+
+            # Only interrupts that arrive while this turn is in flight cancel it
+            self._interrupt = asyncio.Event()
+            actor_counters["turns"] += 1
+            try:
+                response = await process_answer(self.call_sid, message['voicePrompt'], self._interrupt)
+            except TurnInterrupted:
+                actor_counters["interrupted_turns"] += 1
+                print(f"Turn interrupted for call {self.call_sid}, waiting for the caller to finish")
+                return
+            await self._send(response)
+            print(f"Sent response: {response}")
+
+        else:
+            print(f"Unknown message type received: {message['type']}")
+
+    async def close(self):
+        """
+        Stop processing once the turn in flight, if any, is done
+
+        Queued messages are dropped and any speculative score is cancelled. A turn
+        still being scored is interrupted, discarding its answer. A turn past scoring,
+        such as one completing the interview, gets up to CALL_CLOSE_DRAIN_SECONDS to
+        finish before it is cancelled, so an interview completing as the caller hangs
+        up queues its outcome email and closes its session rather than being reported
+        incomplete.
+        """
+        self._closing = True
+        self._interrupt.set()
+        if self._partial_timer is not None:
+            self._partial_timer.cancel()
+        if self._runner is not None and not self._runner.done():
+            if self._handling:
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._runner), timeout=CALL_CLOSE_DRAIN_SECONDS)
+                except asyncio.TimeoutError:
+                    print(f"Last turn for call {self.call_sid} still running after {CALL_CLOSE_DRAIN_SECONDS}s, cancelling it")
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+        if self.call_sid:
+            discard_speculation(self.call_sid)
+            if call_actors.get(self.call_sid) is self:
+                del call_actors[self.call_sid]
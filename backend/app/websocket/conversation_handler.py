@@ -6,11 +6,15 @@ import hashlib
 import base64
 from fastapi import WebSocket, WebSocketDisconnect
 from app.config import TWILIO_AUTH_TOKEN, DOMAIN, SYSTEM_PROMPT
-from app.services.interview_service import initialize_interview, process_answer, interview_sessions
-from app.services.email_service import send_interview_incomplete_email
+from app.services.interview_service import interview_sessions, discard_pending_scores, call_admission
+from app.services.email_outbox import enqueue_email
+from app.services.interview_events import publish
+from app.websocket.call_actor import CallActor
 
 # No sessions needed - direct control only
 
+OVER_CAPACITY_MESSAGE = "Sorry, all our interviewers are busy right now. Please try again in a few minutes. Goodbye!"
+
 def validate_twilio_signature(signature, url, auth_token):
     """Validate Twilio signature for WebSocket security"""
     if not signature or not auth_token:
@@ -47,7 +51,17 @@ async def handle_websocket_connection(websocket: WebSocket):
     # TODO: Re-enable signature validation after fixing the core issue
     
     await websocket.accept()
-    call_sid = None
+    
+    # Over capacity, a call waits briefly for a free slot and is turned away if none frees up
+    if not await call_admission.admit(interview_id):
+        print(f"Turning away call for interview {interview_id}: {call_admission.active} interviews live")
+        await websocket.send_text(json.dumps({"type": "text", "token": OVER_CAPACITY_MESSAGE, "last": True}))
+        await websocket.send_text(json.dumps({"type": "end"}))
+        await websocket.close()
+        return
+    
+    actor = CallActor(websocket, interview_id)
+    actor.start()
     
     try:
         while True:
@@ -55,56 +69,22 @@ async def handle_websocket_connection(websocket: WebSocket):
             message = json.loads(data)
             print(f"RECEIVED MESSAGE: {message}")
             
-            if message["type"] == "setup":
-                call_sid = message["callSid"]
-                print(f"Setup for call: {call_sid}")
-                websocket.call_sid = call_sid
-                
-                # Use the interview_id extracted from query parameters
-                
-                # NO SESSIONS - we control everything directly
-                # Immediately send OUR welcome message and first question
-                welcome_response = initialize_interview(call_sid, interview_id)
-                await websocket.send_text(
-                    json.dumps({
-                        "type": "text", 
-                        "token": welcome_response,
-                        "last": True
-                    })
-                )
-                print(f"Sent immediate welcome: {welcome_response}")
-                
-            elif message["type"] == "prompt":
-                print(f"Processing prompt: {message['voicePrompt']}")
-                
-                # Process user's answer through interview logic
-                response = await process_answer(websocket.call_sid, message['voicePrompt'])
-                
-                await websocket.send_text(
-                    json.dumps({
-                        "type": "text",
-                        "token": response,
-                        "last": True
-                    })
-                )
-                print(f"Sent response: {response}")
-                
-            elif message["type"] == "interrupt":
-                print("Handling interruption.")
-                
-            else:
-                print(f"Unknown message type received: {message['type']}")
+            # Turns are processed in order by the call's actor; interrupts cancel the turn in flight
+            actor.submit(message)
                 
     except WebSocketDisconnect:
+        call_sid = actor.call_sid
         print(f"WebSocket connection closed for call: {call_sid}")
-        if call_sid and call_sid in interview_sessions:
+        await actor.close()
+        session = await interview_sessions.get(call_sid) if call_sid else None
+        if session is not None:
             # Get session data before deletion
-            session = interview_sessions[call_sid]
-            questions_answered = len(session.get('scores', []))
-            config = session.get('config', {})
-            candidate_email = config.get('email')
+            # Answers still being scored in the background, or waiting for batch scoring, count as answered
+            questions_answered = session.questions_answered + discard_pending_scores(call_sid)
+            candidate_email = session.email
             
             print(f"Interview session ended early for {call_sid} - {questions_answered} questions answered")
+            publish(call_sid, "disconnected", questions_answered=questions_answered)
             
             # Send incomplete interview email if candidate email exists and interview was started
             if (candidate_email and 
@@ -112,11 +92,11 @@ async def handle_websocket_connection(websocket: WebSocket):
                 questions_answered > 0 and 
                 questions_answered < 10):
                 
-                success = send_interview_incomplete_email(candidate_email, "Candidate", questions_answered)
-                if success:
-                    print(f"Incomplete interview email sent to: {candidate_email}")
-                else:
-                    print(f"Failed to send incomplete interview email to: {candidate_email}")
+                enqueue_email("incomplete", candidate_email, session.interview_id or call_sid, candidate_name="Candidate", questions_answered=questions_answered)
             
             # Clean up session
-            del interview_sessions[call_sid]
\ No newline at end of file
+            await interview_sessions.delete(call_sid)
+    finally:
+        # Covers errors other than a normal disconnect; closing twice is harmless
+        await actor.close()
+        call_admission.release()
@@ -0,0 +1,13 @@
+"""Test settings, applied before any app module reads its configuration"""
+
+import os
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="recruiter-agent-tests-")
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ["SESSION_STORE_BACKEND"] = "memory"
+os.environ["SESSION_STORE_SQLITE_PATH"] = os.path.join(_data_dir, "sessions.db")
+os.environ["QUESTION_CACHE_DB_PATH"] = os.path.join(_data_dir, "question_cache.db")
+os.environ["SCORING_CACHE_DB_PATH"] = os.path.join(_data_dir, "scoring_cache.db")
+os.environ["EMAIL_OUTBOX_DB_PATH"] = os.path.join(_data_dir, "email_outbox.db")
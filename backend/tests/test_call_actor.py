@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from app.services import interview_service
+from app.websocket.call_actor import CallActor
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+
+@pytest.fixture
+def interview(monkeypatch):
+    """Interview with instant scoring that records outcome emails"""
+    scoring = {"delay": 0}
+    emails = []
+
+    async def score_answer(question, answer, pool=None, escalation_threshold=None):
+        await asyncio.sleep(scoring["delay"])
+        return 8
+
+    monkeypatch.setattr(interview_service, "score_answer", score_answer)
+    monkeypatch.setattr(interview_service, "enqueue_outcome_email", lambda passed, *args, **kwargs: emails.append(passed))
+    return scoring, emails
+
+
+async def _started_actor(call_sid: str) -> CallActor:
+    actor = CallActor(FakeWebSocket())
+    actor.start()
+    actor.submit({"type": "setup", "callSid": call_sid})
+    while await interview_service.load_session(call_sid) is None:
+        await asyncio.sleep(0.01)
+    return actor
+
+
+async def test_close_lets_a_completing_turn_finish(interview, monkeypatch):
+    _, emails = interview
+    actor = await _started_actor("CA-actor-1")
+    for _ in range(9):
+        await interview_service.process_answer("CA-actor-1", "An answer")
+
+    # Slow session cleanup widens the window between queueing the email and deleting the session
+    delete = interview_service.interview_sessions.delete
+
+    async def slow_delete(key):
+        await asyncio.sleep(0.2)
+        await delete(key)
+
+    monkeypatch.setattr(interview_service.interview_sessions, "delete", slow_delete)
+    actor.submit({"type": "prompt", "voicePrompt": "The last answer", "last": True})
+    while not emails:
+        await asyncio.sleep(0.01)
+    await actor.close()
+
+    assert emails == [True]
+    # The disconnect handler finds no session, so sends no "incomplete" email
+    assert await interview_service.interview_sessions.get("CA-actor-1") is None
+
+
+async def test_close_interrupts_a_turn_still_being_scored(interview):
+    scoring, emails = interview
+    actor = await _started_actor("CA-actor-2")
+    scoring["delay"] = 10
+
+    actor.submit({"type": "prompt", "voicePrompt": "An answer", "last": True})
+    await asyncio.sleep(0.05)
+    await asyncio.wait_for(actor.close(), timeout=1)
+
+    session = await interview_service.load_session("CA-actor-2")
+    assert session.questions_asked == 1 and len(session.scores) == 0
+    assert emails == []
+
+
+async def test_close_drops_queued_turns(interview):
+    scoring, _ = interview
+    actor = await _started_actor("CA-actor-3")
+    scoring["delay"] = 0.1
+
+    for _ in range(3):
+        actor.submit({"type": "prompt", "voicePrompt": "An answer", "last": True})
+    await asyncio.sleep(0.01)
+    await actor.close()
+
+    session = await interview_service.load_session("CA-actor-3")
+    assert len(session.scores) == 0
@@ -0,0 +1,105 @@
+import asyncio
+import time
+import pytest
+from app.services import campaign_dialer
+from app.services.session_store import create_session_store
+from app.utils.admission import AdmissionController
+from app.utils.rate_limit import TokenBucket
+
+CONFIG = {"language": "Python", "email": "candidate@example.com", "questions": ["What is a generator?"]}
+
+
+@pytest.fixture
+async def dialer(monkeypatch):
+    """A dialer with fresh stores, no call rate limit and a recorded Twilio"""
+    configs = {}
+    calls = []
+
+    async def set_interview_config(interview_id, config):
+        configs[interview_id] = {**config, "written_at": time.time()}
+
+    async def create_call(to, url, status_callback=None):
+        calls.append(to)
+        return f"CA{len(calls)}"
+
+    stores = [create_session_store(name, backend="memory") for name in ("campaigns", "call_outcomes")]
+    monkeypatch.setattr(campaign_dialer, "campaigns", stores[0])
+    monkeypatch.setattr(campaign_dialer, "call_outcomes", stores[1])
+    monkeypatch.setattr(campaign_dialer, "_active", {})
+    monkeypatch.setattr(campaign_dialer, "_configs", {})
+    monkeypatch.setattr(campaign_dialer, "_dials", set())
+    monkeypatch.setattr(campaign_dialer, "_dial_budget", TokenBucket(60000, capacity=100))
+    monkeypatch.setattr(campaign_dialer, "call_admission", AdmissionController(
+        "calls", max_active=100, max_queued=0, max_wait=0, reservation_seconds=60
+    ))
+    monkeypatch.setattr(campaign_dialer, "set_interview_config", set_interview_config)
+    monkeypatch.setattr(campaign_dialer, "create_call", create_call)
+    monkeypatch.setattr(campaign_dialer, "CAMPAIGN_MAX_CONCURRENT_CALLS", 3)
+    yield configs, calls
+    for store in stores:
+        await store.close()
+
+
+def _candidates(prefix: str, count: int):
+    return [{"phone": f"+1555{prefix}{i:04d}", "email": None} for i in range(count)]
+
+
+async def _advance_all():
+    for campaign in list(campaign_dialer._active.values()):
+        await campaign_dialer._advance(campaign)
+    await asyncio.gather(*campaign_dialer._dials)
+
+
+async def test_configs_are_written_when_each_candidate_is_dialed(dialer):
+    configs, calls = dialer
+    campaign = await campaign_dialer.create_campaign(_candidates("100", 5), CONFIG)
+    assert configs == {}
+
+    await _advance_all()
+    dialed = [entry for entry in campaign["candidates"] if entry["status"] == "live"]
+    assert len(dialed) == 3
+    assert set(configs) == {entry["interview_id"] for entry in dialed}
+    assert all(config["questions"] == CONFIG["questions"] for config in configs.values())
+
+    await campaign_dialer.record_call_outcome(dialed[0]["call_sid"], "completed")
+    freed_at = time.time()
+    await _advance_all()
+
+    (next_entry,) = [entry for entry in campaign["candidates"] if entry["status"] == "live" and entry not in dialed]
+    assert len(configs) == 4
+    assert configs[next_entry["interview_id"]]["written_at"] >= freed_at
+
+
+async def test_live_call_limit_is_shared_by_all_campaigns(dialer):
+    configs, calls = dialer
+    first = await campaign_dialer.create_campaign(_candidates("200", 5), CONFIG)
+    second = await campaign_dialer.create_campaign(_candidates("300", 5), CONFIG, max_concurrent=10)
+    assert second["max_concurrent"] == 3
+
+    await _advance_all()
+
+    assert len(calls) == 3
+    assert campaign_dialer._live_calls() == 3
+    assert all(entry["status"] == "queued" for entry in second["candidates"])
+
+    live = next(entry for entry in first["candidates"] if entry["status"] == "live")
+    await campaign_dialer.record_call_outcome(live["call_sid"], "completed")
+    await _advance_all()
+
+    assert len(calls) == 4
+    assert campaign_dialer._live_calls() == 3
+
+
+async def test_a_failed_dial_frees_its_live_call_slot(dialer, monkeypatch):
+    configs, calls = dialer
+
+    async def create_call(to, url, status_callback=None):
+        raise RuntimeError("Twilio is down")
+
+    monkeypatch.setattr(campaign_dialer, "create_call", create_call)
+    campaign = await campaign_dialer.create_campaign(_candidates("400", 2), CONFIG)
+
+    await _advance_all()
+
+    assert [entry["status"] for entry in campaign["candidates"]] == ["dial_failed", "dial_failed"]
+    assert campaign_dialer._live_calls() == 0
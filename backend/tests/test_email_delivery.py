@@ -0,0 +1,141 @@
+import asyncio
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+from app.services import email_outbox, email_service
+
+
+class RecordingHandler:
+    """Accepts mail, remembering which SMTP session delivered each message"""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+        self.reject_next = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("unknown"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.reject_next:
+            return self.reject_next.pop(0)
+        self.sessions.add(session.peer)
+        self.messages.append((session.peer, envelope.rcpt_tos[0]))
+        return "250 Message accepted for delivery"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    monkeypatch.setattr(email_service, "SMTP_HOST", controller.hostname)
+    monkeypatch.setattr(email_service, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(email_service, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(email_service, "SMTP_LOGIN", False)
+    monkeypatch.setattr(email_service, "GMAIL_USER", "recruiter@example.org")
+    monkeypatch.setattr(email_outbox, "GMAIL_USER", "recruiter@example.org")
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def outbox(smtp_server, tmp_path, monkeypatch):
+    """Settings for a fast outbox over a fresh database; the test starts it with `workers`"""
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_DB_PATH", str(tmp_path / "outbox.db"))
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_BACKOFF_SECONDS", 0.05)
+    monkeypatch.setattr(email_outbox, "_intake", asyncio.Queue())
+    monkeypatch.setattr(email_outbox, "_wakeup", asyncio.Event())
+
+    async def start(workers: int, batch_size: int = 20):
+        monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_WORKERS", workers)
+        monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_BATCH_SIZE", batch_size)
+        await email_outbox.start_email_outbox()
+
+    return start
+
+
+async def _wait_for(condition, timeout: float = 3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def _statuses():
+    return dict(email_outbox._db_executor.submit(
+        lambda: email_outbox._db.execute("SELECT candidate_email, status FROM email_outbox").fetchall()
+    ).result())
+
+
+async def test_outbox_delivers_each_email_once_across_workers(smtp_server, outbox):
+    await outbox(workers=3, batch_size=2)
+    try:
+        for i in range(12):
+            email_outbox.enqueue_email("rejection", f"candidate{i}@example.org", f"interview-{i}")
+        # A duplicate of an email already queued is dropped
+        email_outbox.enqueue_email("rejection", "candidate0@example.org", "interview-0")
+        await _wait_for(lambda: len(smtp_server.messages) >= 12)
+        await asyncio.sleep(0.2)
+    finally:
+        await email_outbox.stop_email_outbox()
+
+    recipients = sorted(rcpt for _, rcpt in smtp_server.messages)
+    assert recipients == sorted(f"candidate{i}@example.org" for i in range(12))
+    assert 1 < len(smtp_server.sessions) <= 3
+
+
+async def test_worker_reuses_its_smtp_session_between_batches(smtp_server, outbox, monkeypatch):
+    monkeypatch.setattr(email_outbox, "EMAIL_SMTP_IDLE_SECONDS", 30)
+    await outbox(workers=1, batch_size=2)
+    try:
+        for i in range(5):
+            email_outbox.enqueue_email("rejection", f"first{i}@example.org", f"first-{i}")
+        await _wait_for(lambda: len(smtp_server.messages) == 5)
+        await asyncio.sleep(0.2)
+        email_outbox.enqueue_email("rejection", "later@example.org", "later")
+        await _wait_for(lambda: len(smtp_server.messages) == 6)
+    finally:
+        await email_outbox.stop_email_outbox()
+
+    assert len(smtp_server.sessions) == 1
+
+
+async def test_idle_smtp_session_is_closed_and_reopened(smtp_server, outbox, monkeypatch):
+    monkeypatch.setattr(email_outbox, "EMAIL_SMTP_IDLE_SECONDS", 0.05)
+    await outbox(workers=1)
+    try:
+        email_outbox.enqueue_email("rejection", "first@example.org", "first")
+        await _wait_for(lambda: len(smtp_server.messages) == 1)
+        await asyncio.sleep(0.3)
+        assert email_outbox._connections[0] is None
+        email_outbox.enqueue_email("rejection", "second@example.org", "second")
+        await _wait_for(lambda: len(smtp_server.messages) == 2)
+    finally:
+        await email_outbox.stop_email_outbox()
+
+    assert len(smtp_server.sessions) == 2
+
+
+async def test_temporary_failures_are_retried_and_refused_recipients_are_not(smtp_server, outbox):
+    smtp_server.reject_next.append("451 4.3.0 Try again later")
+    await outbox(workers=1)
+    try:
+        email_outbox.enqueue_email("rejection", "retry@example.org", "retry")
+        email_outbox.enqueue_email("rejection", "unknown@example.org", "refused")
+        await _wait_for(lambda: _statuses().get("retry@example.org") == "sent")
+        await _wait_for(lambda: _statuses().get("unknown@example.org") == "failed")
+    finally:
+        await email_outbox.stop_email_outbox()
+
+    assert [rcpt for _, rcpt in smtp_server.messages] == ["retry@example.org"]
@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import time
+import pytest
+from app.services import email_outbox
+
+OLD_SCHEMA = """
+CREATE TABLE email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    interview_id TEXT NOT NULL,
+    email_type TEXT NOT NULL,
+    candidate_email TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    UNIQUE (interview_id, email_type)
+);
+"""
+
+
+@pytest.fixture
+def outbox_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.db")
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_DB_PATH", path)
+    yield path
+    email_outbox._close_db()
+
+
+def _insert(interview_id: str, email_type: str = "rejection"):
+    now = time.time()
+    email_outbox._insert_batch([(interview_id, email_type, f"{interview_id}@example.org", json.dumps({}), now, now)])
+
+
+def _as_process(monkeypatch, owner: str):
+    monkeypatch.setattr(email_outbox, "_owner", owner)
+
+
+def test_claimed_emails_are_not_claimed_again_while_leased(outbox_db, monkeypatch):
+    email_outbox._open_db()
+    _insert("a")
+    _insert("b")
+
+    _as_process(monkeypatch, "worker-1")
+    first = email_outbox._claim_due(10)
+    _as_process(monkeypatch, "worker-2")
+    second = email_outbox._claim_due(10)
+
+    assert sorted(job["id"] for job in first) == [1, 2]
+    assert second == []
+
+
+def test_startup_does_not_reclaim_emails_leased_by_a_live_process(outbox_db, monkeypatch):
+    email_outbox._open_db()
+    _insert("a")
+    _as_process(monkeypatch, "worker-1")
+    assert len(email_outbox._claim_due(10)) == 1
+
+    # Another process starting against the same database
+    email_outbox._close_db()
+    email_outbox._open_db()
+    _as_process(monkeypatch, "worker-2")
+
+    assert email_outbox._claim_due(10) == []
+
+
+def test_expired_leases_are_claimed_again(outbox_db, monkeypatch):
+    email_outbox._open_db()
+    _insert("a")
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_LEASE_SECONDS", -1)
+    _as_process(monkeypatch, "stopped-worker")
+    stale = email_outbox._claim_due(10)
+
+    _as_process(monkeypatch, "worker-2")
+    reclaimed = email_outbox._claim_due(10)
+    assert [job["id"] for job in reclaimed] == [job["id"] for job in stale]
+
+    # The process that lost the lease no longer records results for the email
+    _as_process(monkeypatch, "stopped-worker")
+    email_outbox._record_results(stale, {})
+    assert email_outbox._db.execute("SELECT status, claimed_by FROM email_outbox").fetchone() == ("sending", "worker-2")
+
+    _as_process(monkeypatch, "worker-2")
+    email_outbox._record_results(reclaimed, {})
+    assert email_outbox._db.execute("SELECT status, claimed_by FROM email_outbox").fetchone() == ("sent", None)
+
+
+def test_failed_delivery_releases_the_claim_for_a_retry(outbox_db, monkeypatch):
+    email_outbox._open_db()
+    _insert("a")
+    batch = email_outbox._claim_due(10)
+    email_outbox._record_results(batch, {batch[0]["id"]: ("connection reset", False)})
+
+    status, attempts, claimed_by = email_outbox._db.execute(
+        "SELECT status, attempts, claimed_by FROM email_outbox"
+    ).fetchone()
+    assert (status, attempts, claimed_by) == ("pending", 1, None)
+
+
+def test_open_adds_lease_columns_to_existing_databases(outbox_db):
+    db = sqlite3.connect(outbox_db)
+    db.executescript(OLD_SCHEMA)
+    db.execute(
+        """INSERT INTO email_outbox (interview_id, email_type, candidate_email, payload, status, next_attempt_at, created_at)
+           VALUES ('a', 'rejection', 'a@example.org', '{}', 'sending', 0, 0)"""
+    )
+    db.commit()
+    db.close()
+
+    email_outbox._open_db()
+
+    columns = {row[1] for row in email_outbox._db.execute("PRAGMA table_info(email_outbox)")}
+    assert {"claimed_by", "lease_until"} <= columns
+    # Claimed before leases existed, so it is treated as expired
+    assert [job["id"] for job in email_outbox._claim_due(10)] == [1]
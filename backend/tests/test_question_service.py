@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.models.question_pool import intern_pool
+from app.services import question_service
+from app.services.session_store import create_session_store
+
+QUESTIONS = [f"Question number {i}?" for i in range(question_service.MAX_GENERATED_QUESTIONS)]
+
+
+class _Stream:
+    """Streams the canned questions as JSON lines after a delay, like a slow LLM"""
+
+    def __init__(self, delay: float, questions):
+        self.delay = delay
+        self.questions = questions
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.delay)
+        for question in self.questions:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=f'{{"question": "{question}"}}\n'))])
+
+
+@pytest.fixture
+async def upstream(monkeypatch):
+    cache = create_session_store(
+        "question_cache_test",
+        backend="memory",
+        encode=lambda pool: {"questions": list(pool.questions)},
+        decode=lambda data: intern_pool(data["questions"])
+    )
+    monkeypatch.setattr(question_service, "question_cache", cache)
+    monkeypatch.setattr(question_service, "cache_counters", {"hits": 0, "misses": 0, "coalesced": 0})
+    calls = SimpleNamespace(count=0, delay=0.1, questions=QUESTIONS)
+
+    async def create_completion(priority, expected_output_tokens=None, **kwargs):
+        calls.count += 1
+        return _Stream(calls.delay, calls.questions)
+
+    monkeypatch.setattr(question_service, "create_completion", create_completion)
+    yield calls
+    await cache.close()
+
+
+async def test_concurrent_generations_share_one_upstream_request(upstream):
+    results = await asyncio.gather(*(
+        question_service.generate_questions("Python", "Async IO", "3") for _ in range(5)
+    ))
+
+    assert upstream.count == 1
+    assert all(result == QUESTIONS for result in results)
+    assert question_service.cache_counters == {"hits": 0, "misses": 1, "coalesced": 4}
+    assert not question_service._inflight
+
+    assert await question_service.generate_questions("python", "async io.", "3") == QUESTIONS
+    assert upstream.count == 1
+    assert question_service.cache_counters["hits"] == 1
+
+
+async def test_cache_miss_racing_the_finishing_generation_does_not_regenerate(upstream, monkeypatch):
+    # A cache read that misses but returns only after the generation has cached its
+    # set and left _inflight used to start a second generation
+    cache = question_service.question_cache
+    get = cache.get
+
+    async def slow_get(key):
+        value = await get(key)
+        await asyncio.sleep(0.2)
+        return value
+
+    monkeypatch.setattr(cache, "get", slow_get)
+    upstream.delay = 0.05
+
+    first = asyncio.create_task(question_service.generate_questions("Go", "Channels"))
+    await asyncio.sleep(0.1)
+    second = asyncio.create_task(question_service.generate_questions("Go", "Channels"))
+
+    assert await first == QUESTIONS
+    assert await second == QUESTIONS
+    assert upstream.count == 1
+
+
+async def test_short_generation_is_not_cached_and_is_retried(upstream, monkeypatch):
+    monkeypatch.setattr(question_service, "QUESTION_GENERATION_MAX_ROUNDS", 1)
+    short = upstream.questions = QUESTIONS[:5]
+
+    assert await question_service.generate_questions("Rust", "Lifetimes") == short
+    assert await question_service.generate_questions("Rust", "Lifetimes") == short
+    assert upstream.count == 2
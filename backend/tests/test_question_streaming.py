@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from app.models.question_pool import DEFAULT_POOL
+from app.services import interview_service
+
+GENERATED = [f"Generated question {i}?" for i in range(20)]
+
+
+@pytest.fixture(autouse=True)
+def fast_interview(monkeypatch):
+    async def score_answer(question, answer, pool=None, escalation_threshold=None):
+        return 5
+
+    monkeypatch.setattr(interview_service, "score_answer", score_answer)
+    monkeypatch.setattr(interview_service, "QUESTION_GENERATION_WAIT_SECONDS", 0.3)
+    monkeypatch.setattr(interview_service, "TIERED_SCORING_ENABLED", False)
+
+
+async def _start(call_sid: str, interview_id: str, questions):
+    await interview_service.set_interview_config(interview_id, {
+        "language": "JavaScript", "email": None, "questions": questions,
+        "questionsStatus": "pending", "earlyStop": False,
+    })
+    await interview_service.initialize_interview(call_sid, interview_id)
+    session = await interview_service.load_session(call_sid)
+    assert session.pool_pending
+    return session
+
+
+async def _answer_all(call_sid: str, count: int) -> str:
+    reply = ""
+    for _ in range(count):
+        reply = await interview_service.process_answer(call_sid, "An answer")
+    return reply
+
+
+async def test_used_up_partial_pool_waits_for_the_next_publish():
+    await _start("CA-stream-1", "stream-1", GENERATED[:3])
+
+    async def publish_later():
+        await asyncio.sleep(0.1)
+        await interview_service._publish_questions("stream-1", GENERATED[:13], "pending")
+
+    publisher = asyncio.create_task(publish_later())
+    reply = await _answer_all("CA-stream-1", 3)
+    await publisher
+
+    assert reply.startswith("Thank you. Here's question 4")
+    session = await interview_service.load_session("CA-stream-1")
+    assert len(session.pool) == 13
+    assert session.pool[session.asked[3]] in GENERATED[3:13]
+
+
+async def test_stalled_generation_pads_the_pool_instead_of_ending_the_interview():
+    await _start("CA-stream-2", "stream-2", GENERATED[:3])
+
+    reply = await _answer_all("CA-stream-2", 3)
+
+    assert reply.startswith("Thank you. Here's question 4")
+    session = await interview_service.load_session("CA-stream-2")
+    assert not session.pool_pending
+    assert session.pool.questions[:3] == tuple(GENERATED[:3])
+    assert session.pool[session.asked[3]] in DEFAULT_POOL.questions
+    # The padded pool is resolvable by other workers
+    assert await interview_service.question_pools.get(session.pool_digest) is not None
+
+    reply = await _answer_all("CA-stream-2", 7)
+    assert "completes your interview" in reply or "didn't clear" in reply
+    assert await interview_service.load_session("CA-stream-2") is None
+
+
+async def test_cached_fallback_pool_is_stored_for_other_workers(monkeypatch):
+    cached = [f"Cached question {i}?" for i in range(12)]
+
+    async def get_cached_questions(language, prompt, yoe=None):
+        return cached
+
+    monkeypatch.setattr(interview_service, "get_cached_questions", get_cached_questions)
+    await interview_service.custom_configs.set("fallback-1", {"language": "Go", "questionsStatus": "failed"})
+
+    await interview_service.initialize_interview("CA-fallback-1", "fallback-1")
+
+    session = await interview_service.interview_sessions.get("CA-fallback-1")
+    stored = await interview_service.question_pools.get(session.pool_digest)
+    assert stored is not None and list(stored.questions) == cached
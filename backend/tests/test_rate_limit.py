@@ -0,0 +1,120 @@
+import asyncio
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from app.services import llm_client
+from app.services.llm_client import PRIORITY_BACKGROUND, PRIORITY_CALL, create_completion
+from app.utils import rate_limit
+from app.utils.rate_limit import BudgetExceeded, RequestScheduler, TokenBucket
+from tools import mock_llm
+
+
+def test_bucket_refills_continuously_up_to_capacity(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(600)
+    bucket.take(600)
+    assert bucket.available() == 0
+    assert bucket.seconds_until(10) == pytest.approx(1.0)
+
+    now[0] += 0.1
+    assert bucket.available() == pytest.approx(1)
+    assert bucket.seconds_until(10_000) == pytest.approx(59.9)
+
+    now[0] += 120
+    assert bucket.available() == 600
+
+
+async def test_requests_are_granted_in_priority_order():
+    scheduler = RequestScheduler("test", requests_per_minute=600, tokens_per_minute=0)
+    scheduler.buckets["requests"].level = 0
+    granted = []
+
+    async def request(name: str, priority: int):
+        await scheduler.acquire(priority, tokens=1)
+        granted.append(name)
+
+    tasks = [asyncio.create_task(request("background-1", PRIORITY_BACKGROUND))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("background-2", PRIORITY_BACKGROUND)))
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("call", PRIORITY_CALL)))
+    await asyncio.gather(*tasks)
+
+    assert granted == ["call", "background-1", "background-2"]
+    assert scheduler.counters["waited"] == 3
+
+
+async def test_background_requests_leave_the_reserve_to_calls():
+    scheduler = RequestScheduler("test", requests_per_minute=600, tokens_per_minute=0, reserve=0.5)
+    scheduler.buckets["requests"].level = 300
+
+    with pytest.raises(BudgetExceeded):
+        await scheduler.acquire(PRIORITY_BACKGROUND, tokens=1, max_wait=0.05)
+    await asyncio.wait_for(scheduler.acquire(PRIORITY_CALL, tokens=1, max_wait=0.05), timeout=0.1)
+
+    assert scheduler.counters["rejected"] == 1
+    assert scheduler.stats()["queue_depth"] == {}
+
+
+async def test_timed_out_waiter_does_not_hold_up_the_queue():
+    scheduler = RequestScheduler("test", requests_per_minute=600, tokens_per_minute=0)
+    scheduler.buckets["requests"].level = 0
+
+    with pytest.raises(BudgetExceeded):
+        await scheduler.acquire(PRIORITY_CALL, tokens=1, max_wait=0.01)
+    await asyncio.wait_for(scheduler.acquire(PRIORITY_BACKGROUND, tokens=1), timeout=0.5)
+
+
+async def test_settle_charges_the_difference_to_the_token_bucket():
+    scheduler = RequestScheduler("test", requests_per_minute=0, tokens_per_minute=6000)
+    await scheduler.acquire(PRIORITY_CALL, tokens=100)
+    assert scheduler.buckets["tokens"].available() == pytest.approx(5900, abs=5)
+
+    scheduler.settle(estimated=100, actual=250)
+    assert scheduler.buckets["tokens"].available() == pytest.approx(5750, abs=5)
+    scheduler.settle(estimated=100, actual=40)
+    assert scheduler.buckets["tokens"].available() == pytest.approx(5810, abs=5)
+
+
+@pytest.fixture
+def mock_openai(monkeypatch):
+    """Route the shared OpenAI client to the mock LLM in-process, with a fresh scheduler"""
+    monkeypatch.setattr(mock_llm, "LATENCY_SECONDS", 0)
+    monkeypatch.setattr(mock_llm, "TAIL_PROBABILITY", 0)
+    monkeypatch.setattr(mock_llm, "ERROR_RATE", 0)
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="http://mock-llm/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=mock_llm.app)),
+        max_retries=0,
+    )
+    monkeypatch.setattr(llm_client, "openai", client)
+    scheduler = RequestScheduler("test", requests_per_minute=600, tokens_per_minute=600)
+    monkeypatch.setattr(llm_client, "llm_scheduler", scheduler)
+    return scheduler
+
+
+async def test_create_completion_settles_reported_usage(mock_openai):
+    prompt = "Please rate this JavaScript interview answer on a scale of 1-10. Answer: closures capture variables."
+
+    completion = await create_completion(
+        PRIORITY_CALL, expected_output_tokens=5, model="gpt-4o-mini", messages=[{"role": "user", "content": prompt}]
+    )
+
+    assert 1 <= int(completion.choices[0].message.content) <= 10
+    assert mock_openai.counters["granted"] == 1
+    # The estimate is replaced by the usage the server reported
+    used = 600 - mock_openai.buckets["tokens"].available()
+    assert used == pytest.approx(completion.usage.total_tokens, abs=2)
+
+
+async def test_create_completion_gives_up_without_budget(mock_openai):
+    mock_openai.buckets["requests"].level = 0
+
+    with pytest.raises(BudgetExceeded):
+        await create_completion(
+            PRIORITY_BACKGROUND, expected_output_tokens=5, max_wait=0.01,
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "Please rate this answer"}],
+        )
+    assert mock_openai.counters["granted"] == 0
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from app.services import rescoring_queue
+from app.services.session_store import create_session_store
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Fresh job and lease stores, fast pacing, and a re-scorer that counts requests"""
+    monkeypatch.setattr(rescoring_queue, "rescoring_jobs", create_session_store("test_rescoring", backend="memory"))
+    monkeypatch.setattr(rescoring_queue, "rescoring_leases", create_session_store("test_leases", backend="memory", ttl=60))
+    monkeypatch.setattr(rescoring_queue, "RESCORING_MAX_PER_MINUTE", 60000)
+    rescored = []
+    emails = []
+
+    async def rescore_answer(question, answer):
+        rescored.append(answer)
+        await asyncio.sleep(0.05)
+        return 9
+
+    monkeypatch.setattr(rescoring_queue, "rescore_answer", rescore_answer)
+    monkeypatch.setattr(rescoring_queue, "enqueue_outcome_email", lambda passed, *args: emails.append(passed))
+    return rescored, emails
+
+
+async def _queue_job(key: str):
+    await rescoring_queue.queue_rescoring(
+        key, [5, 5, 5], [[0, "Q1", "answer 1"], [2, "Q3", "answer 3"]], 30, 50, "candidate@example.org", None
+    )
+
+
+async def test_each_job_is_processed_by_one_worker(queue):
+    rescored, emails = queue
+    await _queue_job("interview-1")
+
+    # Two workers polling the same job store
+    workers = [asyncio.create_task(rescoring_queue._run()) for _ in range(2)]
+    await asyncio.sleep(0.3)
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    assert sorted(rescored) == ["answer 1", "answer 3"]
+    assert emails == [True]
+    assert await rescoring_queue.rescoring_jobs.get("interview-1") is None
+    assert await rescoring_queue.rescoring_leases.get("interview-1") is None
+
+
+async def test_leased_job_is_not_claimed_by_another_worker(queue, monkeypatch):
+    await _queue_job("interview-2")
+
+    monkeypatch.setattr(rescoring_queue, "_owner", "worker-1")
+    assert await rescoring_queue._claim("interview-2") is not None
+    monkeypatch.setattr(rescoring_queue, "_owner", "worker-2")
+    assert await rescoring_queue._claim("interview-2") is None
+
+    # Only the holder can release the lease
+    await rescoring_queue._release("interview-2")
+    assert (await rescoring_queue.rescoring_leases.get("interview-2"))["claimed_by"] == "worker-1"
+    monkeypatch.setattr(rescoring_queue, "_owner", "worker-1")
+    await rescoring_queue._release("interview-2")
+    assert await rescoring_queue.rescoring_leases.get("interview-2") is None
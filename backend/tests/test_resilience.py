@@ -0,0 +1,140 @@
+import asyncio
+import time
+import pytest
+from app.services import scoring_service
+from app.utils.resilience import CircuitBreaker, LatencyTracker
+
+
+@pytest.fixture
+def scoring(monkeypatch):
+    """Fast scoring deadlines, a fresh breaker and latency history, and a scripted LLM"""
+    monkeypatch.setattr(scoring_service, "SCORING_DEADLINE_SECONDS", 0.5)
+    monkeypatch.setattr(scoring_service, "SCORING_HEDGE_DELAY_SECONDS", 0.05)
+    monkeypatch.setattr(scoring_service, "upstream_latency", LatencyTracker())
+    monkeypatch.setattr(scoring_service, "scoring_breaker", CircuitBreaker("test", failure_threshold=2, cooldown=0.1, probe_timeout=0.5))
+    for key in scoring_service.hedge_counters:
+        monkeypatch.setitem(scoring_service.hedge_counters, key, 0)
+
+    requests = []
+
+    def script(*responses):
+        """Each request sleeps, then returns or raises, per the next response"""
+        queue = list(responses)
+
+        async def request(question, answer, priority):
+            delay, outcome = queue.pop(0) if queue else responses[-1]
+            entry = {"sent_at": time.monotonic(), "cancelled": False}
+            requests.append(entry)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                entry["cancelled"] = True
+                raise
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(scoring_service, "_request_llm_score", request)
+
+    return script, requests
+
+
+async def test_slow_request_is_hedged_and_the_first_result_wins(scoring):
+    script, requests = scoring
+    script((10, 3), (0.01, 8))
+
+    started = time.monotonic()
+    score = await scoring_service._llm_score("q", "a")
+
+    assert score == 8
+    assert len(requests) == 2
+    assert requests[1]["sent_at"] - started >= 0.05
+    await asyncio.sleep(0)
+    assert requests[0]["cancelled"]
+    assert scoring_service.hedge_counters["hedge_wins"] == 1
+
+
+async def test_fast_request_is_not_hedged(scoring):
+    script, requests = scoring
+    script((0.01, 6))
+
+    assert await scoring_service._llm_score("q", "a") == 6
+    assert len(requests) == 1
+    assert scoring_service.hedge_counters["hedged"] == 0
+
+
+async def test_fast_failure_is_retried_once(scoring):
+    script, requests = scoring
+    script((0, RuntimeError("boom")), (0.01, 7))
+
+    assert await scoring_service._llm_score("q", "a") == 7
+    assert len(requests) == 2
+
+
+async def test_deadline_miss_cancels_requests_and_returns_none(scoring):
+    script, requests = scoring
+    script((10, 5))
+
+    started = time.monotonic()
+    assert await scoring_service._llm_score("q", "a") is None
+
+    assert time.monotonic() - started < 0.7
+    await asyncio.sleep(0)
+    assert len(requests) == 2 and all(entry["cancelled"] for entry in requests)
+    assert scoring_service.hedge_counters["deadline_misses"] == 1
+    assert scoring_service.scoring_breaker.consecutive_failures == 1
+
+
+async def test_breaker_opens_half_opens_and_closes(scoring):
+    script, requests = scoring
+    breaker = scoring_service.scoring_breaker
+    script((0, RuntimeError("down")))
+
+    for _ in range(2):
+        assert await scoring_service._llm_score("q", "a") is None
+    assert breaker.state == "open"
+
+    sent = len(requests)
+    assert await scoring_service._llm_score("q", "a") is None
+    assert len(requests) == sent
+    assert scoring_service.hedge_counters["short_circuited"] == 1
+
+    await asyncio.sleep(0.1)
+    assert breaker.state == "half_open"
+    # A failed probe re-opens the breaker
+    assert await scoring_service._llm_score("q", "a") is None
+    assert breaker.state == "open"
+
+    await asyncio.sleep(0.1)
+    script((0.01, 9))
+    assert await scoring_service._llm_score("q", "a") == 9
+    assert breaker.state == "closed"
+
+
+def test_half_open_breaker_lets_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0, probe_timeout=10)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+async def test_cancelled_probe_does_not_hold_the_breaker_half_open(scoring):
+    script, requests = scoring
+    breaker = scoring_service.scoring_breaker
+    breaker.record_failure()
+    breaker.record_failure()
+    await asyncio.sleep(0.1)
+    script((10, 5))
+
+    probe = asyncio.create_task(scoring_service._llm_score("q", "a"))
+    await asyncio.sleep(0.01)
+    assert not breaker.allow()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    await asyncio.sleep(0.5)
+    script((0.01, 6))
+    assert await scoring_service._llm_score("q", "a") == 6
+    assert breaker.state == "closed"
@@ -0,0 +1,168 @@
+import asyncio
+import sqlite3
+from dataclasses import asdict, dataclass
+import fakeredis
+import pytest
+from app.services.session_store import STORE_BACKENDS, InMemorySessionStore, RedisSessionStore, SQLiteSessionStore
+
+# Table as created by the first release, before entries had an expiry
+FIRST_RELEASE_SCHEMA = """
+CREATE TABLE session_store (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+async def test_sqlite_store_migrates_first_release_databases(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    db = sqlite3.connect(path)
+    db.execute(FIRST_RELEASE_SCHEMA)
+    db.execute("""INSERT INTO session_store VALUES ('sessions', 'old', '{"questions_asked": 3}')""")
+    db.commit()
+    db.close()
+
+    store = SQLiteSessionStore("sessions", path=path, ttl=60, max_entries=1)
+    try:
+        assert await store.get("old") == {"questions_asked": 3}
+        await store.set("new", {"questions_asked": 1})
+        assert await store.get("new") == {"questions_asked": 1}
+        await store.sweep()
+        assert len(await store.keys()) == 1
+    finally:
+        await store.close()
+
+    columns = {row[1] for row in sqlite3.connect(path).execute("PRAGMA table_info(session_store)")}
+    assert {"expires_at", "accessed_at"} <= columns
+
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@pytest.fixture(params=sorted(STORE_BACKENDS))
+async def make_store(request, tmp_path):
+    """Build stores of one backend, closed after the test; Redis is served by an in-process fake"""
+    server = fakeredis.FakeServer()
+    stores = []
+
+    def make(namespace: str = "contract", **limits):
+        if request.param == "sqlite":
+            store = SQLiteSessionStore(namespace, path=str(tmp_path / "store.db"), **limits)
+        elif request.param == "redis":
+            store = RedisSessionStore(namespace, **limits)
+            store._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        else:
+            store = InMemorySessionStore(namespace, **limits)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        await store.close()
+
+
+@pytest.fixture
+def store(make_store):
+    return make_store()
+
+
+async def test_get_returns_what_was_set(store):
+    assert await store.get("missing") is None
+    await store.set("a", {"questions_asked": 2, "scores": [7, 8]})
+    assert await store.get("a") == {"questions_asked": 2, "scores": [7, 8]}
+
+
+async def test_set_replaces_the_value(store):
+    await store.set("a", {"v": 1})
+    await store.set("a", {"v": 2})
+    assert await store.get("a") == {"v": 2}
+    assert await store.keys() == ["a"]
+
+
+async def test_delete_removes_the_entry(store):
+    await store.set("a", {"v": 1})
+    await store.delete("a")
+    await store.delete("never-set")
+    assert await store.get("a") is None
+    assert await store.keys() == []
+
+
+async def test_keys_lists_live_entries(store):
+    for key in ("a", "b", "c"):
+        await store.set(key, {"key": key})
+    assert sorted(await store.keys()) == ["a", "b", "c"]
+
+
+async def test_add_only_sets_absent_keys(store):
+    assert await store.add("lease", {"claimed_by": "worker-1"})
+    assert not await store.add("lease", {"claimed_by": "worker-2"})
+    assert await store.get("lease") == {"claimed_by": "worker-1"}
+    await store.delete("lease")
+    assert await store.add("lease", {"claimed_by": "worker-2"})
+
+
+async def test_namespaces_are_isolated(make_store):
+    sessions, configs = make_store("sessions"), make_store("configs")
+    await sessions.set("a", {"kind": "session"})
+    await configs.set("a", {"kind": "config"})
+    assert await sessions.get("a") == {"kind": "session"}
+    assert await configs.keys() == ["a"]
+    await configs.delete("a")
+    assert await sessions.get("a") == {"kind": "session"}
+
+
+async def test_encode_and_decode_round_trip(make_store):
+    store = make_store(encode=asdict, decode=lambda data: Point(**data))
+    await store.set("p", Point(1, 2))
+    assert await store.get("p") == Point(1, 2)
+
+
+async def test_entries_expire_after_ttl_without_being_extended_by_updates(make_store):
+    store = make_store(ttl=1)
+    await store.set("a", {"v": 1})
+    await asyncio.sleep(0.6)
+    await store.set("a", {"v": 2})
+    assert await store.get("a") == {"v": 2}
+    await asyncio.sleep(0.6)
+    await store.sweep()
+    assert await store.get("a") is None
+    assert await store.keys() == []
+    # An expired key can be added again
+    assert await store.add("a", {"v": 3})
+
+
+async def test_max_entries_evicts_least_recently_used(make_store):
+    store = make_store(max_entries=2)
+    if isinstance(store, RedisSessionStore):
+        pytest.skip("Redis leaves size caps to the server's maxmemory policy")
+    await store.set("a", {"v": 1})
+    await asyncio.sleep(0.01)
+    await store.set("b", {"v": 2})
+    await asyncio.sleep(0.01)
+    await store.get("a")
+    await asyncio.sleep(0.01)
+    await store.set("c", {"v": 3})
+    await store.sweep()
+    assert sorted(await store.keys()) == ["a", "c"]
+
+
+async def test_stats_report_entries(store):
+    await store.set("a", {"v": 1})
+    stats = await store.stats()
+    assert stats["namespace"] == "contract"
+    assert stats["backend"] in STORE_BACKENDS
+    assert stats["entries"] == 1
+    assert stats["approx_bytes"] > 0
+
+
+async def test_memory_store_keeps_objects_as_is():
+    store = InMemorySessionStore("objects")
+    value = {"nested": [1, 2]}
+    await store.set("a", value)
+    assert await store.get("a") is value
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from app.models.question_pool import intern_pool
+from app.services import reference_answers, scoring_service
+from app.services.session_store import create_session_store
+
+QUESTION = "What does an async function return?"
+
+
+@pytest.mark.parametrize("answer", ["I don't know", "skip", "", "um, okay"])
+def test_non_answers_are_settled_locally(answer):
+    assert scoring_service.prescore_answer(QUESTION, answer) == 1
+
+
+@pytest.mark.parametrize("answer", ["It returns a Promise", "Yes, it is hoisted", "Use const", "No"])
+def test_short_answers_go_to_the_llm(answer):
+    assert scoring_service.prescore_answer(QUESTION, answer) is None
+
+
+@pytest.fixture
+def slow_reference_llm(monkeypatch):
+    """Replaces reference answer generation with a slow stub that records requested questions"""
+    monkeypatch.setattr(reference_answers, "reference_answers", create_session_store("test_reference_answers", backend="memory"))
+    monkeypatch.setattr(reference_answers, "_indexes", type(reference_answers._indexes)())
+    requested = []
+
+    async def generate_batch(questions):
+        requested.extend(questions)
+        await asyncio.sleep(0.05)
+        return {question: f"Model answer to {question}" for question in questions}
+
+    monkeypatch.setattr(reference_answers, "_generate_batch", generate_batch)
+    return requested
+
+
+async def test_growing_pools_generate_each_reference_answer_once(slow_reference_llm):
+    questions = [f"Question {i}?" for i in range(6)]
+    pools = [intern_pool(questions[:size]) for size in (2, 4, 6)]
+
+    # Each publish of a growing pool starts its own build while the previous one runs
+    for pool in pools:
+        reference_answers.prepare_reference_index(pool)
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*reference_answers._building.values())
+
+    assert sorted(slow_reference_llm) == sorted(questions)
+    for pool in pools:
+        index = reference_answers.get_reference_index(pool)
+        assert all(index.reference_vector(question) for question in pool.questions)
+    assert not reference_answers._generating
+
+
+async def test_cancelled_build_does_not_strand_waiting_builds(slow_reference_llm):
+    first = intern_pool(["Alpha?", "Beta?"])
+    second = intern_pool(["Alpha?", "Beta?", "Gamma?"])
+
+    reference_answers.prepare_reference_index(first)
+    await asyncio.sleep(0.01)
+    reference_answers.prepare_reference_index(second)
+    await asyncio.sleep(0.01)
+    reference_answers._building[first.digest].cancel()
+    await asyncio.wait_for(asyncio.gather(*reference_answers._building.values(), return_exceptions=True), timeout=1)
+
+    index = reference_answers.get_reference_index(second)
+    assert index is not None and index.reference_vector("Gamma?")
+    assert not reference_answers._generating
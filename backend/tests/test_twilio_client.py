@@ -0,0 +1,106 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app.services import twilio_client
+from app.services.twilio_client import TwilioError, create_call
+from tools import mock_twilio
+
+
+def _client(transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+    return httpx.AsyncClient(base_url="https://api.twilio.test", transport=transport)
+
+
+@pytest.fixture
+def twilio(monkeypatch):
+    """Point the shared client at a transport for the test"""
+    def use(transport: httpx.AsyncBaseTransport):
+        monkeypatch.setattr(twilio_client, "http_client", _client(transport))
+    return use
+
+
+async def test_create_call_returns_the_call_sid(twilio, monkeypatch):
+    monkeypatch.setattr(mock_twilio, "LATENCY_SECONDS", 0)
+    monkeypatch.setattr(mock_twilio, "ERROR_RATE", 0)
+    twilio(httpx.ASGITransport(app=mock_twilio.app))
+
+    sid = await create_call("+15550001111", "https://example.org/outbound-twiml?interview_id=abc")
+
+    assert sid.startswith("CA")
+    call = next(call for call in mock_twilio.calls if call["sid"] == sid)
+    assert call["to"] == "+15550001111"
+    assert call["url"] == "https://example.org/outbound-twiml?interview_id=abc"
+
+
+async def test_create_call_sends_the_status_callback(twilio):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(201, json={"sid": "CA123", "status": "queued"})
+
+    twilio(httpx.MockTransport(handler))
+    assert await create_call("+15550001111", "https://example.org/twiml", status_callback="https://example.org/status") == "CA123"
+
+    form = dict(httpx.QueryParams(requests[0].content.decode()))
+    assert form["StatusCallback"] == "https://example.org/status"
+    assert form["Method"] == "POST"
+    assert requests[0].url.path.endswith("/Calls.json")
+
+
+async def test_rejected_call_raises_twilio_error(twilio):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400, json={"code": 21217, "message": "Phone number does not appear to be valid", "status": 400})
+
+    twilio(httpx.MockTransport(handler))
+    with pytest.raises(TwilioError) as error:
+        await create_call("+1555", "https://example.org/twiml")
+
+    assert error.value.status_code == 400
+    assert error.value.code == 21217
+    assert "does not appear to be valid" in str(error.value)
+
+
+async def test_error_without_json_body_keeps_the_response_text(twilio):
+    twilio(httpx.MockTransport(lambda request: httpx.Response(503, text="Service Unavailable")))
+
+    with pytest.raises(TwilioError) as error:
+        await create_call("+15550001111", "https://example.org/twiml")
+
+    assert error.value.status_code == 503 and error.value.code is None
+    assert "Service Unavailable" in str(error.value)
+
+
+async def test_timeout_raises_http_error(twilio):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    twilio(httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPError):
+        await create_call("+15550001111", "https://example.org/twiml")
+
+
+async def test_dialing_does_not_block_the_event_loop(twilio):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(201, json={"sid": "CA123"})
+
+    twilio(httpx.MockTransport(handler))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    started = time.monotonic()
+    sids = await asyncio.gather(*(create_call(f"+1555000{i:04d}", "https://example.org/twiml") for i in range(10)))
+    elapsed = time.monotonic() - started
+    ticking.cancel()
+
+    assert sids == ["CA123"] * 10
+    # Ten 0.2s dials overlap, and the loop keeps running other work meanwhile
+    assert elapsed < 0.6
+    assert ticks >= 10
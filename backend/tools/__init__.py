@@ -0,0 +1 @@
+"""Development servers standing in for external APIs, for load tests and the test suite"""
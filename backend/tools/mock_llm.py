@@ -0,0 +1,132 @@
+"""OpenAI-compatible mock LLM with injected latency, for load and tail-latency testing
+
+Run it next to the backend and point the backend at it:
+
+    MOCK_LLM_LATENCY_SECONDS=0.4 MOCK_LLM_TAIL_PROBABILITY=0.05 MOCK_LLM_TAIL_SECONDS=8 \\
+        uvicorn tools.mock_llm:app --port 9100
+    LLM_BASE_URL=http://localhost:9100/v1 uvicorn app.main:app
+
+Latencies are log-normal around MOCK_LLM_LATENCY_SECONDS; a MOCK_LLM_TAIL_PROBABILITY
+share of requests instead take MOCK_LLM_TAIL_SECONDS, and a MOCK_LLM_ERROR_RATE share
+fail with a 500. Like the real API, requests over MOCK_LLM_REQUESTS_PER_MINUTE or
+MOCK_LLM_TOKENS_PER_MINUTE (0 = unlimited) are rejected with a 429. Replies are shaped like the real prompts expect: a score, JSON
+score lines, JSON question lines (streamed if asked) or JSON reference answers.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.utils.rate_limit import TokenBucket
+
+LATENCY_SECONDS = float(os.getenv("MOCK_LLM_LATENCY_SECONDS", "0.4"))
+LATENCY_SIGMA = float(os.getenv("MOCK_LLM_LATENCY_SIGMA", "0.3"))
+TAIL_PROBABILITY = float(os.getenv("MOCK_LLM_TAIL_PROBABILITY", "0.0"))
+TAIL_SECONDS = float(os.getenv("MOCK_LLM_TAIL_SECONDS", "8"))
+ERROR_RATE = float(os.getenv("MOCK_LLM_ERROR_RATE", "0.0"))
+REQUESTS_PER_MINUTE = int(os.getenv("MOCK_LLM_REQUESTS_PER_MINUTE", "0"))
+TOKENS_PER_MINUTE = int(os.getenv("MOCK_LLM_TOKENS_PER_MINUTE", "0"))
+
+request_budget = TokenBucket(REQUESTS_PER_MINUTE) if REQUESTS_PER_MINUTE > 0 else None
+token_budget = TokenBucket(TOKENS_PER_MINUTE) if TOKENS_PER_MINUTE > 0 else None
+rejected = {"requests": 0, "tokens": 0}
+
+app = FastAPI(title="Mock LLM")
+
+def _latency() -> float:
+    if random.random() < TAIL_PROBABILITY:
+        return TAIL_SECONDS
+    return random.lognormvariate(0, LATENCY_SIGMA) * LATENCY_SECONDS
+
+def _reply(prompt: str) -> str:
+    """Content in the format the prompt asks for"""
+    if "rate each of these" in prompt:
+        indices = re.findall(r'^\s*\{"index": (\d+), "question"', prompt, re.M)
+        return "\n".join(json.dumps({"index": int(i), "score": random.randint(3, 9)}) for i in indices)
+    if "rate this" in prompt:
+        return str(random.randint(3, 9))
+    if "model answer" in prompt:
+        indices = re.findall(r'^\s*(\d+)\. ', prompt, re.M)
+        return "\n".join(
+            json.dumps({"index": int(i), "answer": f"A model answer for question {i} covering the key concept and a practical example."})
+            for i in indices
+        )
+    count = int(re.search(r"Generate exactly (\d+)", prompt).group(1)) if "Generate exactly" in prompt else 10
+    return "\n".join(json.dumps({"question": f"Mock interview question number {i} about the requested topic?"}) for i in range(1, count + 1))
+
+def _rate_limited(prompt_tokens: int) -> Optional[JSONResponse]:
+    """A 429 response if the request is over a limit, else None after charging it"""
+    if request_budget is not None and request_budget.available() < 1:
+        rejected["requests"] += 1
+        return JSONResponse({"error": {"message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded"}}, status_code=429)
+    if token_budget is not None and token_budget.available() < prompt_tokens:
+        rejected["tokens"] += 1
+        return JSONResponse({"error": {"message": "Rate limit reached for tokens", "type": "tokens", "code": "rate_limit_exceeded"}}, status_code=429)
+    if request_budget is not None:
+        request_budget.take(1)
+    if token_budget is not None:
+        token_budget.take(prompt_tokens)
+    return None
+
+def _completion(content: str, prompt_tokens: int) -> dict:
+    completion_tokens = len(content) // 4
+    if token_budget is not None:
+        token_budget.take(completion_tokens)
+    return {
+        "id": f"mock-{random.getrandbits(32):08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+def _chunk(content: str, finish_reason=None) -> str:
+    chunk = {
+        "id": "mock-stream",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "delta": {"content": content} if content else {}, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    prompt_tokens = len(prompt) // 4
+    limited = _rate_limited(prompt_tokens)
+    if limited is not None:
+        return limited
+    await asyncio.sleep(_latency())
+    if random.random() < ERROR_RATE:
+        return JSONResponse({"error": {"message": "Injected failure", "type": "server_error"}}, status_code=500)
+
+    content = _reply(prompt)
+    if not body.get("stream"):
+        return _completion(content, prompt_tokens)
+    if token_budget is not None:
+        token_budget.take(len(content) // 4)
+
+    async def stream():
+        for line in content.split("\n"):
+            await asyncio.sleep(0.01)
+            yield _chunk(line + "\n")
+        yield _chunk("", "stop")
+        yield "data: [DONE]\n\n"
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@app.get("/v1/models/{model}")
+async def retrieve_model(model: str):
+    return {"id": model, "object": "model", "created": 0, "owned_by": "mock"}
+
+@app.get("/stats")
+async def stats():
+    """Requests rejected with a 429, by limit"""
+    return {"rejected": rejected}
@@ -0,0 +1,64 @@
+"""Stand-in for the Twilio REST API's Calls resource, for load and dialing tests
+
+Run it next to the backend and point the backend at it:
+
+    MOCK_TWILIO_LATENCY_SECONDS=0.5 uvicorn tools.mock_twilio:app --port 9200
+    TWILIO_API_BASE_URL=http://localhost:9200 uvicorn app.main:app
+
+Each call request waits MOCK_TWILIO_LATENCY_SECONDS (log-normal around it), and a
+MOCK_TWILIO_ERROR_RATE share is rejected the way Twilio rejects unreachable numbers.
+Calls are only recorded, never placed; GET /calls lists them. If the request has a
+StatusCallback, a "completed" status is posted to it after MOCK_TWILIO_CALL_SECONDS.
+"""
+
+import asyncio
+import os
+import random
+import time
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_SECONDS = float(os.getenv("MOCK_TWILIO_LATENCY_SECONDS", "0.3"))
+ERROR_RATE = float(os.getenv("MOCK_TWILIO_ERROR_RATE", "0.0"))
+CALL_SECONDS = float(os.getenv("MOCK_TWILIO_CALL_SECONDS", "5"))
+
+app = FastAPI(title="Mock Twilio")
+
+calls = []
+_callbacks = set()
+
+async def _report_completion(url: str, sid: str):
+    await asyncio.sleep(random.lognormvariate(0, 0.3) * CALL_SECONDS)
+    try:
+        async with httpx.AsyncClient() as client:
+            await client.post(url, data={"CallSid": sid, "CallStatus": "completed"})
+    except httpx.HTTPError as e:
+        print(f"Status callback to {url} failed: {e}")
+
+@app.post("/2010-04-01/Accounts/{account_sid}/Calls.json")
+async def create_call(account_sid: str, request: Request):
+    form = await request.form()
+    await asyncio.sleep(random.lognormvariate(0, 0.3) * LATENCY_SECONDS)
+    if "To" not in form or "From" not in form or "Url" not in form:
+        return JSONResponse({"code": 21201, "message": "No 'To', 'From' or 'Url' specified", "status": 400}, status_code=400)
+    if random.random() < ERROR_RATE:
+        return JSONResponse({"code": 21217, "message": f"Phone number {form['To']} does not appear to be valid", "status": 400}, status_code=400)
+
+    sid = f"CA{random.getrandbits(128):032x}"
+    calls.append({"sid": sid, "to": form["To"], "from": form["From"], "url": form["Url"], "created": time.time()})
+    if form.get("StatusCallback"):
+        task = asyncio.create_task(_report_completion(form["StatusCallback"], sid))
+        _callbacks.add(task)
+        task.add_done_callback(_callbacks.discard)
+    return JSONResponse({
+        "sid": sid,
+        "account_sid": account_sid,
+        "to": form["To"],
+        "from": form["From"],
+        "status": "queued",
+    }, status_code=201)
+
+@app.get("/calls")
+async def list_calls():
+    return {"calls": calls}
@@ -1,14 +1,47 @@
 'use client';
 
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 
 interface CallHistoryItem {
   number: string;
   status: string;
   time: string;
   call_sid: string;
+  active: boolean;
 }
 
+interface InterviewEvent {
+  type: string;
+  call_sid: string;
+  question_number?: number;
+  questions_total?: number;
+  score?: number;
+  result?: string;
+  percentage?: number | null;
+  questions_answered?: number;
+}
+
+const INTERVIEW_EVENT_TYPES = ['started', 'question', 'score', 'completed', 'ended', 'disconnected'];
+const FINAL_EVENT_TYPES = ['completed', 'ended', 'disconnected'];
+
+const describeEvent = (event: InterviewEvent): string => {
+  switch (event.type) {
+    case 'started':
+      return 'In interview';
+    case 'question':
+      return `Question ${event.question_number}`;
+    case 'score':
+      return `Answer ${event.question_number} scored ${event.score}/10`;
+    case 'completed':
+      if (event.result === 'pending') return 'Completed, result pending';
+      return `${event.result === 'passed' ? 'Passed' : 'Not passed'} (${event.percentage}%)`;
+    case 'disconnected':
+      return `Hung up after ${event.questions_answered} answers`;
+    default:
+      return 'Ended';
+  }
+};
+
 
 export default function Home() {
   const [phoneNumber, setPhoneNumber] = useState('+919991422233');
@@ -17,6 +50,25 @@ export default function Home() {
   const [message, setMessage] = useState('');
   const [callHistory, setCallHistory] = useState<CallHistoryItem[]>([]);
 
+  const activeCallSids = callHistory.filter(call => call.active).map(call => call.call_sid).join(',');
+
+  useEffect(() => {
+    if (!activeCallSids) return;
+    // One event stream for every call still in progress, reopened when that set changes
+    const source = new EventSource(
+      `${process.env.NEXT_PUBLIC_API_URL}/interview-events?call_sids=${encodeURIComponent(activeCallSids)}`
+    );
+    const onEvent = (message: MessageEvent) => {
+      const event: InterviewEvent = JSON.parse(message.data);
+      setCallHistory(history => history.map(call => call.call_sid === event.call_sid
+        ? { ...call, status: describeEvent(event), active: !FINAL_EVENT_TYPES.includes(event.type) }
+        : call
+      ));
+    };
+    INTERVIEW_EVENT_TYPES.forEach(type => source.addEventListener(type, onEvent));
+    return () => source.close();
+  }, [activeCallSids]);
+
   const makeCall = () => {
     setLoading(true);
     setMessage('Calling...');
@@ -34,7 +86,8 @@ export default function Home() {
           number: phoneNumber,
           status: 'Calling',
           time: new Date().toLocaleTimeString(),
-          call_sid: data.call_sid
+          call_sid: data.call_sid,
+          active: true
         }]);
         
         // Start monitoring interview
@@ -57,22 +110,11 @@ export default function Home() {
   };
 
   const monitorInterview = (callSid: string) => {
-    // Start monitoring this interview session
-    const interval = setInterval(async () => {
-      try {
-        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/interview-status/${callSid}`);
-        const data = await response.json();
-        if (!data.success) {
-          // Interview ended or not found, stop monitoring
-          clearInterval(interval);
-        }
-      } catch (error) {
-        console.error('Failed to fetch interview status:', error);
-      }
-    }, 2000); // Check every 2 seconds
-
-    // Clean up interval after 20 minutes (max interview time)
-    setTimeout(() => clearInterval(interval), 20 * 60 * 1000);
+    // Updates arrive over the event stream; stop watching after 20 minutes (max interview time)
+    // in case the call never reports an end, e.g. because it was not answered
+    setTimeout(() => {
+      setCallHistory(history => history.map(call => call.call_sid === callSid ? { ...call, active: false } : call));
+    }, 20 * 60 * 1000);
   };
 
 
@@ -96,6 +138,7 @@ export default function Home() {
             status: 'Calling',
             time: new Date().toLocaleTimeString(),
             call_sid: data.call_sid,
+            active: true,
           },
         ]);
         monitorInterview(data.call_sid);